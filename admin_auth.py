@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Admin authentication for diagnostic endpoints
+Admin endpoints are disabled unless ADMIN_TOKEN is set; clients send it as
+`Authorization: Bearer <token>` or `X-Admin-Token: <token>`.
+"""
+
+import os
+import hmac
+
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+
+def admin_enabled():
+    return bool(ADMIN_TOKEN)
+
+
+def is_admin(headers):
+    """True if the request headers carry the admin token"""
+    if not ADMIN_TOKEN:
+        return False
+    supplied = headers.get('X-Admin-Token', '')
+    auth = headers.get('Authorization', '')
+    if not supplied and auth.startswith('Bearer '):
+        supplied = auth[len('Bearer '):]
+    return hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode())
+
+
+def admin_error():
+    """(body, status) for a rejected admin request"""
+    from flask import jsonify
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Admin endpoints disabled (set ADMIN_TOKEN)'}), 404
+    return jsonify({'error': 'Admin token required'}), 401
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Parallel, cached loading of training_data/annotations/*.json
+Each file's parsed contents (and a content hash per record) are cached on disk
+as plain JSON (never pickle - the cache sits in a writable data directory)
+keyed by path, mtime and size, so a re-run only reads files that were added or
+changed. Cache misses are
+parsed on a thread pool (a process pool once there are enough of them to
+outweigh process start-up, since json parsing holds the GIL).
+
+    ANNOTATION_WORKERS=8
+    python3 annotation_loader.py training_data/annotations
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = '.annotation_cache.json'
+CACHE_VERSION = 3
+ANNOTATION_WORKERS = int(os.getenv('ANNOTATION_WORKERS', str(min(32, (os.cpu_count() or 1) + 4))))
+# Below this many files to parse, spawning processes costs more than it saves
+PROCESS_POOL_MIN_FILES = int(os.getenv('ANNOTATION_PROCESS_POOL_MIN_FILES', '2000'))
+
+
+class LoadStats:
+    """What one load_annotations call did"""
+
+    def __init__(self):
+        self.files = 0
+        self.cached = 0
+        self.parsed = 0
+        self.failed = 0
+        self.seconds = 0.0
+        self.pool = None
+
+    def summary(self):
+        pool = f" on a {self.pool} pool" if self.pool else ''
+        return (f"{self.files} files ({self.cached} cached, {self.parsed} parsed{pool}, {self.failed} failed) "
+                f"in {self.seconds * 1000:.0f}ms")
+
+
+def record_hash(record):
+    """Content hash of one annotation record (key order does not matter)"""
+    data = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _parse_file(path):
+    """path -> (path, parsed JSON, record hashes, None) or (path, None, None, error message)"""
+    try:
+        with open(path, 'rb') as f:
+            data = json.loads(f.read())
+        hashes = [record_hash(record) for record in data] if isinstance(data, list) else [record_hash(data)]
+        return path, data, hashes, None
+    except Exception as e:
+        return path, None, None, str(e)
+
+
+def read_cache(cache_path):
+    """{path: (mtime_ns, size, data, record hashes)}; empty if missing, unreadable or from another version"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = json.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Ignoring unreadable annotation cache {cache_path}: {e}")
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    entries = cache.get('entries')
+    if not isinstance(entries, dict):
+        return {}
+    return {path: tuple(entry) for path, entry in entries.items() if isinstance(entry, list) and len(entry) == 4}
+
+
+def write_cache(cache_path, entries):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'entries': entries}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+
+def parse_files(paths, workers=ANNOTATION_WORKERS, stats=None):
+    """Parse files concurrently; returns [(path, data, hashes, error)] in input order"""
+    if not paths:
+        return []
+    use_processes = len(paths) >= PROCESS_POOL_MIN_FILES and (os.cpu_count() or 1) > 1
+    if stats is not None:
+        stats.pool = 'process' if use_processes else 'thread'
+    if use_processes:
+        with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count())) as pool:
+            return list(pool.map(_parse_file, paths, chunksize=max(1, len(paths) // (os.cpu_count() * 4))))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_file, paths))
+
+
+def load_annotations(annotations_dir, cache_path=None, workers=ANNOTATION_WORKERS, stats=None, hashes=None):
+    """Records from every *.json in annotations_dir (lists are flattened), in file name order.
+
+    cache_path defaults to annotations_dir/.annotation_cache.json; pass False to disable caching.
+    If hashes is a list it is extended with record_hash() of each returned record.
+    """
+    start = time.perf_counter()
+    stats = stats if stats is not None else LoadStats()
+    if cache_path is None:
+        cache_path = os.path.join(annotations_dir, CACHE_NAME)
+    cache = read_cache(cache_path) if cache_path else {}
+
+    entries = {}
+    with os.scandir(annotations_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.json') and entry.name != CACHE_NAME and entry.is_file():
+                st = entry.stat()
+                entries[entry.path] = (st.st_mtime_ns, st.st_size)
+    stats.files = len(entries)
+
+    fresh, misses = {}, []
+    for path, key in entries.items():
+        cached = cache.get(path)
+        if cached is not None and cached[:2] == key:
+            fresh[path] = cached
+        else:
+            misses.append(path)
+    stats.cached = len(fresh)
+
+    for path, data, record_hashes, error in parse_files(misses, workers, stats):
+        if error is not None:
+            stats.failed += 1
+            logger.warning(f"Failed to load {path}: {error}")
+            continue
+        stats.parsed += 1
+        fresh[path] = entries[path] + (data, record_hashes)
+
+    # Rewrite the cache only if something was parsed or a file disappeared
+    if cache_path and (stats.parsed or len(fresh) != len(cache)):
+        try:
+            write_cache(cache_path, fresh)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write annotation cache {cache_path}: {e}")
+
+    records = []
+    for path in sorted(fresh):
+        data = fresh[path][2]
+        if hashes is not None:
+            hashes.extend(fresh[path][3])
+        if isinstance(data, list):
+            records.extend(data)
+        else:
+            records.append(data)
+    stats.seconds = time.perf_counter() - start
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('annotations_dir', nargs='?', default=os.path.join('training_data', 'annotations'))
+    parser.add_argument('--workers', type=int, default=ANNOTATION_WORKERS)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.annotations_dir):
+        print(f"❌ No annotations directory at {args.annotations_dir}")
+        return False
+    stats = LoadStats()
+    records = load_annotations(args.annotations_dir, False if args.no_cache else None, args.workers, stats)
+    print(f"📝 Loaded {len(records)} annotations: {stats.summary()}")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
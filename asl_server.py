@@ -13,17 +13,33 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import requests
 import os
+import threading
+
+import live_profiler
+import memory_diagnostics
+import request_tracing
+from audit_log import AuditLog
+from frame_store import FrameStore, decode_data_url
+from sample_index import SampleIndex
+from sample_ingest import start_ingestor
+from request_tracing import outgoing_headers, start_span
+from server_metrics import REGISTRY, BYTES_BUCKETS, instrument_flask, record_cache
+from structured_log import log_event, setup_logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app, service='asl_server')
+request_tracing.instrument_flask(app, service='asl_server')
+live_profiler.instrument_flask(app)
+memory_diagnostics.instrument_flask(app, tracked={
+    'ingest_queue_depth': lambda: sample_ingestor.queue.qsize() if sample_ingestor else 0
+})
 
 # Configuration
-LLAMA_SERVER_URL = "http://localhost:8080"
-ROBOT_API_URL = "http://localhost:5001"  # Robot control server
+LLAMA_SERVER_URL = os.getenv('LLAMA_SERVER_URL', "http://localhost:8080")
+ROBOT_API_URL = os.getenv('ROBOT_API_URL', "http://localhost:5001")  # Robot control server
 VAPI_API_KEY = os.getenv('VAPI_API_KEY', 'your-vapi-key')
 VAPI_API_URL = "https://api.vapi.ai/call"
 
@@ -48,8 +64,59 @@ ASL_COMMANDS = {
     'spreadsheet': 'open_spreadsheet'
 }
 
-# Training data storage
-training_data = []
+# Training data storage: frames and metadata on disk, queryable through a SQLite index.
+# Opened by init_storage() on the first request (or at startup), so importing this module touches no files.
+frame_store = None
+sample_index = None
+sample_ingestor = None
+robot_audit = None
+training_stats = {'frames_stored': 0, 'frames_deduplicated': 0}
+_training_lock = threading.Lock()
+_storage_lock = threading.Lock()
+
+def _record_training_batch(samples, stored_flags):
+    """Ingest listener: index the batch and count new vs deduplicated frames"""
+    # Index from the last committed offset, so rows from an earlier batch whose indexing failed are retried
+    sample_index.catch_up(frame_store.samples_path, quiet=True)
+    with _training_lock:
+        stored = sum(stored_flags)
+        training_stats['frames_stored'] += stored
+        training_stats['frames_deduplicated'] += len(samples) - stored
+
+def init_storage():
+    """Open the frame store, sample index and robot audit log and start the ingest writer (once)"""
+    global frame_store, sample_index, sample_ingestor, robot_audit
+    with _storage_lock:
+        if sample_ingestor is not None:
+            return
+        frame_store = FrameStore()
+        sample_index = SampleIndex(os.getenv('SAMPLE_INDEX_PATH', os.path.join(frame_store.root, 'samples.db')))
+        sample_index.catch_up(frame_store.samples_path)
+        # Durable robot command audit log (group-committed, segment-rotated)
+        robot_audit = AuditLog(os.getenv('ASL_AUDIT_DIR', 'logs/asl_audit'), name='asl_server')
+        # /ml/log_sign only validates and enqueues; a background writer stores batches
+        ingestor = start_ingestor(frame_store)
+        ingestor.add_listener(_record_training_batch)
+        sample_ingestor = ingestor
+
+@app.before_request
+def _ensure_storage():
+    if sample_ingestor is None:
+        init_storage()
+
+# Hot path metrics (served on /metrics)
+LLAMA_LATENCY = REGISTRY.histogram('asl_llama_request_duration_seconds',
+                                   'Upstream llama.cpp request latency.', ('status',))
+LLAMA_BYTES = REGISTRY.histogram('asl_llama_bytes', 'Bytes exchanged with llama.cpp per request.',
+                                 ('direction',), buckets=BYTES_BUCKETS)
+MATCH_LATENCY = REGISTRY.histogram('asl_match_duration_seconds',
+                                   'Time spent in process_asl_response.')
+ROBOT_FORWARD_LATENCY = REGISTRY.histogram('asl_robot_forward_duration_seconds',
+                                           'Latency forwarding commands to the robot API.', ('outcome',))
+
+# Cache the llama.cpp health probe so /health polling doesn't hit llama every time
+LLAMA_HEALTH_TTL = float(os.getenv('LLAMA_HEALTH_TTL', '2.0'))
+_llama_health = {'checked_at': None, 'ok': False}
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -67,7 +134,7 @@ def chat_completions():
     """OpenAI-compatible chat completions endpoint for ASL recognition"""
     try:
         data = request.json
-        logger.info(f"Received ASL recognition request")
+        log_event(logger, '/v1/chat/completions', "Received ASL recognition request")
         
         # Extract image from request
         image_data = None
@@ -84,30 +151,41 @@ def chat_completions():
             return jsonify({'error': 'No image data provided'}), 400
         
         # Forward to llama.cpp server for vision processing
-        response = requests.post(
-            f"{LLAMA_SERVER_URL}/v1/chat/completions",
-            json=data,
-            timeout=30
-        )
+        upstream_start = time.perf_counter()
+        with start_span('llama', 'asl_server') as span:
+            response = requests.post(
+                f"{LLAMA_SERVER_URL}/v1/chat/completions",
+                json=data,
+                headers=outgoing_headers(),
+                timeout=30
+            )
+            span.attrs['status'] = response.status_code
+        LLAMA_LATENCY.labels(str(response.status_code)).observe(time.perf_counter() - upstream_start)
+        LLAMA_BYTES.labels('sent').observe(len(response.request.body or b''))
+        LLAMA_BYTES.labels('received').observe(len(response.content))
         
         if response.status_code == 200:
             result = response.json()
             
             # Process the AI response for ASL commands
             ai_response = result['choices'][0]['message']['content']
-            processed_response = process_asl_response(ai_response, image_data)
+            match_start = time.perf_counter()
+            with start_span('match', 'asl_server'):
+                processed_response = process_asl_response(ai_response, image_data)
+            MATCH_LATENCY.observe(time.perf_counter() - match_start)
             
             # Update the response with processed ASL data
             result['choices'][0]['message']['content'] = processed_response
             
-            logger.info(f"ASL recognition completed successfully")
+            log_event(logger, '/v1/chat/completions', "ASL recognition completed",
+                      llama_status=response.status_code)
             return jsonify(result)
         else:
-            logger.error(f"Llama server error: {response.status_code}")
+            logger.error("Llama server error: %s", response.status_code)
             return jsonify({'error': 'Vision processing failed'}), 500
             
     except Exception as e:
-        logger.error(f"ASL recognition error: {str(e)}")
+        logger.error("ASL recognition error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/robot/command', methods=['POST'])
@@ -118,7 +196,7 @@ def robot_command():
         command = data.get('command')
         timestamp = data.get('timestamp', time.time())
         
-        logger.info(f"Robot command received: {command}")
+        log_event(logger, '/robot/command', "Robot command received: %s", command, command=command)
         
         # Validate command
         if command not in ['pick_up', 'deliver', 'stop', 'home']:
@@ -128,12 +206,17 @@ def robot_command():
         log_robot_command(command, timestamp)
         
         # Try to forward to actual robot API
+        forward_start = time.perf_counter()
         try:
-            robot_response = requests.post(
-                f"{ROBOT_API_URL}/command",
-                json={'command': command, 'source': 'asl', 'timestamp': timestamp},
-                timeout=5
-            )
+            with start_span('robot_forward', 'asl_server', command=command):
+                robot_response = requests.post(
+                    f"{ROBOT_API_URL}/command",
+                    json={'command': command, 'source': 'asl', 'timestamp': timestamp},
+                    headers=outgoing_headers(),
+                    timeout=5
+                )
+            ROBOT_FORWARD_LATENCY.labels(str(robot_response.status_code)).observe(
+                time.perf_counter() - forward_start)
             
             if robot_response.status_code == 200:
                 return jsonify({
@@ -143,6 +226,7 @@ def robot_command():
                     'robot_response': robot_response.json()
                 })
         except requests.RequestException:
+            ROBOT_FORWARD_LATENCY.labels('unavailable').observe(time.perf_counter() - forward_start)
             logger.warning("Robot API not available, simulating command")
         
         # Simulate robot response for demo
@@ -154,12 +238,23 @@ def robot_command():
         })
         
     except Exception as e:
-        logger.error(f"Robot command error: {str(e)}")
+        logger.error("Robot command error: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/robot/history', methods=['GET'])
+def robot_history():
+    """Audited robot commands (?since=&until= unix seconds, ?limit=N; default: last 100)"""
+    since = request.args.get('since', type=float)
+    until = request.args.get('until', type=float)
+    limit = min(request.args.get('limit', 100, type=int), 10000)
+    return jsonify({
+        'total_commands': robot_audit.count,
+        'commands': robot_audit.query(since, until, limit)
+    })
+
 @app.route('/ml/log_sign', methods=['POST'])
 def log_sign():
-    """Log ASL sign data for training"""
+    """Queue ASL sign data for training (202 once accepted, 503 when the ingest queue is full)"""
     try:
         data = request.json
         sign = data.get('sign')
@@ -167,31 +262,32 @@ def log_sign():
         session_id = data.get('sessionId')
         timestamp = data.get('timestamp', time.time())
         
-        # Store training data
-        training_entry = {
+        if not sign:
+            return jsonify({'error': 'sign is required'}), 400
+        try:
+            frame, extension = decode_data_url(image_data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # The writer thread stores the full frame (deduplicated by SHA-256) and its metadata
+        sample = {
             'sign': sign,
-            'timestamp': timestamp,
             'session_id': session_id,
-            'image_url': image_data[:100] + '...' if image_data else None,  # Truncate for storage
+            'timestamp': timestamp,
             'logged_at': datetime.now().isoformat()
         }
+        if not sample_ingestor.submit(sample, frame, extension):
+            return jsonify({'error': 'Training ingest queue full, retry later'}), 503, {'Retry-After': '1'}
         
-        training_data.append(training_entry)
-        
-        # Keep only last 1000 entries to prevent memory issues
-        if len(training_data) > 1000:
-            training_data.pop(0)
-        
-        logger.info(f"Logged ASL sign: {sign}")
+        log_event(logger, '/ml/log_sign', "Queued ASL sign: %s", sign, sign=sign, session_id=session_id)
         
         return jsonify({
-            'status': 'logged',
-            'sign': sign,
-            'training_entries': len(training_data)
-        })
+            'status': 'queued',
+            'sign': sign
+        }), 202
         
     except Exception as e:
-        logger.error(f"Sign logging error: {str(e)}")
+        logger.error("Sign logging error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/vapi/trigger', methods=['POST'])
@@ -290,11 +386,34 @@ def vapi_status():
 
 @app.route('/training/data', methods=['GET'])
 def get_training_data():
-    """Get collected training data"""
+    """Get collected training data (totals come from the index's per-sign counters)"""
+    with _training_lock:
+        stats = dict(training_stats)
+    sign_counts = sample_index.sign_counts()
+    recent, _ = sample_index.query(limit=10)
+    return jsonify({
+        'total_entries': sum(sign_counts.values()),
+        'recent_entries': recent[::-1],  # Last 10 entries, oldest first
+        'signs_collected': list(sign_counts),
+        'sign_counts': sign_counts,
+        'frames_stored': stats['frames_stored'],
+        'frames_deduplicated': stats['frames_deduplicated']
+    })
+
+@app.route('/training/samples', methods=['GET'])
+def get_training_samples():
+    """Paginated samples, newest first (?sign=&session_id=&since=&until= unix seconds, ?limit=&cursor=)"""
+    samples, next_cursor = sample_index.query(
+        sign=request.args.get('sign'),
+        session_id=request.args.get('session_id'),
+        since=request.args.get('since', type=float),
+        until=request.args.get('until', type=float),
+        limit=request.args.get('limit', 50, type=int),
+        before_id=request.args.get('cursor', type=int)
+    )
     return jsonify({
-        'total_entries': len(training_data),
-        'recent_entries': training_data[-10:],  # Last 10 entries
-        'signs_collected': list(set(entry['sign'] for entry in training_data))
+        'samples': samples,
+        'next_cursor': next_cursor
     })
 
 @app.route('/training/status', methods=['GET'])
@@ -493,15 +612,24 @@ def simple_pattern_recognition(ai_response):
     return detected_signs
 
 def check_llama_server():
-    """Check if llama.cpp server is running"""
+    """Check if llama.cpp server is running (cached for LLAMA_HEALTH_TTL seconds)"""
+    checked_at = _llama_health['checked_at']
+    if checked_at is not None and time.monotonic() - checked_at < LLAMA_HEALTH_TTL:
+        record_cache('llama_health', True)
+        return _llama_health['ok']
+    record_cache('llama_health', False)
+    
     try:
         response = requests.get(f"{LLAMA_SERVER_URL}/health", timeout=5)
-        return response.status_code == 200
+        ok = response.status_code == 200
     except:
-        return False
+        ok = False
+    
+    _llama_health.update(checked_at=time.monotonic(), ok=ok)
+    return ok
 
 def log_robot_command(command, timestamp):
-    """Log robot commands for safety and auditing"""
+    """Log robot commands for safety and auditing (durable before the command is forwarded)"""
     log_entry = {
         'command': command,
         'timestamp': timestamp,
@@ -509,8 +637,10 @@ def log_robot_command(command, timestamp):
         'source': 'asl_recognition'
     }
     
-    # In production, this would write to a proper log file
-    logger.info(f"ROBOT COMMAND LOG: {json.dumps(log_entry)}")
+    if robot_audit is None:
+        init_storage()
+    robot_audit.append(log_entry)
+    log_event(logger, 'robot_audit', "ROBOT COMMAND LOG", **log_entry)
 
 # Vapi call management
 def make_vapi_call(phone_number=None, message="Hello, this is an ASL Command Center call."):
@@ -610,6 +740,8 @@ def test_recognition():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    # JSON lines written off the request thread
+    setup_logging('asl_server')
     logger.info("Starting ASL Recognition Server for Berkeley Cal Hacks 2025")
     logger.info(f"Llama server: {LLAMA_SERVER_URL}")
     logger.info(f"Robot API: {ROBOT_API_URL}")
@@ -618,6 +750,7 @@ if __name__ == '__main__':
     # Use port 5001 to avoid macOS AirPlay conflicts on port 5000
     port = int(os.getenv('ASL_SERVER_PORT', 5001))
     logger.info(f"Starting ASL server on port {port}")
+    init_storage()
     
     # Test basic pattern recognition
     print("🧪 Testing ASL recognition patterns...")
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Append-only robot command audit log
+Records are JSON lines in size-rotated segments (audit-000001.jsonl, ...).
+A writer thread group-commits: everything appended within COMMIT_INTERVAL is
+written and fsync'd together, and append() returns once its record is on disk.
+Each segment has a sparse time index (audit-000001.idx: one (time, offset) pair
+every INDEX_EVERY records) so time-range and "last N" queries only read the
+part of the log they need.
+
+    ROBOT_AUDIT_DIR=logs/robot_audit   # robot_server.py
+    ASL_AUDIT_DIR=logs/asl_audit       # asl_server.py
+    AUDIT_SEGMENT_BYTES=8388608
+    AUDIT_COMMIT_INTERVAL_MS=5
+"""
+
+import os
+import json
+import time
+import glob
+import struct
+import bisect
+import logging
+import threading
+
+from server_metrics import REGISTRY, LATENCY_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_BYTES = int(os.getenv('AUDIT_SEGMENT_BYTES', str(8 * 2**20)))
+COMMIT_INTERVAL = float(os.getenv('AUDIT_COMMIT_INTERVAL_MS', '5')) / 1000
+INDEX_EVERY = 64
+READ_CHUNK = 64 * 1024
+
+_INDEX_ENTRY = struct.Struct('<dQ')  # logged_at, byte offset of the record
+
+FSYNC_LATENCY = REGISTRY.histogram('audit_fsync_duration_seconds', 'Audit log group commit write+fsync time.',
+                                   ('log',), buckets=LATENCY_BUCKETS)
+COMMIT_BATCH = REGISTRY.histogram('audit_commit_batch_records', 'Records per audit log group commit.',
+                                  ('log',), buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+
+def _decode(line):
+    """The record on one log line, or None if the line is corrupt"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or 'logged_at' not in record or 'seq' not in record:
+        return None
+    return record
+
+
+class Segment:
+    """One .jsonl data file plus its sparse .idx file"""
+
+    def __init__(self, directory, number):
+        self.number = number
+        self.path = os.path.join(directory, f"audit-{number:06d}.jsonl")
+        self.index_path = os.path.join(directory, f"audit-{number:06d}.idx")
+        self.index = []  # [(logged_at, offset)], sorted by both
+
+    def load_index(self):
+        self.index = []
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return self.index
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        for logged_at, offset in _INDEX_ENTRY.iter_unpack(data[:usable]):
+            if offset >= size:
+                break  # index ran ahead of data that never reached the disk
+            self.index.append((logged_at, offset))
+        return self.index
+
+    @property
+    def first_time(self):
+        return self.index[0][0] if self.index else None
+
+    def read_from(self, offset, until=None, since=None, limit=None):
+        """Records from `offset` onwards with since <= logged_at <= until"""
+        records = []
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record = _decode(line)
+                if record is None:
+                    continue
+                logged_at = record['logged_at']
+                if until is not None and logged_at > until:
+                    break
+                if since is None or logged_at >= since:
+                    records.append(record)
+                    if limit is not None and len(records) >= limit:
+                        break
+        return records
+
+    def read_tail(self, count):
+        """Last `count` records, reading the file backwards in chunks"""
+        lines = []
+        with open(self.path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b''
+            in_tail = True  # whatever follows the final newline is still being written
+            while position > 0 and len(lines) <= count:
+                step = min(READ_CHUNK, position)
+                position -= step
+                f.seek(position)
+                parts = (f.read(step) + remainder).split(b'\n')
+                if in_tail:
+                    if len(parts) == 1:
+                        remainder = b''
+                        continue
+                    parts.pop()
+                    in_tail = False
+                remainder = parts.pop(0)
+                lines[:0] = [part for part in parts if part]
+            if position == 0 and remainder:
+                lines.insert(0, remainder)
+        records = [record for record in map(_decode, lines) if record is not None]
+        return records[-count:] if count else []
+
+
+class AuditLog:
+    """Durable, append-only audit log with group commit and a sparse time index"""
+
+    def __init__(self, directory, name='audit', segment_bytes=SEGMENT_BYTES, commit_interval=COMMIT_INTERVAL,
+                 index_every=INDEX_EVERY):
+        self.directory = directory
+        self.name = name
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.index_every = index_every
+        os.makedirs(directory, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._appended_seq = 0
+        self._committed_seq = 0
+        self._last_time = 0.0
+        self._closed = False
+        self._error = None
+
+        self.segments = []
+        self._open_segments()
+        self._writer = threading.Thread(target=self._run, name=f"{name}-audit-writer", daemon=True)
+        self._writer.start()
+
+    # Recovery -----------------------------------------------------------
+
+    def _open_segments(self):
+        numbers = sorted(int(os.path.basename(path)[6:12])
+                         for path in glob.glob(os.path.join(self.directory, 'audit-*.jsonl')))
+        for number in numbers:
+            segment = Segment(self.directory, number)
+            segment.load_index()
+            self.segments.append(segment)
+        if not self.segments:
+            self.segments.append(Segment(self.directory, 1))
+
+        active = self.segments[-1]
+        self._file = open(active.path, 'ab')
+        self._index_file = open(active.index_path, 'ab')
+        self._recover_tail(active)
+
+    def _recover_tail(self, segment):
+        """Drop a torn tail, skip corrupt records before it, re-index records the index missed and resume seq/time
+
+        Only what follows the last good record is truncated (an interrupted write); a corrupt line between
+        good records is left in place, logged and skipped by readers.
+        """
+        offset = segment.index[-1][1] if segment.index else 0
+        size = self._file.seek(0, os.SEEK_END)
+        # The record at the last index entry is already indexed
+        self._since_index = 0 if not segment.index else -1
+        missing = []
+        last = None
+        skipped = pending = 0  # corrupt lines before / after the latest good record
+        end = offset  # just past the last good record
+        with open(segment.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record = _decode(line)
+                offset += len(line)
+                if record is None:
+                    pending += 1
+                    continue
+                skipped, pending = skipped + pending, 0
+                last = record
+                if self._since_index == 0 or self._since_index >= self.index_every:
+                    missing.append((last['logged_at'], offset - len(line)))
+                    self._since_index = 0
+                end = offset
+                self._since_index = max(self._since_index, 0) + 1
+        if end < size:
+            logger.warning("⚠️ Truncating torn audit record in %s (%d bytes)", segment.path, size - end)
+            self._file.truncate(end)
+            self._file.seek(end)
+        if skipped:
+            logger.warning("⚠️ Skipping %d corrupt audit records in %s", skipped, segment.path)
+        self._index_file.truncate(len(segment.index) * _INDEX_ENTRY.size)
+        self._index_file.seek(0, os.SEEK_END)
+        if missing:
+            self._index_file.write(b''.join(_INDEX_ENTRY.pack(*entry) for entry in missing))
+            self._index_file.flush()
+            segment.index.extend(missing)
+        if last is None and len(self.segments) > 1:
+            previous = self.segments[-2].read_tail(1)
+            last = previous[0] if previous else None
+        if last is not None:
+            self._appended_seq = self._committed_seq = last['seq']
+            self._last_time = last['logged_at']
+        self._segment_size = offset
+
+    # Writing ------------------------------------------------------------
+
+    def append(self, entry, wait=True):
+        """Append a record; with wait=True return only once it has been fsync'd. Returns the stored record."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Audit log is closed')
+            if self._error is not None:
+                raise RuntimeError(f"Audit log writer failed: {self._error}")
+            # logged_at never goes backwards, so the time index stays sorted
+            self._last_time = max(self._last_time, time.time())
+            self._appended_seq += 1
+            record = dict(entry, seq=self._appended_seq, logged_at=self._last_time)
+            self._pending.append(record)
+            self._cond.notify_all()
+            if wait:
+                seq = record['seq']
+                while self._committed_seq < seq and self._error is None:
+                    self._cond.wait()
+                if self._error is not None:
+                    raise RuntimeError(f"Audit log writer failed: {self._error}")
+            return record
+
+    def flush(self):
+        """Block until everything appended so far is on disk"""
+        with self._cond:
+            target = self._appended_seq
+            while self._committed_seq < target and self._error is None:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+            # Let concurrent appends pile up so one fsync covers them all
+            if self.commit_interval > 0:
+                time.sleep(self.commit_interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            try:
+                self._write_batch(batch)
+            except OSError as e:
+                logger.error("❌ Audit log write failed: %s", e)
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._committed_seq = batch[-1]['seq']
+                self._cond.notify_all()
+
+    def _write_batch(self, batch):
+        start = time.perf_counter()
+        chunks = []
+        index_entries = []
+        for record in batch:
+            if self._segment_size >= self.segment_bytes:
+                self._flush_chunks(chunks, index_entries)
+                chunks, index_entries = [], []
+                self._rotate()
+            line = (json.dumps(record, default=str, ensure_ascii=False, separators=(',', ':')) + '\n').encode()
+            if self._since_index == 0 or self._since_index >= self.index_every:
+                index_entries.append((record['logged_at'], self._segment_size))
+                self._since_index = 0
+            chunks.append(line)
+            self._segment_size += len(line)
+            self._since_index += 1
+        self._flush_chunks(chunks, index_entries)
+        FSYNC_LATENCY.labels(self.name).observe(time.perf_counter() - start)
+        COMMIT_BATCH.labels(self.name).observe(len(batch))
+
+    def _flush_chunks(self, chunks, index_entries):
+        if not chunks:
+            return
+        self._file.write(b''.join(chunks))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        # The index is only written after its records are durable; it can be rebuilt, so no fsync
+        if index_entries:
+            self._index_file.write(b''.join(_INDEX_ENTRY.pack(*entry) for entry in index_entries))
+            self._index_file.flush()
+            self.segments[-1].index.extend(index_entries)
+
+    def _rotate(self):
+        self._file.close()
+        self._index_file.close()
+        segment = Segment(self.directory, self.segments[-1].number + 1)
+        self.segments.append(segment)
+        self._file = open(segment.path, 'ab')
+        self._index_file = open(segment.index_path, 'ab')
+        self._segment_size = 0
+        self._since_index = 0
+        logger.info("🗂️ Audit log rotated to %s", os.path.basename(segment.path))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+        self._index_file.close()
+
+    # Queries ------------------------------------------------------------
+
+    @property
+    def count(self):
+        return self._committed_seq
+
+    def last(self, n):
+        """Most recent n committed records, oldest first"""
+        records = []
+        for segment in reversed(self.segments):
+            if len(records) >= n:
+                break
+            records[:0] = segment.read_tail(n - len(records))
+        return records
+
+    def between(self, since=None, until=None, limit=None):
+        """Committed records with since <= logged_at <= until, oldest first"""
+        records = []
+        segments = self.segments
+        for position, segment in enumerate(segments):
+            following = segments[position + 1].first_time if position + 1 < len(segments) else None
+            if since is not None and following is not None and following < since:
+                continue  # everything in this segment is older than `since`
+            if until is not None and segment.first_time is not None and segment.first_time > until:
+                break
+            offset = 0
+            if since is not None and segment.index:
+                # Start at the last index entry strictly before `since`
+                slot = bisect.bisect_left(segment.index, (since, -1)) - 1
+                offset = segment.index[slot][1] if slot >= 0 else 0
+            remaining = None if limit is None else limit - len(records)
+            records.extend(segment.read_from(offset, until=until, since=since, limit=remaining))
+            if limit is not None and len(records) >= limit:
+                break
+        return records
+
+    def query(self, since=None, until=None, limit=100):
+        """Time-range query when since/until are given, otherwise the last `limit` records"""
+        if since is None and until is None:
+            return self.last(limit)
+        return self.between(since, until, limit)
@@ -1,58 +1,238 @@
-#!/bin/bash
+#!/usr/bin/env python3
 """
 Auto-training trigger for ASL Command Center
-Checks if model exists, triggers training if needed
+The model records a fingerprint of the training data (annotations, collected
+samples, labelled sign frames, MS-ASL) and the training code it was built
+from. At startup the current fingerprint is compared with it, and only a
+mismatch (or a missing model) retrains. Training runs in a detached
+background process that holds an flock on the lock file, so the servers start
+on the old model and a second startup does not launch a second training.
+
+    python3 auto_train.py                 # check, retrain in the background if stale
+    python3 auto_train.py --foreground    # check, retrain and wait
+    python3 auto_train.py --status
 """
 
 import os
 import sys
 import json
-from pathlib import Path
-
-def check_model_exists():
-    """Check if a trained ASL model exists"""
-    model_paths = [
-        "../models/asl_patterns.json",
-        "../models/smolvlm_asl/",
-        "./asl_model_checkpoints/"
-    ]
-    
-    for path in model_paths:
-        if Path(path).exists():
-            print(f"✅ Model found at: {path}")
-            return True
-    
-    print("❌ No trained model found")
-    return False
-
-def trigger_training():
-    """Trigger the training pipeline"""
-    print("🎯 Starting auto-training...")
-    
-    # Run the training script
-    import subprocess
-    result = subprocess.run([
-        sys.executable, 
-        "train_asl_model.py"
-    ], cwd="./ml_training")
-    
-    return result.returncode == 0
+import fcntl
+import hashlib
+import argparse
+import subprocess
+from datetime import datetime
+
+import incremental_training
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(ROOT, 'models', 'asl_patterns.json')
+ANNOTATIONS_DIR = os.path.join(ROOT, 'training_data', 'annotations')
+LOCK_PATH = os.path.join(ROOT, 'models', '.training.lock')
+LOG_PATH = os.path.join(ROOT, 'logs', 'auto_train.log')
+FINGERPRINT_KEY = 'training_fingerprint'
+# Code whose changes make a trained model stale
+TRAINING_CODE = ('ml_training/train_asl_model.py', 'incremental_training.py', 'annotation_loader.py',
+                 'sign_classifier.py', 'image_shards.py', 'frame_dedup.py', 'columnar_export.py', 'ms_asl.py',
+                 'ms_asl_index.py', 'training_autotune.py')
+# Other training inputs: (name, path relative to root, what to hash)
+TRAINING_DATA = (('columnar', 'training_data/columnar/manifest.json', 'contents'),
+                 ('asl_signs', 'training_data/asl_signs', 'tree'),
+                 ('ms_asl', 'training_data/MS-ASL', 'json'))
+
+# The open lock file while this process holds it (flock is released when the fd closes or the process dies)
+_lock_file = None
+
+
+def training_command():
+    return [sys.executable, 'train_asl_model.py'], os.path.join(ROOT, 'ml_training')
+
+
+def _file_stats(directory, recursive=False, suffix=''):
+    """Sorted (relative name, size, mtime_ns) of the files in directory; hidden files (caches) are skipped"""
+    stats = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        if not recursive:
+            dirnames.clear()
+        for name in filenames:
+            if name.endswith(suffix) and not name.startswith('.'):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                stats.append((os.path.relpath(path, directory), st.st_size, st.st_mtime_ns))
+    return sorted(stats)
+
+
+def training_fingerprint(annotations_dir=ANNOTATIONS_DIR, code_paths=TRAINING_CODE, root=ROOT,
+                         data_paths=TRAINING_DATA):
+    """Hash of the training data (file name, size, mtime; the columnar manifest's contents) and code (contents)"""
+    digest = hashlib.sha256()
+    for name, size, mtime in _file_stats(annotations_dir, suffix='.json'):
+        digest.update(f"annotation|{name}|{size}|{mtime}\n".encode())
+    for label, relative, kind in data_paths:
+        path = os.path.join(root, relative)
+        if kind == 'contents':
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(f"data|{label}|".encode() + hashlib.sha256(f.read()).digest())
+            except FileNotFoundError:
+                digest.update(f"data|{label}|missing".encode())
+            continue
+        # 'tree': every file below path; 'json': top-level .json only (MS-ASL's index/ cache is derived)
+        for name, size, mtime in _file_stats(path, recursive=kind == 'tree', suffix='.json' if kind == 'json' else ''):
+            digest.update(f"data|{label}|{name}|{size}|{mtime}\n".encode())
+    for relative in code_paths:
+        path = os.path.join(root, relative)
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f"code|{relative}|".encode() + hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            digest.update(f"code|{relative}|missing".encode())
+    return digest.hexdigest()[:16]
+
+
+def stored_fingerprint(model_path=MODEL_PATH):
+    """Fingerprint recorded in the model, or None (no model, unreadable, or trained before fingerprints)"""
+    try:
+        with open(model_path) as f:
+            return json.load(f).get(FINGERPRINT_KEY)
+    except (FileNotFoundError, ValueError, AttributeError):
+        return None
+
+
+def stamp_model(model_path, fingerprint):
+    """Record the fingerprint in the model file (atomic replace)"""
+    with open(model_path) as f:
+        model = json.load(f)
+    model[FINGERPRINT_KEY] = fingerprint
+    incremental_training.atomic_write_json(model_path, model)
+
+
+def lock_owner(lock_path=LOCK_PATH):
+    """pid of the training holding the lock (-1 if it has not written its pid yet), or None if the lock is free"""
+    try:
+        f = open(lock_path, 'r')
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            # A shared lock is granted only while no training holds the exclusive one
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            try:
+                return int(json.load(f)['pid'])
+            except (ValueError, KeyError, TypeError):
+                return -1
+        return None
+
+
+def acquire_lock(lock_path=LOCK_PATH, fingerprint=None):
+    """Take the exclusive flock on the lock file; True if this process now holds it.
+
+    The kernel drops the lock when its holder exits, so a crashed training never leaves a stale lock.
+    """
+    global _lock_file
+    if _lock_file is not None:
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    f = open(lock_path, 'a+')
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return False
+    f.truncate(0)
+    json.dump({'pid': os.getpid(), 'fingerprint': fingerprint, 'started': datetime.now().isoformat()}, f)
+    f.flush()
+    _lock_file = f
+    return True
+
+
+def release_lock(lock_path=LOCK_PATH):
+    """Clear and unlock the lock file if this process holds it (the file itself stays)"""
+    global _lock_file
+    if _lock_file is None:
+        return
+    _lock_file.truncate(0)
+    _lock_file.close()
+    _lock_file = None
+
+
+def trigger_training(model_path=MODEL_PATH, annotations_dir=ANNOTATIONS_DIR, lock_path=LOCK_PATH, command=None):
+    """Run the training pipeline under the lock and stamp the model with the fingerprint it was trained on"""
+    fingerprint = training_fingerprint(annotations_dir)
+    if not acquire_lock(lock_path, fingerprint):
+        print(f"⏳ Training already running (pid {lock_owner(lock_path)})")
+        return True
+    try:
+        print(f"🎯 Starting auto-training (fingerprint {fingerprint})...")
+        args, cwd = command or training_command()
+        result = subprocess.run(args, cwd=cwd)
+        if result.returncode != 0:
+            return False
+        if os.path.exists(model_path):
+            # The pre-training fingerprint: annotations edited during training make the model stale again
+            stamp_model(model_path, fingerprint)
+        return True
+    finally:
+        release_lock(lock_path)
+
+
+def start_background_training(log_path=LOG_PATH, extra_args=()):
+    """Launch `auto_train.py --train` detached from this process (own session, output to log_path); returns it"""
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    with open(log_path, 'a') as log:
+        log.write(f"\n=== auto-training started {datetime.now().isoformat()} ===\n")
+        log.flush()
+        return subprocess.Popen([sys.executable, os.path.abspath(__file__), '--train', *extra_args],
+                                cwd=ROOT, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                start_new_session=True, close_fds=True)
+
+
+def model_status(model_path=MODEL_PATH, annotations_dir=ANNOTATIONS_DIR, lock_path=LOCK_PATH):
+    """{'current', 'stored', 'stale', 'training_pid'}"""
+    current = training_fingerprint(annotations_dir)
+    stored = stored_fingerprint(model_path)
+    return {'current': current, 'stored': stored, 'stale': current != stored, 'training_pid': lock_owner(lock_path)}
+
 
 def main():
     """Main auto-training logic"""
-    print("🔍 Checking for existing ASL model...")
-    
-    if not check_model_exists():
-        print("🚀 No model found - triggering auto-training")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--foreground', action='store_true', help='train in this process and wait for it')
+    parser.add_argument('--status', action='store_true', help='only report whether the model is stale')
+    parser.add_argument('--train', action='store_true', help=argparse.SUPPRESS)  # the detached worker
+    args = parser.parse_args()
+
+    if args.train:
+        return trigger_training()
+
+    print("🔍 Checking ASL model fingerprint...")
+    status = model_status()
+    if args.status:
+        print(json.dumps(status, indent=2))
+        return True
+    if not status['stale']:
+        print(f"✅ Model is up to date (fingerprint {status['current']}) - skipping training")
+        return True
+    reason = 'no fingerprinted model' if status['stored'] is None else \
+        f"annotations or training code changed ({status['stored']} → {status['current']})"
+    if status['training_pid'] is not None:
+        print(f"⏳ Model is stale ({reason}); training already running (pid {status['training_pid']})")
+        return True
+    if args.foreground:
+        print(f"🚀 Model is stale ({reason}) - training")
         if trigger_training():
             print("✅ Auto-training completed successfully!")
             return True
-        else:
-            print("❌ Auto-training failed")
-            return False
-    else:
-        print("✅ Model already exists - skipping training")
-        return True
+        print("❌ Auto-training failed")
+        return False
+    process = start_background_training()
+    print(f"🚀 Model is stale ({reason}) - retraining in the background (pid {process.pid}, log {LOG_PATH}); "
+          f"servers start on the current model")
+    return True
+
 
 if __name__ == "__main__":
     success = main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Autotune benchmark: hardcoded batch settings vs the tuned ones
+Runs the throughput autotuner on the frame classifier workload (synthetic
+frames unless --signs-dir has labelled ones), then times longer runs with the
+old hardcoded CPU defaults (batch 4, 2 loader workers) and with the tuned
+batch size and worker count. The cache is a temporary file, so the sweep
+always runs.
+
+    python3 benchmarks/bench_autotune.py --seconds 3
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import training_autotune
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signs-dir', default=os.path.join(ROOT, 'training_data', 'asl_signs'))
+    parser.add_argument('--seconds', type=float, default=3.0, help='length of each comparison run')
+    parser.add_argument('--trial-seconds', type=float, default=training_autotune.TRIAL_SECONDS)
+    args = parser.parse_args()
+
+    load_batch, train_step = training_autotune.frame_classifier_workload(args.signs_dir)
+    with tempfile.TemporaryDirectory() as directory:
+        result = training_autotune.autotune('bench', load_batch, train_step, trial_seconds=args.trial_seconds,
+                                            cache_path=os.path.join(directory, 'autotune_cache.json'))
+    print(f"⏱️  Sweep: {len(result['trials'])} trials in {result['tuning_seconds']}s")
+
+    runs = [('hardcoded', 4, 2), ('autotuned', result['batch_size'], result['dataloader_num_workers'])]
+    rates = {}
+    for name, batch_size, workers in runs:
+        rates[name] = training_autotune.run_trial(load_batch, train_step, batch_size, workers, args.seconds)
+        print(f"   {name:<10} batch {batch_size:>3}, {workers} workers: {rates[name]:8,.0f} samples/s")
+    print(f"🚀 Autotuned / hardcoded: {rates['autotuned'] / rates['hardcoded']:.2f}x")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
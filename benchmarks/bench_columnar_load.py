@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Training sample load benchmark: one JSON file per sample vs columnar export
+Writes N synthetic samples both as per-sample JSON files (the old
+training_data/processed/ layout) and as a columnar_export part, then times
+loading each. Peak memory of each load is measured with tracemalloc.
+
+    python3 benchmarks/bench_columnar_load.py --samples 100000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import columnar_export
+
+
+def make_samples(count):
+    return [{
+        'sign': ['hello', 'help', 'stop', 'thank you', 'robot pick up'][i % 5],
+        'session_id': f"session_{i % 200}",
+        'timestamp': 1750000000000 + i * 250,
+        'logged_at': 1750000000.0 + i * 0.25,
+        'frame': f"{i:064x}",
+        'ext': 'jpg',
+    } for i in range(count)]
+
+
+def load_json_files(directory):
+    samples = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename)) as f:
+                samples.append(json.load(f))
+    return samples
+
+
+def timed(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=100000)
+    args = parser.parse_args()
+
+    samples = make_samples(args.samples)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = os.path.join(tmp, 'processed')
+        os.makedirs(json_dir)
+        for i, sample in enumerate(samples):
+            with open(os.path.join(json_dir, f"sample_{i:07d}.json"), 'w') as f:
+                json.dump(columnar_export.logged_sample_record(sample, tmp), f)
+
+        export_dir = os.path.join(tmp, 'columnar')
+        start = time.perf_counter()
+        columnar_export.write_part(export_dir, [columnar_export.logged_sample_record(s, tmp) for s in samples])
+        export_s = time.perf_counter() - start
+        part_bytes = sum(os.path.getsize(os.path.join(export_dir, name)) for name in os.listdir(export_dir))
+
+        loaded_json, json_s, json_peak = timed(load_json_files, json_dir)
+        columns, columnar_s, columnar_peak = timed(columnar_export.load_columns, export_dir)
+        records, records_s, _ = timed(lambda: list(columns.records()))
+
+    assert len(loaded_json) == len(columns) == len(records) == args.samples
+    print(f"📊 Loading {args.samples:,} training samples")
+    print(f"   JSON file per sample:  {json_s * 1000:8.0f}ms  peak {json_peak / 2**20:6.1f}MB")
+    print(f"   Columnar (arrays):     {columnar_s * 1000:8.0f}ms  peak {columnar_peak / 2**20:6.1f}MB "
+          f"({part_bytes / 2**20:.1f}MB on disk, export took {export_s:.2f}s)")
+    print(f"   Columnar → dicts:      {records_s * 1000:8.0f}ms")
+    print(f"   Speedup (arrays):      {json_s / columnar_s:8.1f}x")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
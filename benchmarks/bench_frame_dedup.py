@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate removal benchmark: batched pHash throughput and LSH scaling
+Hashes a batch of 128x128 frames, then runs dedup on synthetic hash sets of
+growing size (bursts of near-identical frames, as sessions produce) and
+reports time per frame. It grows slowly with N as the 16-bit band buckets
+fill up, since every earlier member of a probed bucket is checked. On the
+smallest set the kept frames are checked against a brute-force greedy pass.
+
+    python3 benchmarks/bench_frame_dedup.py --sizes 10000 100000 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import frame_dedup
+
+
+def synthetic_hashes(frames, burst, flips, classes, seed=0):
+    """Bursts of `burst` frames, each up to `flips` bits off its burst's base hash"""
+    rng = np.random.default_rng(seed)
+    bursts = -(-frames // burst)
+    hashes = np.repeat(rng.integers(0, 2**63, bursts, dtype=np.int64).astype(np.uint64) << np.uint64(1), burst)[:frames]
+    for _ in range(flips):
+        hashes ^= (np.uint64(1) << rng.integers(0, 64, frames).astype(np.uint64)) \
+            * (rng.random(frames) < 0.7).astype(np.uint64)
+    return hashes, np.repeat(np.arange(bursts) % classes, burst)[:frames]
+
+
+def brute_force(hashes, labels, threshold):
+    kept, keep = [], np.zeros(len(hashes), dtype=bool)
+    for i, value in enumerate(hashes.tolist()):
+        if not any(labels[j] == labels[i] and (value ^ hashes[j].item()).bit_count() <= threshold for j in kept):
+            kept.append(i)
+            keep[i] = True
+    return keep
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--burst', type=int, default=20, help='frames per burst of near-duplicates')
+    parser.add_argument('--flips', type=int, default=2, help='bits flipped per frame within a burst')
+    parser.add_argument('--classes', type=int, default=50)
+    parser.add_argument('--threshold', type=int, default=frame_dedup.THRESHOLD)
+    parser.add_argument('--hash-frames', type=int, default=4096)
+    args = parser.parse_args()
+
+    frames = np.random.default_rng(0).integers(0, 256, (args.hash_frames, 128, 128), dtype=np.uint8)
+    start = time.perf_counter()
+    frame_dedup.phash(frames)
+    seconds = time.perf_counter() - start
+    print(f"#️⃣  pHash: {args.hash_frames} 128x128 frames in {seconds:.2f}s ({args.hash_frames / seconds:,.0f} frames/s)")
+
+    for size in args.sizes:
+        hashes, labels = synthetic_hashes(size, args.burst, args.flips, args.classes)
+        keep, _, stats = frame_dedup.dedup(hashes, labels, args.threshold)
+        line = (f"   {size:>9,} frames: {stats['removed']:>9,} removed, {stats['candidates']:>11,} candidates, "
+                f"{stats['seconds']:7.2f}s ({stats['seconds'] / size * 1e6:5.1f}us/frame)")
+        if size == min(args.sizes) and size <= 20000:
+            start = time.perf_counter()
+            reference = brute_force(hashes, labels, args.threshold)
+            line += (f", brute force {time.perf_counter() - start:.1f}s keeps {reference.sum():,} vs {keep.sum():,} "
+                     f"({(keep == reference).mean():.2%} agree)")
+        print(line)
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Image shard benchmark: directory of JPEGs vs packed uint8 shards
+Writes N camera-size JPEG frames into signs_dir/<class>/, packs them, then
+times one epoch of shuffled batches three ways: open + decode + resize per
+frame from the directory layout (what training does today), random gathers
+from the memory-mapped shards, and zero-copy block views from the shards.
+
+    python3 benchmarks/bench_image_shards.py --frames 2000 --batch-size 64
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import image_shards
+import sign_classifier
+
+
+def write_frames(signs_dir, frames, classes):
+    rng = np.random.default_rng(0)
+    # A few base images with noise keep the JPEGs camera-like without costing minutes to generate
+    bases = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(4)]
+    for i in range(frames):
+        class_dir = os.path.join(signs_dir, f"sign_{i % classes}")
+        os.makedirs(class_dir, exist_ok=True)
+        frame = np.clip(bases[i % 4].astype(np.int16) + rng.integers(-8, 8, (480, 640, 3)), 0, 255)
+        Image.fromarray(frame.astype(np.uint8)).save(os.path.join(class_dir, f"{i:06d}.jpg"), quality=85)
+
+
+def epoch(batches):
+    start = time.perf_counter()
+    frames = checksum = 0
+    for batch, labels in batches:
+        frames += len(batch)
+        checksum += int(batch[:, 0, 0].sum())  # touch the data
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--classes', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--size', type=int, default=image_shards.IMAGE_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        signs_dir, shards_dir = os.path.join(directory, 'asl_signs'), os.path.join(directory, 'image_shards')
+        write_frames(signs_dir, args.frames, args.classes)
+        start = time.perf_counter()
+        index = image_shards.pack(signs_dir, shards_dir, size=args.size)
+        pack_seconds = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(shards_dir, shard['name'])) for shard in index['shards'])
+        print(f"🗃️  {args.frames} frames packed to {args.size}x{args.size} in {pack_seconds:.2f}s "
+              f"({len(index['shards'])} shards, {size / 2**20:.1f}MB)")
+
+        paths, labels, _ = sign_classifier.list_dataset(signs_dir)
+        order = np.random.default_rng(0).permutation(len(paths))
+        batches = [order[i:i + args.batch_size] for i in range(0, len(order), args.batch_size)]
+
+        def directory_batches():
+            for rows in batches:
+                yield np.stack([image_shards.load_image(paths[row], args.size) for row in rows]), labels[rows]
+
+        shards = image_shards.ImageShards(shards_dir)
+        rates = {
+            'directory (decode per frame)': epoch(directory_batches()),
+            'shards, random gather': epoch(shards.batch(rows) for rows in batches),
+            'shards, block views': epoch(shards.iter_batches(args.batch_size, shuffle=True, seed=0)),
+        }
+        baseline = rates['directory (decode per frame)']
+        for name, rate in rates.items():
+            print(f"   {name:<30} {rate:10,.0f} frames/s  {rate / baseline:7.1f}x")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Retraining benchmark: full pattern rebuild vs incremental update
+Builds the pattern model from N synthetic annotation records, then times a
+no-change rerun and incremental runs with 0.1%, 1% and 10% of the records
+replaced, against a full rebuild of the same records. Record hashes come
+from the annotation cache in real runs, so only new records are hashed here.
+
+    python3 benchmarks/bench_incremental_training.py --records 50000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import incremental_training
+from annotation_loader import record_hash
+
+
+def make_records(count, signs, start=0):
+    return [{'text': f"sign {i % signs}", 'timestamp': 1760000000 + start + i, 'image_file': f"{start + i}.jpg",
+             'confidence': 0.9, 'session_id': f"session_{i % 50}"} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--signs', type=int, default=1000)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.signs)
+    hashes = [record_hash(record) for record in records]
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'asl_patterns.json')
+        print(f"🎓 {args.records} records, {args.signs} distinct signs")
+        start = time.perf_counter()
+        model, changes = incremental_training.update_model(records, model_path, full=True)
+        full = time.perf_counter() - start
+        print(f"   {'full rebuild':<18} {full * 1000:8.1f}ms  {changes['patterns_updated']:5d} patterns "
+              f"-> v{model['version']} (hashing every record)")
+
+        start = time.perf_counter()
+        model, changes = incremental_training.update_model(records, model_path, hashes=hashes)
+        print(f"   {'no change':<18} {(time.perf_counter() - start) * 1000:8.1f}ms      0 patterns    "
+              f"v{model['version']}")
+
+        for fraction in (0.001, 0.01, 0.1):
+            replaced = max(1, int(len(records) * fraction))
+            new_records = make_records(replaced, args.signs // 10 or 1, start=len(records) * 10)
+            start = time.perf_counter()
+            records = records[replaced:] + new_records
+            hashes = hashes[replaced:] + [record_hash(record) for record in new_records]
+            model, changes = incremental_training.update_model(records, model_path, hashes=hashes)
+            elapsed = time.perf_counter() - start
+            print(f"   {f'{fraction:.1%} replaced':<18} {elapsed * 1000:8.1f}ms  {changes['patterns_updated']:5d} "
+                  f"patterns -> v{model['version']} ({full / elapsed:.1f}x faster than a full rebuild)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+/ml/log_sign ingest benchmark
+Posts training samples (distinct JPEG-shaped frames) from several client
+threads through the Flask test client into a temporary frame store, then
+reports the accept rate, the end-to-end rate until every sample is durable,
+how many were shed and the batch sizes the writer used.
+
+    python3 benchmarks/bench_ingest.py --samples 5000 --threads 8
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TARGET_RATE = 1000.0
+
+
+def make_payloads(count, frame_bytes):
+    """Pre-encoded JSON bodies, so client-side encoding isn't charged to the server"""
+    payloads = []
+    for i in range(count):
+        frame = b'\xff\xd8\xff\xe0' + i.to_bytes(8, 'little') + os.urandom(frame_bytes - 12)
+        payloads.append(json.dumps({
+            'sign': ['hello', 'help', 'stop', 'thank you'][i % 4],
+            'imageData': 'data:image/jpeg;base64,' + base64.b64encode(frame).decode(),
+            'sessionId': f"bench_{i % 16}",
+            'timestamp': time.time() * 1000
+        }).encode())
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--frame-kb', type=float, default=12.0, help='frame size (a 320x240 JPEG is ~10-20KB)')
+    args = parser.parse_args()
+
+    store_dir = tempfile.mkdtemp(prefix='bench_ingest_')
+    os.environ['FRAME_STORE_DIR'] = store_dir
+    os.environ.setdefault('ASL_AUDIT_DIR', os.path.join(store_dir, 'audit'))
+    os.environ.setdefault('LOG_SAMPLE_RATES', '/ml/log_sign=0')
+    import asl_server
+    from sample_ingest import BATCH_SIZE, SHED
+
+    payloads = make_payloads(args.samples, int(args.frame_kb * 1024))
+    statuses = []
+    shed_before = SHED.get()
+
+    def client_thread(chunk):
+        client = asl_server.app.test_client()
+        for payload in chunk:
+            statuses.append(client.post('/ml/log_sign', data=payload, content_type='application/json').status_code)
+
+    chunks = [payloads[i::args.threads] for i in range(args.threads)]
+    threads = [threading.Thread(target=client_thread, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    accepted_at = time.perf_counter() - start
+    asl_server.sample_ingestor.flush()
+    durable_at = time.perf_counter() - start
+
+    accepted = statuses.count(202)
+    written = asl_server.frame_store.count_samples()
+    batches = BATCH_SIZE.labels()
+    print(f"📊 /ml/log_sign ingest ({args.samples} samples, {args.threads} client threads, {args.frame_kb:.0f}KB frames)")
+    print(f"   Accepted (202):   {accepted} in {accepted_at:.2f}s → {accepted / accepted_at:,.0f} signs/s")
+    print(f"   Durable:          {written} in {durable_at:.2f}s → {written / durable_at:,.0f} signs/s")
+    print(f"   Shed (503):       {int(SHED.get() - shed_before)}")
+    print(f"   Batches:          {int(batches.count)} (avg {batches.sum / max(batches.count, 1):.1f} samples)")
+
+    rate = written / durable_at
+    if rate < TARGET_RATE:
+        print(f"❌ Ingest rate {rate:,.0f} signs/s below target {TARGET_RATE:,.0f}")
+        return False
+    print(f"✅ Ingest rate {rate:,.0f} signs/s meets the {TARGET_RATE:,.0f} signs/s target")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
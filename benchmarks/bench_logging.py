@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Logging cost benchmark
+Compares the old synchronous f-string logging with the queue-based
+structured_log pipeline: caller-side cost per log call, cost per
+/ml/log_sign request, the effect of per-route sampling and drop counting
+when the queue overflows.
+"""
+
+import os
+import sys
+import base64
+import time
+import logging
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import structured_log
+from structured_log import log_event
+
+logger = logging.getLogger('bench')
+
+
+def configure_sync(stream):
+    """What the servers did before: basicConfig-style handler on the calling thread"""
+    structured_log.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def configure_queued(stream, sample_rates=None, queue_size=structured_log.LOG_QUEUE_SIZE):
+    structured_log.setup_logging('bench', stream=stream, sample_rates=sample_rates or {}, queue_size=queue_size)
+
+
+def per_call_ns(emit, calls):
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        emit(i)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def old_style(i):
+    sign = 'thank you'
+    logger.info(f"🤟 Logged ASL sign: {sign} session=session_{i % 8}")
+
+
+def new_style(i):
+    log_event(logger, '/ml/log_sign', "Logged ASL sign: %s", 'thank you', sign='thank you',
+              session_id=f"session_{i % 8}")
+
+
+def per_request_us(client, requests_count):
+    frame = base64.b64encode(b'\xff\xd8\xff\xe0' + bytes(1532)).decode()
+    payload = {'sign': 'hello', 'imageData': 'data:image/jpeg;base64,' + frame,
+               'sessionId': 'bench', 'timestamp': 0}
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        client.post('/ml/log_sign', json=payload)
+    return (time.perf_counter() - start) / requests_count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryFile('w+') as sink:
+        configure_sync(sink)
+        results['sync f-string'] = per_call_ns(old_style, args.calls)
+
+        configure_queued(sink)
+        results['queued structured'] = per_call_ns(new_style, args.calls)
+        structured_log.shutdown_logging()
+
+        configure_queued(sink, sample_rates={'/ml/log_sign': 0.1})
+        results['queued, 10% sampled'] = per_call_ns(new_style, args.calls)
+        structured_log.shutdown_logging()
+
+        dropped_before = structured_log.DROPPED.get()
+        configure_queued(sink, queue_size=100)
+        per_call_ns(new_style, args.calls)
+        structured_log.shutdown_logging()
+        dropped = structured_log.DROPPED.get() - dropped_before
+
+        os.environ.setdefault('FRAME_STORE_DIR', tempfile.mkdtemp(prefix='bench_logging_'))
+        os.environ.setdefault('ASL_AUDIT_DIR', os.path.join(os.environ['FRAME_STORE_DIR'], 'audit'))
+        import asl_server
+        client = asl_server.app.test_client()
+        configure_sync(sink)
+        sync_request = per_request_us(client, args.requests)
+        configure_queued(sink)
+        queued_request = per_request_us(client, args.requests)
+        structured_log.shutdown_logging()
+
+    print(f"📊 Logging cost ({args.calls} calls, caller side)")
+    for name, ns in results.items():
+        print(f"   {name:<22} {ns / 1000:7.2f} µs/call")
+    print(f"   Queue of 100 overflowed: {int(dropped)} records dropped and counted")
+    print(f"📊 /ml/log_sign cost ({args.requests} requests)")
+    print(f"   sync logging           {sync_request:7.1f} µs/request")
+    print(f"   queued logging         {queued_request:7.1f} µs/request "
+          f"({queued_request - sync_request:+.1f} µs)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Metrics overhead benchmark for the ASL server
+Runs /v1/chat/completions against a local canned llama backend with metrics on and off
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+import http.server
+from socketserver import ThreadingMixIn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import logging
+logging.disable(logging.INFO)
+
+import server_metrics
+import asl_server
+
+CANNED_COMPLETION = json.dumps({
+    'choices': [{'message': {'role': 'assistant',
+                             'content': 'The person is waving their open hand, this looks like hello'}}]
+}).encode()
+
+
+class CannedLlamaHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(CANNED_COMPLETION)))
+        self.end_headers()
+        self.wfile.write(CANNED_COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadedHTTPServer(ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+def build_request(image_kb):
+    """A chat completion request shaped like the browser's (base64 JPEG data URL)"""
+    image = 'data:image/jpeg;base64,' + 'A' * (image_kb * 1024)
+    return {
+        'model': 'SmolVLM',
+        'messages': [{'role': 'user', 'content': [
+            {'type': 'text', 'text': 'What ASL sign is being shown?'},
+            {'type': 'image_url', 'image_url': {'url': image}}
+        ]}],
+        'max_tokens': 100
+    }
+
+
+def run_round(client, payload, requests_per_round):
+    start = time.perf_counter()
+    for _ in range(requests_per_round):
+        response = client.post('/v1/chat/completions', json=payload)
+        assert response.status_code == 200, response.data
+    return (time.perf_counter() - start) / requests_per_round
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=200, help='requests per round')
+    parser.add_argument('--image-kb', type=int, default=48, help='size of the base64 frame')
+    parser.add_argument('--max-overhead', type=float, default=1.0, help='fail above this percentage')
+    args = parser.parse_args()
+
+    upstream = ThreadedHTTPServer(('127.0.0.1', 0), CannedLlamaHandler)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    asl_server.LLAMA_SERVER_URL = f"http://127.0.0.1:{upstream.server_address[1]}"
+
+    client = asl_server.app.test_client()
+    payload = build_request(args.image_kb)
+
+    # Warm up connection pools and code paths
+    for enabled in (True, False):
+        server_metrics.set_enabled(enabled)
+        run_round(client, payload, 20)
+
+    # Interleave rounds so drift affects both modes equally
+    timings = {True: [], False: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            server_metrics.set_enabled(enabled)
+            timings[enabled].append(run_round(client, payload, args.requests))
+    server_metrics.set_enabled(True)
+
+    off = statistics.median(timings[False])
+    on = statistics.median(timings[True])
+    overhead_us = (on - off) * 1e6
+    overhead_pct = (on - off) / off * 100
+
+    print("📊 Metrics overhead benchmark")
+    print(f"   Requests: {args.rounds} x {args.requests} per mode, {args.image_kb}KB frames")
+    print(f"   Metrics off: {off * 1e6:8.1f} µs/request")
+    print(f"   Metrics on:  {on * 1e6:8.1f} µs/request")
+    print(f"   Overhead:    {overhead_us:8.1f} µs/request ({overhead_pct:+.2f}%)")
+
+    upstream.shutdown()
+    if overhead_pct > args.max_overhead:
+        print(f"❌ Overhead above {args.max_overhead}%")
+        return False
+    print(f"✅ Overhead within {args.max_overhead}%")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
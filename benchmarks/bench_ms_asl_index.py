@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+MS-ASL query benchmark: memory-mapped columnar index vs scanning records
+Builds the index for the real splits (plus a synthetic split N times larger),
+then times opening it and answering class-set, signer, duration and combined
+queries against the same filters applied to records in memory and to a
+streamed re-read of the JSON.
+
+    python3 benchmarks/bench_ms_asl_index.py --scale 10
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ms_asl
+import ms_asl_index
+
+MS_ASL_DIR = os.path.join(ROOT, 'training_data', 'MS-ASL')
+COMMANDS = ['hello', 'help', 'stop', 'go', 'thank you', 'robot', 'lights', 'call']
+
+QUERIES = {
+    'class set (8 glosses)': ({'labels': COMMANDS},
+                              lambda r: r['label'] in COMMANDS or r['clean_text'] in COMMANDS),
+    'signer': ({'signers': [80]}, lambda r: r['signer_id'] == 80),
+    'duration 1-2s': ({'min_duration': 1.0, 'max_duration': 2.0},
+                      lambda r: 1.0 <= r['end_time'] - r['start_time'] <= 2.0),
+    'combined': ({'labels': COMMANDS, 'min_fps': 25, 'min_box_area': 0.3},
+                 lambda r: (r['clean_text'] in COMMANDS) and r['fps'] >= 25 and
+                 abs((r['box'][2] - r['box'][0]) * (r['box'][3] - r['box'][1])) >= 0.3),
+}
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def write_scaled_split(data_dir, scale):
+    """A synthetic 'train' split: val repeated `scale` times"""
+    with open(ms_asl.split_path('val', MS_ASL_DIR)) as f:
+        records = json.load(f)
+    with open(ms_asl.split_path('train', data_dir), 'w') as f:
+        json.dump(records * scale, f)
+
+
+def report(name, data_dir):
+    index_dir = os.path.join(data_dir, ms_asl_index.INDEX_DIRNAME)
+    meta, build = timed(lambda: ms_asl_index.build_index(data_dir, index_dir))
+    index, load = timed(lambda: ms_asl_index.MsAslIndex(index_dir), repeat=20)
+    records, json_load = timed(lambda: list(ms_asl.iter_records(data_dir=data_dir)))
+    print(f"📚 {name}: {meta['rows']} rows, build {build:.2f}s, open index {load * 1000:.2f}ms "
+          f"(vs {json_load:.2f}s to parse the JSON)")
+    print(f"   {'query':<22} {'rows':>6} {'index':>9} {'in-memory':>10} {'stream':>9}")
+    for label, (filters, predicate) in QUERIES.items():
+        rows, indexed = timed(lambda: index.select(**filters), repeat=20)
+        matched, scanned = timed(lambda: [r for r in records if predicate(r)], repeat=3)
+        _, streamed = timed(lambda: sum(1 for r in ms_asl.iter_records(data_dir=data_dir) if predicate(r)))
+        assert len(rows) == len(matched), label
+        print(f"   {label:<22} {len(rows):6d} {indexed * 1000:7.2f}ms {scanned * 1000:8.1f}ms {streamed * 1000:7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10, help='synthetic split = val x scale')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for split in ms_asl.available_splits(MS_ASL_DIR):
+            shutil.copy(ms_asl.split_path(split, MS_ASL_DIR), data_dir)
+        report('MS-ASL val+test', data_dir)
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_scaled_split(data_dir, args.scale)
+        report(f"synthetic train (val x {args.scale})", data_dir)
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+MS-ASL loading benchmark: json.load vs the streaming reader
+For the real val/test splits and a synthetic split N times larger, compares
+full json.load, streaming every record, a streamed label filter and an early
+stop. Peak memory is measured with tracemalloc; the streamed peak should not
+grow with split size.
+
+    python3 benchmarks/bench_ms_asl_stream.py --scale 10
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ms_asl
+
+MS_ASL_DIR = os.path.join(ROOT, 'training_data', 'MS-ASL')
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def full_load(path):
+    with open(path) as f:
+        return len(json.load(f))
+
+
+def streamed(data_dir, split, **filters):
+    return sum(1 for _ in ms_asl.iter_records(split, data_dir, **filters))
+
+
+def write_scaled_split(data_dir, scale):
+    """A synthetic 'train' split: val repeated `scale` times"""
+    with open(ms_asl.split_path('val', MS_ASL_DIR)) as f:
+        records = json.load(f)
+    with open(ms_asl.split_path('train', data_dir), 'w') as f:
+        f.write('[')
+        for i in range(scale):
+            for j, record in enumerate(records):
+                f.write(',\n' if i or j else '')
+                f.write(json.dumps(record))
+        f.write('\n]')
+
+
+def report(name, path, data_dir, split):
+    size_mb = os.path.getsize(path) / 2**20
+    print(f"📚 {name} ({size_mb:.1f}MB)")
+    for label, fn in [
+        ('json.load', lambda: full_load(path)),
+        ('stream all', lambda: streamed(data_dir, split)),
+        ("stream label='hello'", lambda: streamed(data_dir, split, labels=['hello'])),
+        ('stream limit=1000', lambda: streamed(data_dir, split, limit=1000)),
+    ]:
+        count, elapsed, peak = measure(fn)
+        print(f"   {label:<22} {count:7d} records {elapsed * 1000:7.0f}ms  peak {peak / 2**20:6.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10, help='synthetic split = val x scale')
+    args = parser.parse_args()
+
+    for split in ms_asl.available_splits(MS_ASL_DIR):
+        report(f"MSASL_{split}.json", ms_asl.split_path(split, MS_ASL_DIR), MS_ASL_DIR, split)
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_scaled_split(data_dir, args.scale)
+        report(f"synthetic train (val x {args.scale})", ms_asl.split_path('train', data_dir), data_dir, 'train')
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Pattern-matching microbenchmark and regression suite
+Runs realistic VLM outputs (built from MS-ASL validation glosses) through
+process_asl_response, simple_pattern_recognition and get_asl_confidence with
+pattern sets of 10, 100 and 1000 MS-ASL classes. Records ns per response and
+peak allocation per response, and fails when a result regresses past the
+stored baseline in benchmarks/baselines/pattern_matching.json. Timings are
+medians over repeated runs; a baseline is the median of several suite runs.
+
+    python3 benchmarks/bench_pattern_matching.py                    # check
+    python3 benchmarks/bench_pattern_matching.py --update-baseline  # accept
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import logging
+logging.disable(logging.INFO)
+
+import asl_server
+
+MS_ASL_DIR = os.path.join(ROOT, 'training_data', 'MS-ASL')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'pattern_matching.json')
+PATTERN_SET_SIZES = (10, 100, 1000)
+
+# How SmolVLM tends to phrase what it sees
+SIGN_TEMPLATES = [
+    "The person appears to be signing {gloss}",
+    "I see a hand moving near the chest, this looks like the ASL sign for {gloss}",
+    "The signer is making the sign {gloss} with both hands",
+    "Based on the hand shape and movement, the sign is likely \"{gloss}\"",
+    "A person in a dark shirt is signing. The gesture resembles {gloss}.",
+]
+NO_SIGN_TEMPLATES = [
+    "The image shows a person sitting in front of a laptop",
+    "I can't see any hands in this frame",
+    "A blurry image of a room with a window and a chair",
+    "The person is looking at the camera with their hands down",
+]
+GESTURES = ['wave', 'fist_on_palm', 'flat_hand', 'grasp', 'place', 'up', 'down', 'phone', 'talk', 'chin_forward']
+
+
+def load_json(name):
+    with open(os.path.join(MS_ASL_DIR, name), 'r') as f:
+        return json.load(f)
+
+
+def build_pattern_model(classes, size):
+    """A trained-model dict in the models/asl_patterns.json format for the first `size` classes"""
+    patterns = {}
+    for index, gloss in enumerate(classes[:size]):
+        patterns[gloss] = {
+            'words': gloss.split(),
+            'gesture': GESTURES[index % len(GESTURES)],
+            'confidence': round(0.6 + (index % 4) * 0.1, 2)
+        }
+    return {
+        'model_type': 'asl_pattern_matcher',
+        'version': 'bench',
+        'patterns': patterns,
+        'trained_commands': len(patterns),
+        'status': 'benchmark',
+        'supported_commands': list(patterns)
+    }
+
+
+def build_responses(count, seed=1234):
+    """Deterministic (VLM output, gloss) pairs: MS-ASL val glosses in templates plus no-sign frames"""
+    rng = random.Random(seed)
+    samples = load_json('MSASL_val.json')
+    responses = []
+    while len(responses) < count:
+        if rng.random() < 0.2:
+            text = rng.choice(NO_SIGN_TEMPLATES)
+            responses.append((text, text))
+            continue
+        sample = rng.choice(samples)
+        gloss = sample['org_text'] if rng.random() < 0.5 else sample['clean_text']
+        responses.append((rng.choice(SIGN_TEMPLATES).format(gloss=gloss), gloss))
+    return responses
+
+
+def time_ns_per_call(func, inputs, repeat):
+    """Median over `repeat` runs of the mean nanoseconds per call (one warm-up run first)"""
+    for item in inputs:
+        func(item)
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for item in inputs:
+            func(item)
+        runs.append((time.perf_counter_ns() - start) / len(inputs))
+    return statistics.median(runs)
+
+
+def peak_bytes_per_call(func, inputs):
+    """Mean tracemalloc peak (bytes) allocated while handling one input"""
+    tracemalloc.start()
+    total = 0
+    try:
+        for item in inputs:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func(item)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - baseline
+    finally:
+        tracemalloc.stop()
+    return total / len(inputs)
+
+
+def detection_digest(responses):
+    """Stable fingerprint of what the matcher detects, so behaviour changes are caught too"""
+    digest = hashlib.sha256()
+    detected = 0
+    for response in responses:
+        output = asl_server.process_asl_response(response, None)
+        signs = [line for line in output.split('\n') if line.startswith('SIGN:')]
+        detected += bool(signs)
+        digest.update('|'.join(signs).encode())
+    return detected, digest.hexdigest()[:16]
+
+
+def run_suite(responses_count=2000, repeat=9, alloc_sample=300):
+    classes = load_json('MSASL_classes.json')
+    pairs = build_responses(responses_count)
+    responses = [text for text, _ in pairs]
+    glosses = [gloss for _, gloss in pairs]
+    original_model = asl_server.TRAINED_MODEL
+    results = {}
+    try:
+        for size in PATTERN_SET_SIZES:
+            asl_server.TRAINED_MODEL = build_pattern_model(classes, size)
+            process = lambda text: asl_server.process_asl_response(text, None)
+            detected, digest = detection_digest(responses)
+            results[str(size)] = {
+                'process_asl_response_ns': round(time_ns_per_call(process, responses, repeat)),
+                'simple_pattern_recognition_ns': round(
+                    time_ns_per_call(asl_server.simple_pattern_recognition, responses, repeat)),
+                'get_asl_confidence_ns': round(
+                    time_ns_per_call(asl_server.get_asl_confidence, glosses, repeat)),
+                'process_asl_response_peak_bytes': round(peak_bytes_per_call(process, responses[:alloc_sample])),
+                'detected_responses': detected,
+                'detection_digest': digest
+            }
+    finally:
+        asl_server.TRAINED_MODEL = original_model
+    return {
+        'responses': responses_count,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+
+def merge_median(suites):
+    """Suite whose timings are the per-metric median of `suites` (other fields from the first)"""
+    merged = json.loads(json.dumps(suites[0]))
+    for size, metrics in merged['results'].items():
+        for key in metrics:
+            if key.endswith('_ns'):
+                metrics[key] = round(statistics.median(s['results'][size][key] for s in suites))
+    return merged
+
+
+def compare(current, baseline, time_tolerance, alloc_tolerance):
+    """List of human-readable regressions (empty when everything is within tolerance)"""
+    regressions = []
+    for size, metrics in current['results'].items():
+        expected = baseline.get('results', {}).get(size)
+        if expected is None:
+            regressions.append(f"{size} patterns: no baseline recorded")
+            continue
+        for key, value in metrics.items():
+            reference = expected.get(key)
+            if reference is None:
+                continue
+            if key.endswith('_ns') and value > reference * (1 + time_tolerance):
+                regressions.append(f"{size} patterns: {key} {value}ns > baseline {reference}ns "
+                                   f"(+{(value / reference - 1) * 100:.0f}%)")
+            elif key.endswith('_bytes') and value > reference * (1 + alloc_tolerance) + 64:
+                regressions.append(f"{size} patterns: {key} {value}B > baseline {reference}B")
+            elif key in ('detected_responses', 'detection_digest') and value != reference:
+                regressions.append(f"{size} patterns: {key} changed ({reference} → {value})")
+    return regressions
+
+
+def print_results(suite):
+    print(f"📊 Pattern matching benchmark ({suite['responses']} VLM responses)")
+    print(f"   {'patterns':>8}  {'process_asl':>12}  {'simple':>10}  {'confidence':>10}  {'peak B':>8}  detected")
+    for size, m in suite['results'].items():
+        print(f"   {size:>8}  {m['process_asl_response_ns'] / 1000:>10.1f}µs  "
+              f"{m['simple_pattern_recognition_ns'] / 1000:>8.1f}µs  {m['get_asl_confidence_ns'] / 1000:>8.1f}µs  "
+              f"{m['process_asl_response_peak_bytes']:>8}  {m['detected_responses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--responses', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=9)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--baseline-runs', type=int, default=3, help='suite runs behind a new baseline')
+    parser.add_argument('--time-tolerance', type=float, default=0.50,
+                        help='allowed slowdown fraction (run-to-run noise on a busy laptop is ~30%%)')
+    parser.add_argument('--alloc-tolerance', type=float, default=0.10, help='allowed allocation growth fraction')
+    parser.add_argument('--json', help='write the raw results to this file')
+    args = parser.parse_args()
+
+    suite = run_suite(args.responses, args.repeat)
+    print_results(suite)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(suite, f, indent=2)
+
+    if args.update_baseline:
+        # A single run can land on a quiet (fast) moment; record the median of several
+        runs = [suite] + [run_suite(args.responses, args.repeat) for _ in range(args.baseline_runs - 1)]
+        suite = merge_median(runs)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(suite, f, indent=2)
+        print(f"📝 Baseline updated: {args.baseline}")
+        return True
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline} - run with --update-baseline")
+        return False
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get('responses') != suite['responses']:
+        print(f"⚠️  Baseline was recorded with {baseline.get('responses')} responses - results not comparable")
+        return False
+
+    regressions = compare(suite, baseline, args.time_tolerance, args.alloc_tolerance)
+    if regressions:
+        print("❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return False
+    print("✅ No regressions against baseline")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
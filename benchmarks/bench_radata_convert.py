@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+radata/ conversion benchmark: serial vs process pool, and resume cost
+Writes N synthetic collected samples (JSON with a base64 JPEG payload, like the
+browser posts) and reports files/s converting them inline and on process pools
+of increasing size, then interrupts a run halfway and times the resumed run.
+
+    python3 benchmarks/bench_radata_convert.py --files 5000 --payload-kb 24
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import shutil
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import radata_convert
+
+
+def write_samples(radata_dir, count, payload_kb):
+    os.makedirs(radata_dir)
+    payload = 'data:image/jpeg;base64,' + base64.b64encode(os.urandom(payload_kb * 768)).decode()
+    for i in range(count):
+        sample = {'image_data': payload, 'recognized_text': f"sign {i % 40}", 'timestamp': 1750000000 + i,
+                  'confidence': 'high', 'session_id': f"session_{i % 20}"}
+        with open(os.path.join(radata_dir, f"sample_{i:06d}.json"), 'w') as f:
+            json.dump(sample, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--payload-kb', type=int, default=24, help='base64 image size per sample')
+    parser.add_argument('--chunk-files', type=int, default=radata_convert.CHUNK_FILES)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        radata_dir = os.path.join(directory, 'radata')
+        write_samples(radata_dir, args.files, args.payload_kb)
+        print(f"🔄 {args.files} samples x {args.payload_kb}KB payload, {cpus} CPUs, "
+              f"{args.chunk_files} files per chunk")
+
+        for workers in sorted({1, 2, 4, cpus}):
+            if workers > cpus:
+                continue
+            export_dir = os.path.join(directory, f"columnar-{workers}")
+            stats = radata_convert.convert(radata_dir, export_dir, workers, args.chunk_files)
+            label = 'inline' if stats.pool is None else f"{workers} processes"
+            print(f"   {label:<12} {stats.seconds:6.2f}s  {stats.files_per_second():8,.0f} files/s")
+            shutil.rmtree(export_dir)
+
+        export_dir = os.path.join(directory, 'columnar-resume')
+        chunks = -(-args.files // args.chunk_files)
+        first = radata_convert.convert(radata_dir, export_dir, cpus, args.chunk_files, max_chunks=chunks // 2)
+        second = radata_convert.convert(radata_dir, export_dir, cpus, args.chunk_files)
+        print(f"⏯️  Interrupted after {first.converted} files ({first.seconds:.2f}s); resumed run converted "
+              f"{second.converted} and packed {second.rows} rows in {second.seconds:.2f}s")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+radisk reader benchmark on large synthetic shards
+Builds radisk shards shaped like the relay's (sessions, their sign sets, signs/
+nodes and training_data samples with base64 frames, radix-compressed keys with
+"" leaves), then compares json.load of each whole shard with the streaming
+reader: time, MB/s and peak traced memory (measured on a second run).
+
+    python3 benchmarks/bench_radisk.py --signs 50000 --samples 500
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import radisk
+
+ESC = radisk.ESC
+
+
+def graph_entries(signs, samples, payload_kb, sessions=50):
+    """{soul<ESC>field: (value or {'#': soul}, state)} like the relay writes for N signs"""
+    entries = {}
+    names = ['hello', 'help', 'stop', 'lights on', 'call ava', 'thank you', 'robot pick up']
+    for s in range(sessions):
+        session = f"scan_{1750000000000 + s * 1000}"
+        state = 1750000000000 + s * 1000
+        for field, value in (('id', session), ('startTime', state), ('status', 'complete'),
+                             ('signs', {'#': f"sessions/{session}/signs"})):
+            entries[f"sessions/{session}{ESC}{field}"] = (value, state)
+    for i in range(signs):
+        timestamp = 1750000000000 + i * 37
+        session = f"scan_{1750000000000 + (i % sessions) * 1000}"
+        sign = {'id': f"sign-{timestamp}", 'name': names[i % len(names)], 'confidence': 'High',
+                'description': 'Detected from text', 'timestamp': timestamp}
+        copy = f"mc{i:08d}x{timestamp % 99991:05d}"
+        for field, value in sign.items():
+            entries[f"signs/sign-{timestamp}{ESC}{field}"] = (value, timestamp + 0.001)
+            entries[f"{copy}{ESC}{field}"] = (value, timestamp + 0.002)
+        entries[f"{copy}{ESC}sessionId"] = (session, timestamp + 0.002)
+        entries[f"sessions/{session}/signs{ESC}{copy}"] = ({'#': copy}, timestamp + 0.003)
+        entries[f"signs{ESC}sign-{timestamp}"] = ({'#': f"signs/sign-{timestamp}"}, timestamp + 0.001)
+    image = 'data:image/jpeg;base64,' + base64.b64encode(os.urandom(payload_kb * 768)).decode()
+    for i in range(samples):
+        soul = f"td{i:07d}"
+        for field, value in (('sign', names[i % len(names)]), ('timestamp', 1750000000000 + i),
+                             ('imageData', image), ('sessionId', 'scan_1750000000000')):
+            entries[f"{soul}{ESC}{field}"] = (value, 1750000000000 + i)
+        entries[f"training_data{ESC}{soul}"] = ({'#': soul}, 1750000000000 + i)
+    return entries
+
+
+def radix(entries):
+    """Nested radix-tree object of sorted keys, each ending in {"": {":": value, ">": state}}"""
+    tree = {}
+    for key in sorted(entries):
+        node = tree
+        for char in key:
+            node = node.setdefault(char, {})
+        value, state = entries[key]
+        node[''] = {':': value, '>': state}
+
+    def compress(node):
+        out = {}
+        for part, child in node.items():
+            if part == '':
+                out[''] = child
+                continue
+            while len(child) == 1 and '' not in child:
+                (next_part, child), = child.items()
+                part += next_part
+            out[part] = compress(child)
+        return out
+    return compress(tree)
+
+
+def write_shards(radata_dir, entries, shards):
+    keys = sorted(entries)
+    size = -(-len(keys) // shards)
+    names = []
+    for n in range(shards):
+        part = keys[n * size:(n + 1) * size]
+        name = '!' if n == 0 else part[0][:12].replace(ESC, '%1B').replace('/', '%2F')
+        with open(os.path.join(radata_dir, name), 'w') as f:
+            f.write(json.dumps(radix({key: entries[key] for key in part}), separators=(',', ':')))
+        names.append(name)
+    with open(os.path.join(radata_dir, radisk.DIRECTORY_FILE), 'w') as f:
+        f.write(json.dumps(radix({name: (1, 1) for name in names})))
+
+
+def measure(function):
+    """(result, seconds, peak traced bytes); timed on a separate untraced run"""
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signs', type=int, default=50000)
+    parser.add_argument('--samples', type=int, default=500, help='training_data samples with an image')
+    parser.add_argument('--payload-kb', type=int, default=24)
+    parser.add_argument('--shards', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as radata_dir:
+        write_shards(radata_dir, graph_entries(args.signs, args.samples, args.payload_kb), args.shards)
+        paths = radisk.shard_files(radata_dir)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"🔫 {len(paths)} shards, {size / 2**20:.1f}MB ({args.signs} signs, {args.samples} image samples)")
+
+        def load_all():
+            for path in paths:
+                with open(path) as f:
+                    json.load(f)
+        _, seconds, peak = measure(load_all)
+        print(f"   json.load (whole shard)  {seconds:6.2f}s  {size / 2**20 / seconds:6.1f}MB/s  "
+              f"peak {peak / 2**20:7.1f}MB")
+
+        def stream():
+            counts = {'session': 0, 'sign': 0, 'training_data': 0}
+            for kind, _ in radisk.iter_records(radata_dir):
+                counts[kind] += 1
+            return counts
+        counts, seconds, peak = measure(stream)
+        print(f"   radisk.iter_records      {seconds:6.2f}s  {size / 2**20 / seconds:6.1f}MB/s  "
+              f"peak {peak / 2**20:7.1f}MB")
+        print(f"   -> {counts['session']} sessions, {counts['sign']} signs, {counts['training_data']} samples")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
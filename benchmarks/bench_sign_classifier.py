@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Sign classifier throughput benchmark
+Generates a synthetic labelled frame set (noisy shapes, one class per shape)
+as JPEGs in signs_dir/<class>/, then reports decode + feature extraction
+throughput, training time, holdout accuracy, weights size and inference
+throughput for single frames and batches.
+
+    python3 benchmarks/bench_sign_classifier.py --per-class 200 --classes 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sign_classifier
+
+
+def shape_frame(rng, label, classes, size):
+    """A noisy frame with a bar at one of `classes` orientations (label) at a random position"""
+    yy, xx = np.mgrid[:size, :size]
+    cy, cx = rng.integers(size // 3, 2 * size // 3, 2)
+    length, width = rng.integers(size // 6, size // 3), size // 20
+    angle = np.pi * label / classes
+    along = (yy - cy) * np.sin(angle) + (xx - cx) * np.cos(angle)
+    across = (yy - cy) * np.cos(angle) - (xx - cx) * np.sin(angle)
+    mask = (abs(along) < length) & (abs(across) < width)
+    return np.clip(rng.normal(90, 25, (size, size)) + mask * 110, 0, 255).astype(np.uint8)
+
+
+def write_dataset(signs_dir, classes, per_class, size):
+    rng = np.random.default_rng(0)
+    for label in range(classes):
+        class_dir = os.path.join(signs_dir, f"sign_{label}")
+        os.makedirs(class_dir)
+        for i in range(per_class):
+            Image.fromarray(shape_frame(rng, label, classes, size)).save(os.path.join(class_dir, f"{i:05d}.jpg"), quality=85)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--classes', type=int, default=8)
+    parser.add_argument('--per-class', type=int, default=200)
+    parser.add_argument('--size', type=int, default=240, help='synthetic frame size in pixels')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        signs_dir = os.path.join(directory, 'asl_signs')
+        model_path = os.path.join(directory, 'sign_classifier.npy')
+        write_dataset(signs_dir, args.classes, args.per_class, args.size)
+        paths, labels, _ = sign_classifier.list_dataset(signs_dir)
+        print(f"🤟 {len(paths)} frames ({args.size}x{args.size} JPEG), {args.classes} classes, "
+              f"{sign_classifier.FEATURE_DIM} features")
+
+        start = time.perf_counter()
+        frames = np.stack([sign_classifier.load_frame(path) for path in paths])
+        decode = time.perf_counter() - start
+        start = time.perf_counter()
+        features = sign_classifier.extract_features(frames)
+        extract = time.perf_counter() - start
+        print(f"   decode      {len(paths) / decode:9,.0f} frames/s")
+        print(f"   features    {len(paths) / extract:9,.0f} frames/s (batched NumPy)")
+
+        sidecar = sign_classifier.train(signs_dir, model_path)
+        metrics = sidecar['metrics']
+        print(f"   train       {metrics['fit_seconds']:.2f}s fit, holdout accuracy {metrics['holdout_accuracy']:.3f}, "
+              f"weights {sidecar['weights_bytes'] / 1024:.0f}KB (float16)")
+
+        start = time.perf_counter()
+        classifier = sign_classifier.SignClassifier(model_path)
+        print(f"   load        {(time.perf_counter() - start) * 1000:.2f}ms (memory-mapped)")
+        for batch in (1, 64):
+            count = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < 1.0:
+                for i in range(0, len(frames) - batch + 1, batch):
+                    classifier.classify_frames(frames[i:i + batch])
+                    count += batch
+            elapsed = time.perf_counter() - start
+            print(f"   infer b={batch:<3} {count / elapsed:9,.0f} frames/s (features + matmul)")
+        start = time.perf_counter()
+        for _ in range(100):
+            classifier.predict(features)
+        print(f"   matmul only {len(features) * 100 / (time.perf_counter() - start):9,.0f} frames/s")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
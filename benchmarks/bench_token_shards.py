@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+SmolVLM data pipeline benchmark: on-the-fly processing vs pre-tokenized shards
+Uses a stand-in processor with SmolVLM-like work per sample (decode, resize to
+224x224, normalize, tokenize) and a tiny NumPy model, and times CPU epochs
+where every batch is processed on the fly against epochs over token shards
+(plus the one-time shard build).
+
+    python3 benchmarks/bench_token_shards.py --samples 256 --epochs 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import token_shards
+
+IMAGE_SIZE = 224
+MAX_LENGTH = 32
+VOCAB = 1000
+MEAN = np.array([0.5, 0.5, 0.5], dtype=np.float32)[:, None, None]
+STD = np.array([0.5, 0.5, 0.5], dtype=np.float32)[:, None, None]
+
+
+class StandInProcessor:
+    """Resize + rescale + normalize to (3, 224, 224) float32 and a hashed word tokenizer"""
+
+    name_or_path = 'bench-stand-in'
+
+    def __call__(self, images, text, return_tensors='np'):
+        pixels = np.asarray(images.resize((IMAGE_SIZE, IMAGE_SIZE), Image.BICUBIC), dtype=np.float32) / 255.0
+        pixels = (pixels.transpose(2, 0, 1) - MEAN) / STD
+        ids = [1] + [hash(word) % (VOCAB - 2) + 2 for word in text.lower().split()]
+        return {'pixel_values': pixels[None], 'input_ids': np.array([ids])}
+
+
+class TinyModel:
+    """Pooled pixels + mean token embedding -> logits; just enough compute to consume a batch"""
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.vision = rng.normal(0, 0.01, (3 * 14 * 14, 64)).astype(np.float32)
+        self.embedding = rng.normal(0, 0.01, (VOCAB, 64)).astype(np.float32)
+        self.head = rng.normal(0, 0.01, (64, 16)).astype(np.float32)
+
+    def forward(self, pixel_values, input_ids, attention_mask):
+        pixels = np.asarray(pixel_values, dtype=np.float32)
+        pooled = pixels.reshape(len(pixels), 3, 14, 16, 14, 16).mean(axis=(3, 5)).reshape(len(pixels), -1)
+        tokens = (self.embedding[input_ids] * attention_mask[..., None]).sum(axis=1) / attention_mask.sum(1)[:, None]
+        return (pooled @ self.vision + tokens) @ self.head
+
+
+def on_the_fly_batch(processor, samples, indices):
+    """What the old ASLDataset.__getitem__ + collate did for every batch of every epoch"""
+    pixels, ids, masks = [], [], []
+    for i in indices:
+        path, text = samples[i]
+        pixel_values, input_ids = token_shards._process(processor, token_shards.open_image(path), text)
+        padded = np.zeros(MAX_LENGTH, dtype=np.int64)
+        padded[:min(len(input_ids), MAX_LENGTH)] = input_ids[:MAX_LENGTH]
+        pixels.append(pixel_values)
+        ids.append(padded)
+        masks.append(np.arange(MAX_LENGTH) < len(input_ids))
+    return {'pixel_values': np.stack(pixels), 'input_ids': np.stack(ids), 'attention_mask': np.stack(masks)}
+
+
+def run_epochs(get_batch, count, epochs, batch_size, model):
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(epochs):
+        order = rng.permutation(count)
+        for i in range(0, count, batch_size):
+            batch = get_batch(order[i:i + batch_size])
+            model.forward(batch['pixel_values'], batch['input_ids'], batch['attention_mask'])
+    return (time.perf_counter() - start) / epochs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=256)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    processor, model = StandInProcessor(), TinyModel()
+    with tempfile.TemporaryDirectory() as directory:
+        samples = []
+        for i in range(args.samples):
+            path = os.path.join(directory, f"{i:05d}.jpg")
+            Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)).save(path, quality=85)
+            samples.append((path, f"This is an ASL sign for: sign {i % 20}"))
+        print(f"🧩 {args.samples} samples (640x480 JPEG -> 3x{IMAGE_SIZE}x{IMAGE_SIZE}), "
+              f"batch {args.batch_size}, {args.epochs} epochs")
+
+        epoch = run_epochs(lambda indices: on_the_fly_batch(processor, samples, indices), args.samples,
+                           args.epochs, args.batch_size, model)
+        print(f"   on-the-fly processing  {epoch:6.2f}s/epoch ({args.samples / epoch:7,.0f} samples/s)")
+
+        shards_dir = os.path.join(directory, 'shards')
+        start = time.perf_counter()
+        index = token_shards.build_shards(samples, processor, shards_dir, max_length=MAX_LENGTH)
+        build = time.perf_counter() - start
+        size = sum(entry.stat().st_size for entry in os.scandir(shards_dir))
+        dataset = token_shards.ShardedTokenDataset(shards_dir)
+        shard_epoch = run_epochs(dataset.batch, len(dataset), args.epochs, args.batch_size, model)
+        print(f"   one-time shard build   {build:6.2f}s ({len(index['shards'])} shard, {size / 2**20:.0f}MB float16)")
+        print(f"   token shards           {shard_epoch:6.2f}s/epoch ({args.samples / shard_epoch:7,.0f} samples/s, "
+              f"{epoch / shard_epoch:.0f}x faster)")
+        breakeven = build / max(epoch - shard_epoch, 1e-9)
+        print(f"   build pays for itself after {breakeven:.1f} epochs")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
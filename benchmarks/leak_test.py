@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Memory leak test for the ASL server
+Drives a spawned asl_server (mock llama backend) with the load generator plus
+/ml/log_sign traffic in several windows, records RSS after each window and
+asserts that memory reaches a plateau. Prints the top tracemalloc growers
+between the end of warm-up and the end of the run. The logged samples go to
+the spawned server's temporary data directory, never the real training set.
+
+    python3 benchmarks/leak_test.py --windows 6 --window-seconds 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import load_generator
+
+ADMIN_TOKEN = 'leak-test'
+REAL_SAMPLES = os.path.join(load_generator.ROOT, 'training_data', 'logged_frames', 'samples.jsonl')
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def drive_log_sign(base_url, frames, stop_event, rate=20.0):
+    """Post training samples (full base64 frames) at `rate` per second"""
+    session = requests.Session()
+    index = 0
+    while not stop_event.is_set():
+        try:
+            session.post(f"{base_url}/ml/log_sign", json={
+                'sign': ['hello', 'help', 'stop', 'thank you'][index % 4],
+                'imageData': frames[index % len(frames)],
+                'sessionId': f"leak_{index % 16}",
+                'timestamp': time.time() * 1000
+            }, timeout=10)
+        except requests.RequestException:
+            pass
+        index += 1
+        stop_event.wait(1.0 / rate)
+
+
+def run_window(base_url, args, frames):
+    stop_event = threading.Event()
+    signer = threading.Thread(target=drive_log_sign, args=(base_url, frames, stop_event, args.log_sign_rate),
+                              daemon=True)
+    signer.start()
+    result = load_generator.run_load(base_url, args.sessions, args.window_seconds, args.interval, frames)
+    stop_event.set()
+    signer.join()
+    metrics = load_generator.scrape_process_metrics(base_url) or {}
+    return result, metrics.get('process_resident_memory_bytes', 0)
+
+
+def admin(method, url):
+    response = requests.request(method, url, headers={'X-Admin-Token': ADMIN_TOKEN}, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--interval', type=float, default=0.5, help='seconds between frames per session')
+    parser.add_argument('--log-sign-rate', type=float, default=20.0, help='/ml/log_sign posts per second')
+    parser.add_argument('--windows', type=int, default=6)
+    parser.add_argument('--window-seconds', type=float, default=20.0)
+    parser.add_argument('--warmup-windows', type=int, default=2)
+    parser.add_argument('--max-growth-mb', type=float, default=4.0,
+                        help='allowed RSS growth across the second half of the run')
+    parser.add_argument('--llama-latency-ms', type=float, default=20.0)
+    parser.add_argument('--llama-tps', type=float, default=0.0, help='0 = no generation delay')
+    parser.add_argument('--llama-tokens', type=int, default=24)
+    parser.add_argument('--server-log')
+    args = parser.parse_args()
+
+    os.environ['ADMIN_TOKEN'] = ADMIN_TOKEN
+    real_size = _size(REAL_SAMPLES)
+    base_url, processes, data_dir = load_generator.spawn_stack(args)
+    assert os.path.commonpath([data_dir, tempfile.gettempdir()]) == tempfile.gettempdir(), data_dir
+    frames = load_generator.make_frames()
+    rss_mb = []
+    try:
+        print(f"🔥 Warming up for {args.warmup_windows} x {args.window_seconds:.0f}s")
+        for _ in range(args.warmup_windows):
+            run_window(base_url, args, frames)
+        baseline_snapshot = admin('POST', f"{base_url}/admin/memory/snapshot?limit=5")['id']
+
+        for window in range(args.windows):
+            result, rss = run_window(base_url, args, frames)
+            rss_mb.append(rss / 2**20)
+            print(f"   Window {window + 1}/{args.windows}: RSS {rss_mb[-1]:.1f}MB, "
+                  f"{result['requests']} requests, error rate {result['error_rate'] * 100:.1f}%")
+
+        diff = admin('GET', f"{base_url}/admin/memory/diff?from={baseline_snapshot}&limit=10")
+        sizes = admin('GET', f"{base_url}/admin/memory/rss")['current']['tracked']
+        # The synthetic samples landed in the temporary store, not in the training data
+        assert _size(os.path.join(data_dir, 'logged_frames', 'samples.jsonl')) > 0, 'no samples in the temp store'
+        assert _size(REAL_SAMPLES) == real_size, f"leak test wrote to {REAL_SAMPLES}"
+    finally:
+        load_generator.stop_stack(processes, data_dir)
+
+    print("📈 Top allocation growers since warm-up:")
+    for grower in diff['top_growers']:
+        print(f"   {grower['size_diff_bytes'] / 1024:9.1f}KB  {grower['count_diff']:+7d} blocks  {grower['site']}")
+    print(f"   Tracked structures: {sizes}")
+
+    half = len(rss_mb) // 2
+    growth = max(rss_mb[half:]) - rss_mb[half - 1] if half else 0.0
+    print(f"📊 RSS: {' → '.join(f'{mb:.1f}' for mb in rss_mb)} MB (second-half growth {growth:+.1f}MB)")
+    if growth > args.max_growth_mb:
+        print(f"❌ Memory still growing: {growth:.1f}MB > {args.max_growth_mb}MB in the second half")
+        return False
+    print("✅ Memory reached a plateau")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Synthetic multi-session load generator for the ASL server
+Simulates N browser camera sessions posting JPEG frames to /v1/chat/completions
+at the real 2-second cadence and reports throughput, latency percentiles,
+error rates and server CPU / memory (scraped from /metrics).
+
+Quick capacity run against a bundled mock llama.cpp backend:
+    python3 benchmarks/load_generator.py --spawn --sessions 8 --duration 30
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import base64
+import socket
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROMPT = "What ASL sign is being shown? Describe the hand shape and movement."
+
+
+def make_frames(count=4, width=640, height=480, quality=70):
+    """Camera-like JPEG frames (as data URLs); falls back to opaque bytes without Pillow"""
+    frames = []
+    rng = random.Random(42)
+    try:
+        from PIL import Image, ImageDraw
+        for i in range(count):
+            image = Image.new('RGB', (width, height), (200 - i * 10, 180, 160))
+            draw = ImageDraw.Draw(image)
+            for _ in range(60):
+                x, y = rng.randrange(width), rng.randrange(height)
+                draw.ellipse((x, y, x + rng.randrange(10, 80), y + rng.randrange(10, 80)),
+                             fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=quality)
+            frames.append(buffer.getvalue())
+    except ImportError:
+        for _ in range(count):
+            frames.append(b'\xff\xd8\xff\xe0' + rng.randbytes(40 * 1024) + b'\xff\xd9')
+    return ['data:image/jpeg;base64,' + base64.b64encode(frame).decode() for frame in frames]
+
+
+def build_payload(frame_url):
+    return {
+        'model': 'SmolVLM',
+        'messages': [{'role': 'user', 'content': [
+            {'type': 'text', 'text': PROMPT},
+            {'type': 'image_url', 'image_url': {'url': frame_url}}
+        ]}],
+        'max_tokens': 100
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def scrape_process_metrics(base_url):
+    """process_cpu_seconds_total and process_resident_memory_bytes from /metrics"""
+    try:
+        text = requests.get(f"{base_url}/metrics", timeout=5).text
+    except requests.RequestException:
+        return None
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(('process_cpu_seconds_total ', 'process_resident_memory_bytes ')):
+            name, value = line.split()
+            values[name] = float(value)
+    return values or None
+
+
+class SessionStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = Counter()
+        self.late = 0
+
+    def record(self, latency, error=None):
+        with self.lock:
+            if error is None:
+                self.latencies.append(latency)
+            else:
+                self.errors[error] += 1
+
+
+def run_session(index, sessions, base_url, frames, interval, stop_at, stats):
+    """One camera session: a frame every `interval` seconds until stop_at"""
+    session = requests.Session()
+    # Stagger sessions across the interval like independent browsers
+    next_send = time.monotonic() + interval * index / sessions
+    frame_index = index
+    while True:
+        now = time.monotonic()
+        if next_send >= stop_at:
+            break
+        if next_send > now:
+            time.sleep(next_send - now)
+        payload = build_payload(frames[frame_index % len(frames)])
+        frame_index += 1
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/v1/chat/completions", json=payload, timeout=60)
+            latency = time.perf_counter() - start
+            stats.record(latency, None if response.status_code == 200 else f"http_{response.status_code}")
+        except requests.RequestException as e:
+            stats.record(time.perf_counter() - start, type(e).__name__)
+        next_send += interval
+        if time.monotonic() > next_send:
+            # Client would have fired again already - count it and keep the cadence
+            with stats.lock:
+                stats.late += 1
+            next_send = time.monotonic()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def spawn_stack(args):
+    """Start the mock llama server and asl_server as subprocesses -> (base_url, processes, data_dir).
+
+    The server's frame store, sample index and audit log go to the temporary data_dir, so load
+    never reaches the real training data; stop_stack removes it.
+    """
+    llama_port, asl_port = free_port(), free_port()
+    data_dir = tempfile.mkdtemp(prefix='asl-load-')
+    llama = subprocess.Popen([
+        sys.executable, os.path.join(BENCH_DIR, 'mock_llama_server.py'),
+        '--port', str(llama_port),
+        '--latency-ms', str(args.llama_latency_ms),
+        '--tokens-per-second', str(args.llama_tps),
+        '--completion-tokens', str(args.llama_tokens)
+    ], stdout=subprocess.DEVNULL)
+    env = dict(os.environ, ASL_SERVER_PORT=str(asl_port),
+               LLAMA_SERVER_URL=f"http://127.0.0.1:{llama_port}",
+               FRAME_STORE_DIR=os.path.join(data_dir, 'logged_frames'),
+               SAMPLE_INDEX_PATH=os.path.join(data_dir, 'samples.db'),
+               ASL_AUDIT_DIR=os.path.join(data_dir, 'asl_audit'))
+    server_log = open(args.server_log, 'w') if args.server_log else subprocess.DEVNULL
+    asl = subprocess.Popen([sys.executable, os.path.join(ROOT, 'asl_server.py')],
+                           cwd=ROOT, env=env, stdout=server_log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{asl_port}"
+    if not (wait_for(f"http://127.0.0.1:{llama_port}/health") and wait_for(f"{base_url}/metrics")):
+        stop_stack([asl, llama], data_dir)
+        raise RuntimeError("Spawned servers did not become healthy")
+    return base_url, [asl, llama], data_dir
+
+
+def stop_stack(processes, data_dir=None):
+    """Stop spawned processes and remove their temporary data directory"""
+    for proc in processes:
+        proc.terminate()
+    for proc in processes:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    if data_dir:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def run_load(base_url, sessions, duration, interval=2.0, frames=None):
+    """Drive the server and return a result dict"""
+    frames = frames or make_frames()
+    stats = SessionStats()
+    before = scrape_process_metrics(base_url)
+    peak_rss = before.get('process_resident_memory_bytes', 0) if before else 0
+
+    started = time.monotonic()
+    stop_at = started + duration
+    threads = [threading.Thread(target=run_session,
+                                args=(i, sessions, base_url, frames, interval, stop_at, stats),
+                                daemon=True) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(1.0)
+        sample = scrape_process_metrics(base_url)
+        if sample:
+            peak_rss = max(peak_rss, sample.get('process_resident_memory_bytes', 0))
+    elapsed = time.monotonic() - started
+    after = scrape_process_metrics(base_url)
+
+    latencies = sorted(stats.latencies)
+    total = len(latencies) + sum(stats.errors.values())
+    result = {
+        'sessions': sessions,
+        'interval_s': interval,
+        'duration_s': round(elapsed, 3),
+        'requests': total,
+        'succeeded': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        'error_rate': round(sum(stats.errors.values()) / total, 4) if total else 0.0,
+        'errors': dict(stats.errors),
+        'late_frames': stats.late,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            'mean': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0
+        },
+        'server': {}
+    }
+    if before and after:
+        cpu = after.get('process_cpu_seconds_total', 0) - before.get('process_cpu_seconds_total', 0)
+        result['server'] = {
+            'cpu_percent': round(cpu / elapsed * 100, 2) if elapsed else 0.0,
+            'rss_start_mb': round(before.get('process_resident_memory_bytes', 0) / 2**20, 2),
+            'rss_end_mb': round(after.get('process_resident_memory_bytes', 0) / 2**20, 2),
+            'rss_peak_mb': round(peak_rss / 2**20, 2)
+        }
+    return result
+
+
+def print_report(result):
+    latency = result['latency_ms']
+    print("📊 ASL Server Load Test")
+    print(f"   Sessions: {result['sessions']} @ {result['interval_s']}s cadence for {result['duration_s']}s")
+    print(f"   Requests: {result['requests']} ({result['succeeded']} ok, "
+          f"error rate {result['error_rate'] * 100:.2f}%, {result['late_frames']} late frames)")
+    print(f"   Throughput: {result['throughput_rps']:.2f} req/s")
+    print(f"   Latency: p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+          f"p99 {latency['p99']:.1f}ms  max {latency['max']:.1f}ms")
+    if result['errors']:
+        print(f"   Errors: {result['errors']}")
+    server = result['server']
+    if server:
+        print(f"   Server CPU: {server['cpu_percent']:.1f}%  RSS: {server['rss_start_mb']:.1f}MB → "
+              f"{server['rss_end_mb']:.1f}MB (peak {server['rss_peak_mb']:.1f}MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', default='http://localhost:5001', help='ASL server base URL')
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds')
+    parser.add_argument('--interval', type=float, default=2.0, help='seconds between frames per session')
+    parser.add_argument('--spawn', action='store_true', help='start mock llama + asl_server locally')
+    parser.add_argument('--llama-latency-ms', type=float, default=150.0)
+    parser.add_argument('--llama-tps', type=float, default=40.0, help='mock tokens per second')
+    parser.add_argument('--llama-tokens', type=int, default=24, help='mock completion length')
+    parser.add_argument('--server-log', help='write spawned asl_server output here')
+    parser.add_argument('--json', help='write the result as JSON to this file')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    args = parser.parse_args()
+
+    processes, data_dir = [], None
+    base_url = args.target.rstrip('/')
+    try:
+        if args.spawn:
+            base_url, processes, data_dir = spawn_stack(args)
+            print(f"🚀 Spawned asl_server at {base_url} with mock llama backend (data in {data_dir})")
+        result = run_load(base_url, args.sessions, args.duration, args.interval)
+    finally:
+        stop_stack(processes, data_dir)
+
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"📝 Results written to {args.json}")
+
+    if result['error_rate'] > args.max_error_rate:
+        print(f"❌ Error rate above {args.max_error_rate * 100:.1f}%")
+        return False
+    print("✅ Load test passed")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
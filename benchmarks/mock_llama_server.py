@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Mock llama.cpp server for load testing
+Speaks the OpenAI-compatible /v1/chat/completions API with configurable
+prompt latency and generation speed, so capacity runs don't need a GPU.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.server
+from socketserver import ThreadingMixIn
+
+# Typical SmolVLM descriptions of a camera frame
+SAMPLE_RESPONSES = [
+    "The person is waving their open hand, this looks like hello",
+    "I see a flat hand raised with the palm facing forward, a stop gesture",
+    "The signer places a fist on the open palm and lifts, which means help",
+    "Fingers touch the chin and move forward, this looks like thank you",
+    "I observe a grasping motion, possibly robot pick up",
+    "The hand moves down as if placing an object, robot deliver",
+    "The person is sitting at a desk, no clear sign language visible",
+    "A hand is held near the ear like a phone, call ava",
+]
+
+
+class MockLlamaState:
+    latency_ms = 150.0
+    jitter_ms = 20.0
+    tokens_per_second = 40.0
+    completion_tokens = 24
+    in_flight = 0
+    served = 0
+    lock = threading.Lock()
+
+
+class MockLlamaHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/health'):
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'Unknown endpoint'})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if not self.path.startswith('/v1/chat/completions'):
+            self._send_json(404, {'error': 'Unknown endpoint'})
+            return
+
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': 'Invalid JSON'})
+            return
+
+        state = MockLlamaState
+        with state.lock:
+            state.in_flight += 1
+        try:
+            tokens = min(int(request.get('max_tokens') or state.completion_tokens), state.completion_tokens)
+            prompt_ms = max(0.0, random.gauss(state.latency_ms, state.jitter_ms))
+            generation_ms = tokens / state.tokens_per_second * 1000 if state.tokens_per_second > 0 else 0.0
+            time.sleep((prompt_ms + generation_ms) / 1000)
+
+            self._send_json(200, {
+                'id': f"chatcmpl-mock-{random.getrandbits(32):08x}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'SmolVLM'),
+                'choices': [{
+                    'index': 0,
+                    'finish_reason': 'stop',
+                    'message': {'role': 'assistant', 'content': random.choice(SAMPLE_RESPONSES)}
+                }],
+                'usage': {
+                    'prompt_tokens': len(body) // 4,
+                    'completion_tokens': tokens,
+                    'total_tokens': len(body) // 4 + tokens
+                },
+                'timings': {'prompt_ms': round(prompt_ms, 3), 'predicted_ms': round(generation_ms, 3)}
+            })
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+                state.served += 1
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadedHTTPServer(ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+def create_server(port=8080, latency_ms=150.0, tokens_per_second=40.0, completion_tokens=24,
+                  jitter_ms=20.0, host='127.0.0.1'):
+    """Create (but don't start) a mock llama server; port 0 picks a free port"""
+    MockLlamaState.latency_ms = latency_ms
+    MockLlamaState.jitter_ms = jitter_ms
+    MockLlamaState.tokens_per_second = tokens_per_second
+    MockLlamaState.completion_tokens = completion_tokens
+    return ThreadedHTTPServer((host, port), MockLlamaHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--latency-ms', type=float, default=150.0, help='prompt processing time per request')
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--tokens-per-second', type=float, default=40.0)
+    parser.add_argument('--completion-tokens', type=int, default=24)
+    args = parser.parse_args()
+
+    server = create_server(args.port, args.latency_ms, args.tokens_per_second,
+                           args.completion_tokens, args.jitter_ms, args.host)
+    print(f"🦙 Mock llama.cpp server on http://{args.host}:{server.server_address[1]}")
+    print(f"   Latency: {args.latency_ms}ms ± {args.jitter_ms}ms, "
+          f"{args.tokens_per_second} tok/s, {args.completion_tokens} tokens", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Mock llama server stopped")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
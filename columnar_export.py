@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Columnar export of collected training samples
+Sample metadata is packed into NumPy .npz parts: string columns as an int32
+code array plus a sorted table of unique UTF-8 strings, numeric columns as
+float64. The export directory has a manifest.json listing the parts and how
+far each source has been exported, so re-running only appends a new part with
+the new samples. Loading reads each part once and merges the string tables.
+
+    python3 columnar_export.py                   # export logged /ml/log_sign samples
+    python3 columnar_export.py --compact         # merge all parts into one
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+EXPORT_DIR = os.path.join('training_data', 'columnar')
+FRAME_STORE_DIR = os.getenv('FRAME_STORE_DIR', os.path.join('training_data', 'logged_frames'))
+
+STRING_COLUMNS = ('text', 'session_id', 'frame', 'ext', 'root', 'image_file', 'confidence', 'description',
+                  'gesture_type', 'source')
+NUMERIC_COLUMNS = ('timestamp', 'logged_at')
+MANIFEST = 'manifest.json'
+
+
+def _as_float(value):
+    if value is None or value == '':
+        return np.nan
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return np.nan
+    return float(value)
+
+
+def encode_strings(values):
+    """list of str/None -> (sorted unique UTF-8 table, int32 codes); None becomes ''"""
+    # 'S' (bytes) rather than 'U' arrays: NumPy stores 'U' at 4 bytes per character
+    table, codes = np.unique(np.array([b'' if v is None else str(v).encode('utf-8') for v in values], dtype='S'),
+                             return_inverse=True)
+    return table, codes.astype(np.int32)
+
+
+def image_path(record):
+    """Path of a row's image: root/image_file, or the frame store object for its hash"""
+    root = record.get('root', '')
+    if record.get('image_file'):
+        return os.path.join(root, record['image_file'])
+    if record.get('frame'):
+        frame = record['frame']
+        return os.path.join(root, 'objects', frame[:2], f"{frame[2:]}.{record.get('ext', 'jpg')}")
+    return None
+
+
+def _atomic_write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def source_key(path):
+    """Manifest key for a source: relative to the repository root (absolute outside it), so moving
+    the checkout or running from another directory keeps the export state"""
+    path = os.path.abspath(path)
+    relative = os.path.relpath(path, ROOT)
+    return path if relative == os.pardir or relative.startswith(os.pardir + os.sep) else relative
+
+
+def source_state(manifest, path, suffix=''):
+    """Export state of a source; falls back to the absolute or as-given keys older manifests used"""
+    sources = manifest['sources']
+    for key in (source_key(path), os.path.abspath(path), path.rstrip('/')):
+        if key + suffix in sources:
+            return sources[key + suffix]
+    return {}
+
+
+def read_manifest(export_dir):
+    try:
+        with open(os.path.join(export_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'version': 1, 'rows': 0, 'next_part': 1, 'parts': [], 'sources': {}}
+
+
+def _save_part(export_dir, manifest, records):
+    """Write records as the manifest's next .npz part and list it in manifest (not yet saved)"""
+    arrays = {}
+    for name in STRING_COLUMNS:
+        arrays[f"{name}__table"], arrays[f"{name}__codes"] = encode_strings([r.get(name) for r in records])
+    for name in NUMERIC_COLUMNS:
+        arrays[name] = np.array([_as_float(r.get(name)) for r in records], dtype=np.float64)
+
+    number = manifest['next_part']
+    manifest['next_part'] += 1
+    filename = f"part-{number:06d}.npz"
+    tmp_path = os.path.join(export_dir, f"{filename}.tmp.npz")
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, os.path.join(export_dir, filename))
+    manifest['parts'].append({'file': filename, 'rows': len(records),
+                              'created': datetime.now().isoformat()})
+    manifest['rows'] += len(records)
+
+
+def write_part(export_dir, records, source_state=None):
+    """Append records as a new .npz part; source_state ({source: state}) is saved with the manifest"""
+    os.makedirs(export_dir, exist_ok=True)
+    manifest = read_manifest(export_dir)
+    if records:
+        _save_part(export_dir, manifest, records)
+    if source_state:
+        manifest['sources'].update(source_state)
+    # The manifest is replaced last, so a crash leaves at most an unreferenced part
+    _atomic_write_json(os.path.join(export_dir, MANIFEST), manifest)
+    return manifest
+
+
+def logged_sample_record(sample, store_dir=FRAME_STORE_DIR):
+    """samples.jsonl record (frame_store) -> export row; the image path follows from root + frame hash"""
+    return {
+        'text': sample.get('sign'),
+        'session_id': sample.get('session_id'),
+        'frame': sample.get('frame'),
+        'ext': sample.get('ext', 'jpg'),
+        'root': store_dir,
+        'timestamp': sample.get('timestamp'),
+        'logged_at': sample.get('logged_at'),
+        'source': 'log_sign',
+    }
+
+
+def export_frame_store(store_dir=FRAME_STORE_DIR, export_dir=EXPORT_DIR, max_rows=None):
+    """Export samples appended to store_dir/samples.jsonl since the last export; returns rows added"""
+    samples_path = os.path.join(store_dir, 'samples.jsonl')
+    if not os.path.exists(samples_path):
+        return 0
+    key = source_key(samples_path)
+    state = source_state(read_manifest(export_dir), samples_path)
+    offset = state.get('offset', 0)
+    if offset > os.path.getsize(samples_path):
+        raise ValueError(f"{samples_path} is shorter than the exported offset - it was replaced or truncated")
+
+    records = []
+    skipped = 0
+    with open(samples_path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            try:
+                sample = json.loads(line)
+            except ValueError:
+                sample = None
+            if not isinstance(sample, dict):
+                skipped += 1  # a corrupt line is counted in the manifest, not exported
+                continue
+            records.append(logged_sample_record(sample, store_dir))
+            if max_rows is not None and len(records) >= max_rows:
+                break
+    write_part(export_dir, records, {key: {'offset': offset, 'exported_at': time.time(),
+                                           'skipped_lines': state.get('skipped_lines', 0) + skipped}})
+    return len(records)
+
+
+class SampleColumns:
+    """All exported rows as NumPy columns (string columns stay dictionary-encoded)"""
+
+    def __init__(self, codes, tables, numeric):
+        self.codes = codes
+        self.tables = tables
+        self.numeric = numeric
+
+    def __len__(self):
+        return len(next(iter(self.numeric.values()))) if self.numeric else 0
+
+    def column(self, name):
+        if name in self.numeric:
+            return self.numeric[name]
+        return np.char.decode(self.tables[name], 'utf-8')[self.codes[name]]
+
+    def equals(self, name, value):
+        """Boolean mask of rows where a string column == value (compares int codes, not strings)"""
+        table = self.tables[name]
+        value = value.encode('utf-8')
+        position = np.searchsorted(table, value)
+        if position >= len(table) or table[position] != value:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[name] == position
+
+    def records(self, mask=None):
+        """Rows as dicts (empty strings and NaN are dropped), optionally only where mask is True"""
+        rows = np.flatnonzero(mask) if mask is not None else range(len(self))
+        string_values = {name: [value.decode('utf-8') for value in self.tables[name].tolist()]
+                         for name in STRING_COLUMNS}
+        string_codes = {name: self.codes[name].tolist() for name in STRING_COLUMNS}
+        numeric_values = {name: self.numeric[name].tolist() for name in NUMERIC_COLUMNS}
+        for row in rows:
+            record = {}
+            for name in STRING_COLUMNS:
+                value = string_values[name][string_codes[name][row]]
+                if value:
+                    record[name] = value
+            for name in NUMERIC_COLUMNS:
+                value = numeric_values[name][row]
+                if value == value:  # not NaN
+                    record[name] = value
+            yield record
+
+
+def load_columns(export_dir=EXPORT_DIR):
+    """Read every part once and merge them into a SampleColumns; None if nothing was exported"""
+    manifest = read_manifest(export_dir)
+    if not manifest['parts']:
+        return None
+    parts = []
+    for part in manifest['parts']:
+        with np.load(os.path.join(export_dir, part['file'])) as data:
+            parts.append({name: data[name] for name in data.files})
+
+    codes, tables, numeric = {}, {}, {}
+    for name in STRING_COLUMNS:
+        part_tables = [part[f"{name}__table"] for part in parts]
+        if len(parts) == 1:
+            tables[name], codes[name] = part_tables[0], parts[0][f"{name}__codes"]
+            continue
+        merged = np.unique(np.concatenate(part_tables))
+        tables[name] = merged
+        # Remap each part's codes into the merged table without touching the strings per row
+        codes[name] = np.concatenate([np.searchsorted(merged, table).astype(np.int32)[part[f"{name}__codes"]]
+                                      for table, part in zip(part_tables, parts)])
+    for name in NUMERIC_COLUMNS:
+        numeric[name] = np.concatenate([part[name] for part in parts])
+    return SampleColumns(codes, tables, numeric)
+
+
+def compact(export_dir=EXPORT_DIR):
+    """Merge all parts into a single part (keeps source offsets)"""
+    columns = load_columns(export_dir)
+    manifest = read_manifest(export_dir)
+    if columns is None or len(manifest['parts']) == 1:
+        return manifest
+    old_parts = manifest['parts']
+    manifest.update(parts=[], rows=0)
+    # Merged part first, then one manifest swap to it, then the old parts: a crash at any
+    # point leaves a manifest whose parts all exist (plus, at worst, unreferenced files)
+    _save_part(export_dir, manifest, list(columns.records()))
+    _atomic_write_json(os.path.join(export_dir, MANIFEST), manifest)
+    for part in old_parts:
+        os.remove(os.path.join(export_dir, part['file']))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store-dir', default=FRAME_STORE_DIR)
+    parser.add_argument('--export-dir', default=EXPORT_DIR)
+    parser.add_argument('--compact', action='store_true', help='merge existing parts into one')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    added = export_frame_store(args.store_dir, args.export_dir)
+    print(f"📦 Exported {added} new samples to {args.export_dir} in {time.perf_counter() - start:.2f}s")
+    if args.compact:
+        manifest = compact(args.export_dir)
+        print(f"🗜️  Compacted into {len(manifest['parts'])} part ({manifest['rows']} rows)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate frame elimination with 64-bit perceptual hashes and multi-probe LSH
+Collected sessions sample a frame every 2 seconds, so they hold long runs of
+nearly identical frames. Each frame gets a DCT perceptual hash (computed for
+whole batches with two matrix products). The hashes are split into bands, and
+frames are compared only with the earlier frames in the same band bucket or in
+a bucket one bit away (multi-probe). With 4 bands of 16 bits and one-bit
+probes, every pair within 7 differing bits shares a probed bucket, so every
+near-duplicate pair is found. The work is close to linear in the number of
+frames while buckets stay small, and grows with the square of a bucket's size
+when many frames share a band key. A frame is dropped (merged into the earlier
+frame it duplicates) when it is within the Hamming threshold of a kept frame
+of the same class.
+
+    python3 frame_dedup.py                       # report duplicates in training_data/asl_signs
+    python3 frame_dedup.py --remove              # move them to training_data/duplicates/<class>/
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+
+import numpy as np
+
+import sign_classifier
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 32       # frames are reduced to 32x32 before the DCT
+THRESHOLD = 6        # max differing bits (of 64) for a near-duplicate
+BANDS = 4            # 16-bit band keys
+CHUNK_ROWS = 1 << 18
+PAIR_BUDGET = 1 << 22  # candidate pairs expanded at once
+DUPLICATES_DIR = os.path.join('training_data', 'duplicates')
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis, rows = frequencies"""
+    k = np.arange(n)[:, None]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+_DCT_LOW = _dct_matrix(HASH_SIZE)[:8]
+
+if hasattr(np, 'bitwise_count'):
+    popcount = np.bitwise_count
+else:
+    _BITS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(values):
+        values = np.ascontiguousarray(values, dtype=np.uint64)
+        return _BITS[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+def phash(frames):
+    """(N, H, W) grayscale uint8 frames -> (N,) uint64 perceptual hashes, all at once"""
+    frames = np.asarray(frames)
+    n, height, width = frames.shape
+    fy, fx = height // HASH_SIZE, width // HASH_SIZE
+    if fy < 1 or fx < 1:
+        raise ValueError(f"Frames must be at least {HASH_SIZE}x{HASH_SIZE}")
+    images = frames[:, :fy * HASH_SIZE, :fx * HASH_SIZE].astype(np.float32)
+    images = images.reshape(n, HASH_SIZE, fy, HASH_SIZE, fx).mean(axis=(2, 4))
+    # Lowest 8x8 frequencies, thresholded at their median (DC excluded from the median)
+    low = (_DCT_LOW @ images @ _DCT_LOW.T).reshape(n, 64)
+    bits = low > np.median(low[:, 1:], axis=1, keepdims=True)
+    return np.packbits(bits, axis=1, bitorder='little').view('<u8').ravel()
+
+
+def hash_shards(shards, batch_size=1024):
+    """Hashes of every frame of an image_shards.ImageShards (grayscale)"""
+    if len(shards.index['frame_shape']) != 2:
+        raise ValueError('Perceptual hashes need grayscale shards')
+    return np.concatenate([phash(frames) for frames, _ in shards.iter_batches(batch_size)])
+
+
+def hash_paths(paths, batch_size=256):
+    """Decode image files in batches and hash them"""
+    hashes = np.empty(len(paths), dtype=np.uint64)
+    for start in range(0, len(paths), batch_size):
+        batch = paths[start:start + batch_size]
+        hashes[start:start + len(batch)] = phash(np.stack([sign_classifier.load_frame(path) for path in batch]))
+    return hashes
+
+
+def _range_pairs(starts, counts, rows, budget=PAIR_BUDGET):
+    """Yield (positions, rows) expanding row i to positions starts[i]..starts[i]+counts[i]-1, ~budget at a time"""
+    ends = np.cumsum(counts)
+    lo = 0
+    while lo < len(rows):
+        # Sub-chunks of about `budget` candidates (a single larger bucket range still goes in one piece)
+        hi = max(int(np.searchsorted(ends, (ends[lo - 1] if lo else 0) + budget, side='right')), lo + 1)
+        part = counts[lo:hi]
+        total = int(part.sum())
+        if total:
+            offsets = np.arange(total) - np.repeat(np.cumsum(part) - part, part)
+            yield np.repeat(starts[lo:hi], part) + offsets, np.repeat(rows[lo:hi], part)
+        lo = hi
+
+
+def near_pairs(hashes, labels, threshold=THRESHOLD, bands=BANDS, probe=True):
+    """(earlier, later) index pairs of the same label within threshold bits -> (pairs, candidates checked).
+
+    Candidates share a band bucket, or a bucket one bit away with probe=True, and every
+    earlier member of each probed bucket is checked. Work grows with the squared bucket
+    sizes, so it stays near linear only while the 16-bit band keys spread the frames out.
+    """
+    n = len(hashes)
+    bits = 64 // bands
+    rows = np.arange(n, dtype=np.int64)
+    probes = [0] + ([1 << bit for bit in range(bits)] if probe else [])
+    found, checked = [], 0
+    for band in range(bands):
+        keys = ((hashes >> np.uint64(band * bits)) & np.uint64((1 << bits) - 1)).astype(np.int64)
+        # Bucket-major, frame order within a bucket: one sorted int64 array serves every probe
+        ordered = np.sort((keys << 32) | rows)
+        for start in range(0, n, CHUNK_ROWS):
+            chunk_rows, chunk_keys = rows[start:start + CHUNK_ROWS], keys[start:start + CHUNK_ROWS]
+            for mask in probes:
+                target = chunk_keys ^ mask
+                # The probed bucket's members before this frame are ordered[first:positions]
+                first = np.searchsorted(ordered, target << 32)
+                positions = np.searchsorted(ordered, (target << 32) | chunk_rows)
+                for where, later in _range_pairs(first, positions - first, chunk_rows):
+                    earlier = ordered[where] & 0xFFFFFFFF
+                    checked += len(later)
+                    # Verified right away, so memory follows the near pairs rather than the bucket sizes
+                    close = (popcount(hashes[earlier] ^ hashes[later]) <= threshold) & (labels[earlier] == labels[later])
+                    if close.any():
+                        found.append(earlier[close] * n + later[close])
+    if not found:
+        return np.empty((0, 2), dtype=np.int64), checked
+    pairs = np.unique(np.concatenate(found))
+    return np.stack([pairs // n, pairs % n], axis=1), checked
+
+
+def dedup(hashes, labels=None, threshold=THRESHOLD, bands=BANDS):
+    """Greedy near-duplicate removal in frame order -> (keep mask, duplicate_of, stats).
+
+    duplicate_of[i] is the kept frame that frame i merges into (-1 if kept). Frames only
+    match frames with the same label, and only kept frames absorb others, so a slowly
+    drifting run keeps a new frame each time it moves more than threshold bits away.
+    """
+    start = time.perf_counter()
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    labels = np.zeros(len(hashes), dtype=np.int64) if labels is None else np.asarray(labels, dtype=np.int64)
+    if threshold >= bands * 2:
+        raise ValueError(f"threshold {threshold} needs more than {bands} bands for one-bit probes to find all pairs")
+    n = len(hashes)
+    keep = np.ones(n, dtype=bool)
+    duplicate_of = np.full(n, -1, dtype=np.int64)
+    stats = {'frames': n, 'exact': 0, 'candidates': 0, 'near': 0}
+    if n == 0:
+        stats.update(removed=0, seconds=0.0)
+        return keep, duplicate_of, stats
+
+    # Exact (label, hash) duplicates collapse onto their first frame before any LSH work
+    pairs = np.stack([labels, hashes.view(np.int64)], axis=1)
+    _, first, inverse = np.unique(pairs, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(first, kind='stable')          # unique rows in frame order
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    unique_rows = first[order]
+    stats['exact'] = n - len(unique_rows)
+
+    unique_labels = labels[unique_rows]
+    near, stats['candidates'] = near_pairs(hashes[unique_rows], unique_labels, threshold, bands,
+                                           threshold >= bands)
+    earlier, later = near[:, 0], near[:, 1]
+    stats['near'] = len(later)
+
+    # In frame order, each frame merges into the nearest kept frame ("root") reachable through its
+    # near neighbours, if that root is itself within threshold; otherwise it is kept as a new root
+    by_later = np.lexsort((earlier, later))
+    earlier, later = earlier[by_later].tolist(), later[by_later]
+    groups, starts = np.unique(later, return_index=True)
+    ends = np.append(starts[1:], len(later))
+    unique_hashes = hashes[unique_rows].tolist()
+    root = list(range(len(unique_rows)))
+    for row, lo, hi in zip(groups.tolist(), starts.tolist(), ends.tolist()):
+        value, best, best_distance = unique_hashes[row], row, threshold + 1
+        for neighbour in earlier[lo:hi]:
+            candidate = root[neighbour]
+            distance = (value ^ unique_hashes[candidate]).bit_count()
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        root[row] = best
+    unique_target = np.array(root, dtype=np.int64)
+
+    # Back to frames: the first frame of each unique hash follows its LSH decision, the rest merge into it
+    target = unique_rows[unique_target[rank[inverse]]]
+    duplicate_of = np.where(target == np.arange(n), -1, target)
+    keep = duplicate_of < 0
+    stats.update(removed=int(n - keep.sum()), seconds=round(time.perf_counter() - start, 3))
+    return keep, duplicate_of, stats
+
+
+def class_report(labels, keep, classes):
+    """{class: {'frames': n, 'removed': n}} for every class"""
+    labels = np.asarray(labels)
+    frames = np.bincount(labels, minlength=len(classes))
+    removed = np.bincount(labels[~keep], minlength=len(classes))
+    return {name: {'frames': int(frames[i]), 'removed': int(removed[i])} for i, name in enumerate(classes)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signs-dir', default=sign_classifier.ASL_SIGNS_DIR)
+    parser.add_argument('--threshold', type=int, default=THRESHOLD)
+    parser.add_argument('--remove', action='store_true', help=f"move duplicates to {DUPLICATES_DIR}/<class>/")
+    parser.add_argument('--report', help='write the per-class report as JSON')
+    args = parser.parse_args()
+
+    paths, labels, classes = sign_classifier.list_dataset(args.signs_dir)
+    if not paths:
+        print(f"❌ No frames in {args.signs_dir}/<class>/")
+        return False
+    start = time.perf_counter()
+    hashes = hash_paths(paths)
+    hash_seconds = time.perf_counter() - start
+    keep, duplicate_of, stats = dedup(hashes, labels, args.threshold)
+    report = class_report(labels, keep, classes)
+    print(f"🔍 {stats['removed']} of {len(paths)} frames are near-duplicates "
+          f"(hashing {hash_seconds:.2f}s, matching {stats['seconds']:.2f}s)")
+    for name, counts in report.items():
+        if counts['removed']:
+            print(f"   {name:<20} {counts['removed']:>6} of {counts['frames']}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'threshold': args.threshold, 'stats': stats, 'classes': report,
+                       'duplicates': {paths[i]: paths[j] for i, j in enumerate(duplicate_of.tolist()) if j >= 0}},
+                      f, indent=2)
+    if args.remove:
+        for i in np.flatnonzero(~keep):
+            destination = os.path.join(DUPLICATES_DIR, os.path.relpath(paths[i], args.signs_dir))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.move(paths[i], destination)
+        print(f"🗑️  Moved {stats['removed']} duplicates to {DUPLICATES_DIR}/")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for training frames logged through /ml/log_sign
+Frames are stored once per SHA-256 under objects/ab/cdef....jpg (identical
+frames dedupe for free); each logged sample is one compact JSON line in
+samples.jsonl that points at its frame. Nothing is kept in memory per sample.
+
+    FRAME_STORE_DIR=training_data/logged_frames
+"""
+
+import os
+import re
+import json
+import base64
+import ctypes
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+FRAME_STORE_DIR = os.getenv('FRAME_STORE_DIR', os.path.join('training_data', 'logged_frames'))
+MAX_FRAME_BYTES = int(os.getenv('MAX_FRAME_BYTES', str(8 * 2**20)))
+
+_DATA_URL = re.compile(r'^data:image/(jpeg|jpg|png|webp);base64,')
+_MAGIC = {
+    'jpg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'webp': (b'RIFF',),
+}
+
+
+def _load_syncfs():
+    """libc syncfs() (Linux): flushes one filesystem's dirty files and directories in a single call"""
+    try:
+        return ctypes.CDLL(None, use_errno=True).syncfs
+    except (OSError, AttributeError, TypeError):
+        return None
+
+
+_syncfs = _load_syncfs()
+
+
+def decode_data_url(image_data):
+    """'data:image/jpeg;base64,...' -> (bytes, extension); raises ValueError on anything else"""
+    if not isinstance(image_data, str):
+        raise ValueError('imageData must be a data URL string')
+    match = _DATA_URL.match(image_data)
+    if not match:
+        raise ValueError('imageData must be a base64 image data URL')
+    extension = 'jpg' if match.group(1) in ('jpeg', 'jpg') else match.group(1)
+    encoded = image_data[match.end():]
+    if len(encoded) * 3 // 4 > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame larger than {MAX_FRAME_BYTES} bytes")
+    try:
+        # Non-validating decode is C-only; the magic-bytes check below rejects garbage
+        frame = base64.b64decode(encoded)
+    except (ValueError, base64.binascii.Error) as e:
+        raise ValueError(f"Invalid base64 image data: {e}")
+    if not frame.startswith(_MAGIC[extension]):
+        raise ValueError(f"imageData is not a valid {extension} image")
+    return frame, extension
+
+
+class FrameStore:
+    """SHA-256 keyed frame objects plus an append-only sample metadata log"""
+
+    def __init__(self, root=FRAME_STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.samples_path = os.path.join(root, 'samples.jsonl')
+        # Create the 256 fan-out directories once instead of on every put
+        for prefix in range(256):
+            os.makedirs(os.path.join(self.objects_dir, f"{prefix:02x}"), exist_ok=True)
+        self._lock = threading.Lock()
+        self.truncated_bytes = self._recover_tail()
+        self.corrupt_lines = 0
+        self._samples = open(self.samples_path, 'ab')
+
+    def _recover_tail(self, block_size=65536):
+        """Cut a torn last record (crash mid-append) back to the last newline; returns the bytes dropped.
+
+        Otherwise the next append would be glued onto the partial line.
+        """
+        try:
+            size = os.path.getsize(self.samples_path)
+        except FileNotFoundError:
+            return 0
+        keep, end = 0, size
+        with open(self.samples_path, 'rb+') as f:
+            while end > 0:
+                start = max(0, end - block_size)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                end = start
+            if keep == size:
+                return 0
+            f.truncate(keep)
+            f.flush()
+            os.fsync(f.fileno())
+        logger.warning("⚠️ Truncating torn sample record in %s (%d bytes)", self.samples_path, size - keep)
+        return size - keep
+
+    def object_path(self, digest, extension='jpg'):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest[2:]}.{extension}")
+
+    def put_frame(self, frame, extension='jpg', fsync=False):
+        """Store frame bytes once; returns (sha256 hex, stored_now)
+
+        fsync=True makes the bytes durable before the rename. Batch writers leave it off and call
+        sync_objects once for the whole batch instead.
+        """
+        digest = hashlib.sha256(frame).hexdigest()
+        path = self.object_path(digest, extension)
+        if os.path.exists(path):
+            return digest, False
+        # Write to a temp file and rename so readers never see a partial frame
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(frame)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest, True
+
+    def sync_objects(self, objects):
+        """Make newly stored (digest, extension) objects and their directory entries durable
+
+        One syncfs() of the store's filesystem where available; otherwise every file and then every
+        fan-out directory is fsynced once.
+        """
+        if not objects:
+            return
+        if _syncfs is not None:
+            fd = os.open(self.objects_dir, os.O_RDONLY)
+            try:
+                if _syncfs(fd) != 0:
+                    error = ctypes.get_errno()
+                    raise OSError(error, os.strerror(error))
+            finally:
+                os.close(fd)
+            return
+        paths = [self.object_path(digest, extension) for digest, extension in objects]
+        for path in paths + sorted({os.path.dirname(path) for path in paths}):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def get_frame(self, digest, extension='jpg'):
+        with open(self.object_path(digest, extension), 'rb') as f:
+            return f.read()
+
+    @staticmethod
+    def encode_sample(sample):
+        return (json.dumps(sample, ensure_ascii=False, separators=(',', ':')) + '\n').encode()
+
+    def append_samples(self, samples, fsync=False):
+        """Append metadata records to samples.jsonl with one write"""
+        if not samples:
+            return
+        data = b''.join(self.encode_sample(sample) for sample in samples)
+        with self._lock:
+            self._samples.write(data)
+            self._samples.flush()
+            if fsync:
+                os.fsync(self._samples.fileno())
+
+    def samples_size(self):
+        """Bytes written to samples.jsonl so far (the offset just past the last record)"""
+        with self._lock:
+            return os.fstat(self._samples.fileno()).st_size
+
+    def log_sample(self, sign, session_id, timestamp, logged_at, frame, extension='jpg'):
+        """Store the frame and append its metadata; returns the metadata record"""
+        digest, stored = self.put_frame(frame, extension)
+        sample = {
+            'sign': sign,
+            'session_id': session_id,
+            'timestamp': timestamp,
+            'logged_at': logged_at,
+            'frame': digest,
+            'ext': extension,
+            'bytes': len(frame),
+        }
+        self.append_samples([sample])
+        return sample, stored
+
+    def iter_samples(self):
+        """Stream metadata records from disk; undecodable lines are skipped and counted in corrupt_lines"""
+        with open(self.samples_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    self.corrupt_lines += 1
+
+    def count_samples(self):
+        """Count records by counting newlines in 1MB chunks"""
+        count = 0
+        with open(self.samples_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(2**20), b''):
+                count += chunk.count(b'\n')
+        return count
+
+    def close(self):
+        with self._lock:
+            self._samples.close()
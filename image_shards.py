@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Packed, fixed-resolution image shards for ASL training frames
+Frames from training_data/asl_signs/<class>/ are decoded and resized once
+into large uint8 .npy shards (N x size x size [x 3]), alongside labels.npy
+(class index per frame) and offsets.npy (first frame of each shard). Training
+then memory-maps the shards and reads batches straight from the page cache
+instead of opening and decoding one JPEG per frame per epoch.
+
+    python3 image_shards.py pack                 # -> training_data/image_shards/
+    shards = ImageShards('training_data/image_shards')
+    for frames, labels in shards.iter_batches(64, shuffle=True):
+        ...
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import sign_classifier
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError as e:
+    Image = None
+    logger.warning(f"Pillow unavailable ({e}) - image shards cannot be packed")
+
+SHARDS_DIR = os.path.join('training_data', 'image_shards')
+INDEX = 'index.json'
+SHARD_ROWS = 4096
+IMAGE_SIZE = sign_classifier.LOAD_SIZE
+PACK_WORKERS = int(os.getenv('PACK_WORKERS', str(min(8, (os.cpu_count() or 1) + 2))))
+FORMAT_VERSION = 1
+
+
+def load_image(path, size=IMAGE_SIZE, mode='L'):
+    """Image file -> (size, size) uint8 for mode 'L', (size, size, 3) for 'RGB'"""
+    if Image is None:
+        raise RuntimeError('Pillow is required to pack images')
+    with Image.open(path) as image:
+        # JPEG draft mode decodes at reduced scale straight from the DCT
+        image.draft(mode, (size, size))
+        return np.asarray(image.convert(mode).resize((size, size), Image.BILINEAR), dtype=np.uint8)
+
+
+def fingerprint(paths, labels, size, mode):
+    """Changes whenever a frame file, its class, or the packed resolution changes"""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}|{size}|{mode}".encode())
+    for path, label in zip(paths, labels):
+        stat = os.stat(path)
+        digest.update(f"\n{path}|{label}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
+def read_index(shards_dir):
+    try:
+        with open(os.path.join(shards_dir, INDEX)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def pack(signs_dir=sign_classifier.ASL_SIGNS_DIR, shards_dir=SHARDS_DIR, size=IMAGE_SIZE, mode='L',
+         shard_rows=SHARD_ROWS, workers=PACK_WORKERS):
+    """Decode and resize every signs_dir/<class>/ frame into shards; returns the index.
+
+    Skips the work if shards_dir already holds the same frames at the same resolution.
+    """
+    paths, labels, classes = sign_classifier.list_dataset(signs_dir)
+    key = fingerprint(paths, labels, size, mode)
+    index = read_index(shards_dir)
+    if index is not None and index.get('fingerprint') == key:
+        return index
+    if not paths:
+        raise ValueError(f"No frames in {signs_dir}/<class>/")
+
+    start = time.perf_counter()
+    frame_shape = (size, size) if mode == 'L' else (size, size, 3)
+    tmp_dir = f"{shards_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    shards = []
+    # Pillow releases the GIL while decoding and resizing, so threads scale
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for shard_start in range(0, len(paths), shard_rows):
+            batch = paths[shard_start:shard_start + shard_rows]
+            name = f"shard-{len(shards):05d}.npy"
+            # Preallocated on disk: frames are written straight into the memory map
+            frames = np.lib.format.open_memmap(os.path.join(tmp_dir, name), mode='w+', dtype=np.uint8,
+                                               shape=(len(batch),) + frame_shape)
+            for row, frame in enumerate(pool.map(lambda path: load_image(path, size, mode), batch)):
+                frames[row] = frame
+            frames.flush()
+            del frames
+            shards.append({'name': name, 'rows': len(batch)})
+
+    np.save(os.path.join(tmp_dir, 'labels.npy'), labels.astype(np.int32))
+    np.save(os.path.join(tmp_dir, 'offsets.npy'), np.cumsum([0] + [shard['rows'] for shard in shards]))
+    index = {
+        'version': FORMAT_VERSION,
+        'fingerprint': key,
+        'rows': len(paths),
+        'size': size,
+        'mode': mode,
+        'frame_shape': list(frame_shape),
+        'classes': classes,
+        'shards': shards,
+        'build_seconds': round(time.perf_counter() - start, 3),
+    }
+    with open(os.path.join(tmp_dir, INDEX), 'w') as f:
+        json.dump(index, f, indent=2)
+    old_dir = f"{shards_dir}.old-{os.getpid()}"
+    if os.path.exists(shards_dir):
+        os.rename(shards_dir, old_dir)
+    os.rename(tmp_dir, shards_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    logger.info(f"🗃️  Packed {len(paths)} frames ({len(classes)} classes) into {len(shards)} shards "
+                f"in {index['build_seconds']}s")
+    return index
+
+
+class ImageShards:
+    """Random access to packed frames; frames are read-only views into the memory-mapped shards"""
+
+    def __init__(self, shards_dir=SHARDS_DIR):
+        self.index = read_index(shards_dir)
+        if self.index is None or self.index.get('version') != FORMAT_VERSION:
+            raise FileNotFoundError(f"No image shards in {shards_dir} - run pack first")
+        self.shards_dir = shards_dir
+        self.classes = self.index['classes']
+        self.labels = np.load(os.path.join(shards_dir, 'labels.npy'))
+        self.offsets = np.load(os.path.join(shards_dir, 'offsets.npy'))
+        self._shards = [None] * len(self.index['shards'])
+
+    def __len__(self):
+        return self.index['rows']
+
+    def shard(self, number):
+        """All frames of one shard, mapped on first use"""
+        if self._shards[number] is None:
+            self._shards[number] = np.load(os.path.join(self.shards_dir, self.index['shards'][number]['name']),
+                                           mmap_mode='r')
+        return self._shards[number]
+
+    def locate(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        number = int(np.searchsorted(self.offsets, idx, side='right')) - 1
+        return number, idx - int(self.offsets[number])
+
+    def __getitem__(self, idx):
+        """(frame view, label)"""
+        number, row = self.locate(idx)
+        return self.shard(number)[row], int(self.labels[idx])
+
+    def batch(self, indices):
+        """(frames, labels) for arbitrary indices - one gather per shard touched (a copy)"""
+        indices = np.asarray(indices)
+        numbers = np.searchsorted(self.offsets, indices, side='right') - 1
+        frames = np.empty((len(indices),) + tuple(self.index['frame_shape']), dtype=np.uint8)
+        for number in np.unique(numbers):
+            positions = np.flatnonzero(numbers == number)
+            frames[positions] = self.shard(number)[indices[positions] - self.offsets[number]]
+        return frames, self.labels[indices]
+
+    def iter_batches(self, batch_size, shuffle=False, seed=None):
+        """(frames, labels) blocks of consecutive frames as zero-copy views.
+
+        shuffle=True visits the blocks in random order, which is the randomness an epoch can get
+        without copying; use batch() with a permutation when each batch must mix the whole set.
+        """
+        blocks = [(number, row) for number, shard in enumerate(self.index['shards'])
+                  for row in range(0, shard['rows'], batch_size)]
+        if shuffle:
+            np.random.default_rng(seed).shuffle(blocks)
+        for number, row in blocks:
+            start = int(self.offsets[number]) + row
+            frames = self.shard(number)[row:row + batch_size]
+            yield frames, self.labels[start:start + len(frames)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('pack', 'info'))
+    parser.add_argument('--signs-dir', default=sign_classifier.ASL_SIGNS_DIR)
+    parser.add_argument('--shards-dir', default=SHARDS_DIR)
+    parser.add_argument('--size', type=int, default=IMAGE_SIZE)
+    parser.add_argument('--rgb', action='store_true', help='keep colour (default: grayscale)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.command == 'pack':
+        if not os.path.isdir(args.signs_dir):
+            print(f"❌ No frames directory at {args.signs_dir}")
+            return False
+        pack(args.signs_dir, args.shards_dir, args.size, 'RGB' if args.rgb else 'L')
+    shards = ImageShards(args.shards_dir)
+    size = sum(os.path.getsize(os.path.join(args.shards_dir, shard['name'])) for shard in shards.index['shards'])
+    print(f"🗃️  {len(shards)} frames, {len(shards.classes)} classes, {len(shards.index['shards'])} shards "
+          f"of {shards.index['frame_shape']} uint8 ({size / 2**20:.1f}MB)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Incremental retraining for the baseline pattern model (models/asl_patterns.json)
+A manifest next to the model records which annotation records (by content
+hash) the model was built from. A retrain diffs the current record hashes
+(cached per annotation file by annotation_loader) against the manifest and
+recomputes only the patterns whose sign text gained or lost records. The
+model is then replaced atomically with a bumped version, followed by the
+manifest; if the two ever disagree the next run rebuilds from scratch.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+
+from annotation_loader import record_hash
+
+MANIFEST_SUFFIX = '.manifest.json'
+
+# Built-in commands the model always knows, even without training data
+DEFAULT_COMMANDS = {
+    'hello': {'words': ['hello'], 'gesture': 'wave', 'confidence': 0.9},
+    'help': {'words': ['help'], 'gesture': 'fist_on_palm', 'confidence': 0.8},
+    'robot pick up': {'words': ['robot', 'pick', 'up'], 'gesture': 'grasp', 'confidence': 0.85},
+    'robot deliver': {'words': ['robot', 'deliver'], 'gesture': 'place', 'confidence': 0.85},
+    'lights on': {'words': ['lights', 'on'], 'gesture': 'up', 'confidence': 0.8},
+    'lights off': {'words': ['lights', 'off'], 'gesture': 'down', 'confidence': 0.8},
+    'call ava': {'words': ['call', 'ava'], 'gesture': 'phone', 'confidence': 0.8},
+    'chat ava': {'words': ['chat', 'ava'], 'gesture': 'talk', 'confidence': 0.8},
+    'stop': {'words': ['stop'], 'gesture': 'flat_hand', 'confidence': 0.9},
+    'thank you': {'words': ['thank', 'you'], 'gesture': 'chin_forward', 'confidence': 0.9}
+}
+
+
+def sign_text(record):
+    text = record.get('text') or ''
+    return text.lower() if isinstance(text, str) else ''
+
+
+def pattern_features(text, timestamp):
+    """Simple feature extraction (for demo)"""
+    return {
+        'length': len(text),
+        'words': text.split(),
+        'contains_robot': 'robot' in text,
+        'contains_hello': 'hello' in text,
+        'contains_help': 'help' in text,
+        'contains_lights': 'lights' in text,
+        'contains_call': 'call' in text,
+        'contains_chat': 'chat' in text,
+        'timestamp': timestamp
+    }
+
+
+def _timestamp_key(timestamp):
+    """Sort key for record timestamps (numbers or ISO strings); records without one sort first"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            pass
+    return float('-inf')
+
+
+def _record_key(timestamp, h):
+    """Which of a text's records its pattern comes from: the latest timestamp, ties broken by hash"""
+    return _timestamp_key(timestamp), h
+
+
+def record_pattern(text, timestamp):
+    return pattern_features(text, timestamp if timestamp is not None else time.time())
+
+
+def newest_records(records, hashes=None):
+    """{sign text: record} - the record each text's pattern is built from, by the rule update_model uses"""
+    if hashes is None:
+        hashes = [record_hash(record) for record in records]
+    newest = {}
+    for record, h in zip(records, hashes):
+        text = sign_text(record)
+        key = _record_key(record.get('timestamp'), h)
+        if text and (text not in newest or key > newest[text][0]):
+            newest[text] = (key, record)
+    return {text: record for text, (_, record) in newest.items()}
+
+
+def bump_version(version):
+    """'1.0.7' -> '1.0.8' (anything unparseable restarts at 1.0.1)"""
+    try:
+        major, minor, patch = (int(part) for part in str(version).split('.'))
+    except ValueError:
+        return '1.0.1'
+    return f"{major}.{minor}.{patch + 1}"
+
+
+def manifest_path(model_path):
+    root, _ = os.path.splitext(str(model_path))
+    return root + MANIFEST_SUFFIX
+
+
+def atomic_write_json(path, data, indent=1):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            # dumps + write: json.dump streams through the pure-Python encoder
+            f.write(json.dumps(data, indent=indent))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temp file behind (e.g. on a full disk)
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _newest(entries, hashes):
+    """Hash of the entry among hashes whose record the pattern comes from (see _record_key)"""
+    return max(hashes, key=lambda h: _record_key(entries[h][1], h))
+
+
+def update_model(records, model_path, device='cpu', full=False, hashes=None):
+    """Bring the pattern model at model_path up to date with records.
+
+    hashes: record_hash() of each record, if the caller already has them (the annotation
+    cache keeps them per file), so unchanged records are not re-hashed.
+    Returns (model_data, changes) where changes counts added/removed records and
+    recomputed patterns; nothing is written when no record changed.
+    """
+    start = time.perf_counter()
+    model = _read_json(model_path)
+    manifest = _read_json(manifest_path(model_path))
+    rebuilt = (full or model is None or manifest is None
+               or manifest.get('model_version') != model.get('version'))
+    if rebuilt:
+        # No trusted baseline: start from the defaults and treat every record as new
+        manifest = {'records': {}, 'signs': {}}
+        patterns = {}
+        version = model.get('version', '1.0.0') if model else '1.0.0'
+    else:
+        patterns = model['patterns']
+        version = model['version']
+    entries = manifest['records']  # hash -> [sign text, timestamp]
+    signs = manifest['signs']      # sign text -> {'count': records, 'newest': hash}
+
+    if hashes is None:
+        hashes = [record_hash(record) for record in records]
+    positions = dict(zip(hashes, range(len(hashes))))
+    added = positions.keys() - entries.keys()
+    removed = entries.keys() - positions.keys()
+    changes = {'added': len(added), 'removed': len(removed), 'patterns_updated': 0, 'rebuilt': rebuilt,
+               'records': len(positions)}
+    if not rebuilt and not added and not removed:
+        changes['seconds'] = time.perf_counter() - start
+        return model, changes
+
+    # Only the changed records are touched; a text is rescanned only if its newest record went away
+    affected, rescan = set(), set()
+    for h in removed:
+        text = entries.pop(h)[0]
+        if text:
+            affected.add(text)
+            signs[text]['count'] -= 1
+            if signs[text]['newest'] == h:
+                rescan.add(text)
+    for h in added:
+        record = records[positions[h]]
+        text = sign_text(record)
+        entries[h] = [text, record.get('timestamp')]
+        if text:
+            affected.add(text)
+            sign = signs.setdefault(text, {'count': 0, 'newest': h})
+            sign['count'] += 1
+            newest = sign['newest']
+            if text not in rescan and _record_key(entries[h][1], h) > _record_key(entries[newest][1], newest):
+                sign['newest'] = h
+    if rescan:
+        candidates = {text: [] for text in rescan}
+        for h, (text, _) in entries.items():
+            if text in candidates:
+                candidates[text].append(h)
+        for text, text_hashes in candidates.items():
+            if text_hashes:
+                signs[text]['newest'] = _newest(entries, text_hashes)
+
+    for text in affected:
+        if signs[text]['count'] > 0:
+            patterns[text] = record_pattern(text, entries[signs[text]['newest']][1])
+            continue
+        del signs[text]
+        if text in DEFAULT_COMMANDS:
+            patterns[text] = dict(DEFAULT_COMMANDS[text])
+        else:
+            patterns.pop(text, None)
+    for text, features in DEFAULT_COMMANDS.items():
+        patterns.setdefault(text, dict(features))
+    changes['patterns_updated'] = len(affected)
+
+    model = {
+        'model_type': 'asl_pattern_matcher',
+        'version': bump_version(version),
+        'patterns': patterns,
+        'trained_commands': len(patterns),
+        'training_date': datetime.now().isoformat(),
+        'device': device,
+        'status': 'ready',
+        'confidence_threshold': 0.7,
+        'supported_commands': list(patterns.keys()),
+        'incremental': {'added': len(added), 'removed': len(removed), 'rebuilt': rebuilt}
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+    # Model first, manifest second: a crash in between leaves mismatched versions -> full rebuild
+    atomic_write_json(model_path, model)
+    manifest['model_version'] = model['version']
+    atomic_write_json(manifest_path(model_path), manifest, indent=None)  # compact: it has a row per record
+    changes['seconds'] = time.perf_counter() - start
+    return model, changes
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+On-demand CPU profiling for live ASL Command Center servers
+- /admin/profile samples every thread's stack for N seconds and returns
+  collapsed stacks (flamegraph.pl / speedscope ready)
+- ?profile=1 on any request returns cProfile stats for that request only
+Both require the admin token and install nothing unless ADMIN_TOKEN is set.
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+from admin_auth import admin_enabled, admin_error, is_admin
+
+MAX_PROFILE_SECONDS = float(os.getenv('MAX_PROFILE_SECONDS', '60'))
+
+# Only one sampler / request profiler at a time per process
+_sampler_lock = threading.Lock()
+_request_profile_lock = threading.Lock()
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples all Python thread stacks from a background thread.
+
+    A sampling thread (rather than a SIGPROF timer) is used because signal
+    handlers only run on the main thread, which sits idle in the server's
+    accept loop while request threads do the work.
+    """
+
+    def __init__(self, interval=0.005, include_thread_names=True, ignore_threads=()):
+        self.interval = interval
+        self.include_thread_names = include_thread_names
+        self.ignore_threads = set(ignore_threads)
+        self.stacks = Counter()
+        self.samples = 0
+
+    def sample_once(self, own_ident):
+        names = {t.ident: t.name for t in threading.enumerate()} if self.include_thread_names else {}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident or ident in self.ignore_threads:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if self.include_thread_names:
+                stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self, seconds):
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            self.sample_once(own_ident)
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return self
+
+    def collapsed(self):
+        """Brendan Gregg collapsed-stack format: 'frame;frame;frame count' per line"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_live(seconds, interval=0.005, include_thread_names=True, ignore_threads=()):
+    """Sample the live process for `seconds`; returns a StackSampler or None if one is already running"""
+    if not _sampler_lock.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(interval, include_thread_names, ignore_threads)
+        thread = threading.Thread(target=sampler.run, args=(seconds,), name='stack-sampler', daemon=True)
+        thread.start()
+        thread.join()
+        return sampler
+    finally:
+        _sampler_lock.release()
+
+
+def format_cprofile(profiler, sort='cumulative', limit=40):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def instrument_flask(app):
+    """Add /admin/profile and the per-request ?profile=1 mode to a Flask app"""
+    from flask import Response, g, jsonify, request
+
+    @app.route('/admin/profile', methods=['GET'])
+    def admin_profile():
+        """Sample live stacks (?seconds=N&interval_ms=5&format=collapsed|json)"""
+        if not is_admin(request.headers):
+            return admin_error()
+        seconds = min(request.args.get('seconds', 10, type=float), MAX_PROFILE_SECONDS)
+        interval = max(request.args.get('interval_ms', 5, type=float), 0.5) / 1000
+        sampler = profile_live(seconds, interval, ignore_threads=(threading.get_ident(),))
+        if sampler is None:
+            return jsonify({'error': 'A profile is already running'}), 409
+        if request.args.get('format') == 'json':
+            return jsonify({
+                'seconds': seconds,
+                'interval_ms': interval * 1000,
+                'samples': sampler.samples,
+                'stacks': dict(sampler.stacks.most_common())
+            })
+        return Response(sampler.collapsed(), mimetype='text/plain')
+
+    if not admin_enabled():
+        # Nothing on the request path when profiling can't be used
+        return app
+
+    @app.before_request
+    def _profile_start():
+        if 'profile' in request.args and is_admin(request.headers):
+            if not _request_profile_lock.acquire(blocking=False):
+                return jsonify({'error': 'Another request is being profiled'}), 409
+            profiler = cProfile.Profile()
+            g._request_profiler = profiler
+            profiler.enable()
+
+    @app.after_request
+    def _profile_finish(response):
+        profiler = g.pop('_request_profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        _request_profile_lock.release()
+        sort = request.args.get('profile_sort', 'cumulative')
+        if sort not in ('cumulative', 'tottime', 'ncalls', 'name'):
+            sort = 'cumulative'
+        report = format_cprofile(profiler, sort=sort)
+        profiled = Response(report, mimetype='text/plain')
+        profiled.headers['X-Profiled-Status'] = str(response.status_code)
+        return profiled
+
+    @app.teardown_request
+    def _profile_teardown(exc):
+        # after_request doesn't run on unhandled errors - release the profiler anyway
+        profiler = g.pop('_request_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _request_profile_lock.release()
+
+    return app
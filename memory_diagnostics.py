@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Memory diagnostics for the ASL Command Center servers
+tracemalloc snapshots on demand, snapshot diffs by allocation site, an RSS
+history sampled in the background and sizes of long-lived structures
+(ingest queue, command_history, ...). Endpoints require the admin token.
+"""
+
+import os
+import time
+import itertools
+import threading
+import tracemalloc
+from collections import OrderedDict, deque
+
+from admin_auth import admin_error, is_admin
+from server_metrics import resident_memory_bytes
+
+RSS_SAMPLE_INTERVAL = float(os.getenv('RSS_SAMPLE_INTERVAL', '10'))
+RSS_HISTORY = int(os.getenv('RSS_HISTORY', '720'))  # 2 hours at the default interval
+SNAPSHOT_LIMIT = int(os.getenv('MEMORY_SNAPSHOT_LIMIT', '5'))
+
+
+class MemoryDiagnostics:
+    """Keeps a few tracemalloc snapshots, an RSS history and tracked structure sizes"""
+
+    def __init__(self, snapshot_limit=SNAPSHOT_LIMIT, rss_interval=RSS_SAMPLE_INTERVAL,
+                 rss_history=RSS_HISTORY):
+        self.snapshots = OrderedDict()
+        self.snapshot_limit = snapshot_limit
+        self.rss_interval = rss_interval
+        self.rss_samples = deque(maxlen=rss_history)
+        self.tracked = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    # Tracked structures -------------------------------------------------
+
+    def track(self, name, size_fn):
+        """Report size_fn() (e.g. len of a list) in every RSS sample and /admin/memory/rss"""
+        self.tracked[name] = size_fn
+
+    def tracked_sizes(self):
+        sizes = {}
+        for name, size_fn in self.tracked.items():
+            try:
+                sizes[name] = size_fn()
+            except Exception as e:
+                sizes[name] = f"error: {e}"
+        return sizes
+
+    # RSS history --------------------------------------------------------
+
+    def sample_rss(self, record=True):
+        sample = {'time': time.time(), 'rss_bytes': resident_memory_bytes(), 'tracked': self.tracked_sizes()}
+        if record:
+            self.rss_samples.append(sample)
+        return sample
+
+    def start_sampler(self):
+        with self._lock:
+            if self._sampler is not None or self.rss_interval <= 0:
+                return
+            self._stop.clear()
+
+            def run():
+                while not self._stop.is_set():
+                    self.sample_rss()
+                    self._stop.wait(self.rss_interval)
+
+            self._sampler = threading.Thread(target=run, name='rss-sampler', daemon=True)
+            self._sampler.start()
+
+    def stop_sampler(self):
+        with self._lock:
+            sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            self._stop.set()
+            sampler.join()
+
+    # tracemalloc snapshots ----------------------------------------------
+
+    def start_tracing(self, frames=10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop_tracing(self):
+        with self._lock:
+            self.snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def take_snapshot(self):
+        """Snapshot current allocations; starts tracing on first use (earlier allocations are not seen)"""
+        self.start_tracing()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+        with self._lock:
+            snapshot_id = next(self._ids)
+            self.snapshots[snapshot_id] = {'snapshot': snapshot, 'time': time.time(),
+                                           'rss_bytes': resident_memory_bytes()}
+            while len(self.snapshots) > self.snapshot_limit:
+                self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get_snapshot(self, snapshot_id):
+        with self._lock:
+            return self.snapshots.get(snapshot_id)
+
+    def top(self, snapshot_id, limit=20, key_type='lineno'):
+        entry = self.get_snapshot(snapshot_id)
+        if entry is None:
+            return None
+        stats = entry['snapshot'].statistics(key_type)
+        return {
+            'id': snapshot_id,
+            'time': entry['time'],
+            'rss_bytes': entry['rss_bytes'],
+            'traced_bytes': sum(stat.size for stat in stats),
+            'top': [_format_stat(stat) for stat in stats[:limit]]
+        }
+
+    def diff(self, old_id, new_id, limit=20, key_type='lineno'):
+        """Top growers between two snapshots, grouped by allocation site"""
+        old, new = self.get_snapshot(old_id), self.get_snapshot(new_id)
+        if old is None or new is None:
+            return None
+        stats = new['snapshot'].compare_to(old['snapshot'], key_type)
+        growers = [stat for stat in stats if stat.size_diff > 0]
+        return {
+            'from': old_id,
+            'to': new_id,
+            'elapsed_s': round(new['time'] - old['time'], 3),
+            'rss_diff_bytes': (new['rss_bytes'] or 0) - (old['rss_bytes'] or 0),
+            'traced_diff_bytes': sum(stat.size_diff for stat in stats),
+            'top_growers': [{
+                'site': _format_site(stat.traceback),
+                'size_diff_bytes': stat.size_diff,
+                'size_bytes': stat.size,
+                'count_diff': stat.count_diff,
+                'count': stat.count
+            } for stat in growers[:limit]]
+        }
+
+
+def _format_site(traceback):
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _format_stat(stat):
+    return {'site': _format_site(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+
+
+DIAGNOSTICS = MemoryDiagnostics()
+
+
+def instrument_flask(app, diagnostics=None, tracked=None):
+    """Add /admin/memory/* endpoints; the background RSS sampler starts on the first request"""
+    from flask import jsonify, request
+
+    diagnostics = diagnostics or DIAGNOSTICS
+    for name, size_fn in (tracked or {}).items():
+        diagnostics.track(name, size_fn)
+
+    @app.before_request
+    def _start_rss_sampler():
+        if diagnostics._sampler is None:
+            diagnostics.start_sampler()
+
+    @app.route('/admin/memory/snapshot', methods=['POST'])
+    def memory_snapshot():
+        """Take a tracemalloc snapshot (?limit=N top sites)"""
+        if not is_admin(request.headers):
+            return admin_error()
+        snapshot_id = diagnostics.take_snapshot()
+        return jsonify(diagnostics.top(snapshot_id, limit=request.args.get('limit', 20, type=int)))
+
+    @app.route('/admin/memory/diff', methods=['GET'])
+    def memory_diff():
+        """Diff two snapshots (?from=ID&to=ID; `to` defaults to a fresh snapshot)"""
+        if not is_admin(request.headers):
+            return admin_error()
+        old_id = request.args.get('from', type=int)
+        new_id = request.args.get('to', type=int) or diagnostics.take_snapshot()
+        if old_id is None:
+            return jsonify({'error': 'from=<snapshot id> is required'}), 400
+        result = diagnostics.diff(old_id, new_id, limit=request.args.get('limit', 20, type=int))
+        if result is None:
+            return jsonify({'error': 'Unknown snapshot id', 'available': list(diagnostics.snapshots)}), 404
+        return jsonify(result)
+
+    @app.route('/admin/memory/rss', methods=['GET'])
+    def memory_rss():
+        """RSS history plus sizes of tracked long-lived structures"""
+        if not is_admin(request.headers):
+            return admin_error()
+        current = diagnostics.sample_rss(record=False)
+        return jsonify({
+            'current': current,
+            'interval_s': diagnostics.rss_interval,
+            'tracing': tracemalloc.is_tracing(),
+            'snapshots': list(diagnostics.snapshots),
+            'samples': list(diagnostics.rss_samples)
+        })
+
+    @app.route('/admin/memory/stop', methods=['POST'])
+    def memory_stop():
+        """Stop tracemalloc and drop stored snapshots"""
+        if not is_admin(request.headers):
+            return admin_error()
+        diagnostics.stop_tracing()
+        return jsonify({'status': 'stopped'})
+
+    return app
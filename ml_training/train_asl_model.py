@@ -17,54 +17,117 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared data modules (columnar_export, ...) live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import columnar_export
+except ImportError as e:
+    columnar_export = None
+    logger.warning(f"Columnar export unavailable ({e}) - collected samples will not be loaded")
+
+import annotation_loader
+import incremental_training
+import ms_asl
+
+try:
+    import frame_dedup
+    import ms_asl_index
+    import sign_classifier
+    import training_autotune
+except ImportError as e:
+    frame_dedup = ms_asl_index = sign_classifier = training_autotune = None
+    logger.warning(f"NumPy training modules unavailable ({e}) - MS-ASL is streamed, "
+                   f"the sign classifier and autotuning are skipped")
+
+# MS-ASL samples used for foundational training (streamed, so the cap bounds memory too)
+MS_ASL_SAMPLE_LIMIT = int(os.getenv('MS_ASL_SAMPLE_LIMIT', '1000'))
+
 class ASLDataset:
     """Dataset class for ASL training data"""
     
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
         self.custom_data = []
+        self.custom_hashes = []  # content hash per custom_data record (for incremental training)
         self.ms_asl_data = []
+        self.ms_asl_index = None
+        self.collected = None
+        self._command_signs = None
         
         # Load custom training data
         self._load_custom_data()
         
+        # Load samples collected through /ml/log_sign (columnar export)
+        self._load_collected_samples()
+        
         # Load MS-ASL if available (for foundational training)
         self._load_ms_asl_data()
         
         logger.info(f"Dataset loaded: {len(self.custom_data)} custom + {len(self.ms_asl_data)} MS-ASL samples")
     
     def _load_custom_data(self):
-        """Load custom user-collected ASL data"""
+        """Load custom user-collected ASL data (parsed in parallel, cached by path/mtime/size)"""
         annotations_dir = self.data_dir / "annotations"
         if annotations_dir.exists():
-            for json_file in annotations_dir.glob("*.json"):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            self.custom_data.extend(data)
-                        else:
-                            self.custom_data.append(data)
-                except Exception as e:
-                    logger.warning(f"Failed to load {json_file}: {e}")
-    
-    def _load_ms_asl_data(self):
-        """Load MS-ASL dataset if available (foundational training only)"""
+            try:
+                stats = annotation_loader.LoadStats()
+                self.custom_data.extend(annotation_loader.load_annotations(str(annotations_dir), stats=stats,
+                                                                           hashes=self.custom_hashes))
+                logger.info(f"📝 Loaded {len(self.custom_data)} custom annotations: {stats.summary()}")
+            except Exception as e:
+                logger.warning(f"Failed to load annotations from {annotations_dir}: {e}")
+    
+    def _load_collected_samples(self):
+        """Load the columnar export of collected samples in one read per part"""
+        export_dir = self.data_dir / "columnar"
+        if columnar_export is None or not (export_dir / columnar_export.MANIFEST).exists():
+            return
+        try:
+            start = time.perf_counter()
+            self.collected = columnar_export.load_columns(str(export_dir))
+            if self.collected is not None:
+                collected = list(self.collected.records())
+                self.custom_data.extend(collected)
+                self.custom_hashes.extend(annotation_loader.record_hash(record) for record in collected)
+                logger.info(f"📦 Loaded {len(self.collected)} collected samples in "
+                            f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"Failed to load collected samples from {export_dir}: {e}")
+    
+    def _load_ms_asl_data(self, labels=None, signers=None, limit=MS_ASL_SAMPLE_LIMIT):
+        """Load MS-ASL records (train, val, test - whichever exist) for foundational training.
+
+        Uses the memory-mapped columnar index (built once, rebuilt when a split changes) so
+        label/signer filters are vectorized; falls back to streaming the JSON splits record by
+        record. At most `limit` records are kept (limit for hackathon speed).
+        """
         ms_asl_dir = self.data_dir / "MS-ASL"
         if ms_asl_dir.exists():
             try:
-                ms_asl_file = ms_asl_dir / "MSASL_train.json"
-                if ms_asl_file.exists():
-                    with open(ms_asl_file, 'r') as f:
-                        ms_data = json.load(f)
-                        # Take only a subset for foundational training
-                        self.ms_asl_data = ms_data[:1000]  # Limit for hackathon speed
-                        logger.info(f"Loaded {len(self.ms_asl_data)} MS-ASL samples for foundational training")
+                start = time.perf_counter()
+                self.ms_asl_index = ms_asl_index.open_index(str(ms_asl_dir)) if ms_asl_index else None
+                if self.ms_asl_index is not None:
+                    rows = self.ms_asl_index.select(labels=labels, signers=signers, limit=limit)
+                    self.ms_asl_data = self.ms_asl_index.records(rows)
+                    summary = (f"{len(rows)}/{len(self.ms_asl_index)} indexed records in "
+                               f"{time.perf_counter() - start:.3f}s")
+                else:
+                    stats = ms_asl.StreamStats()
+                    self.ms_asl_data = list(ms_asl.iter_records(data_dir=str(ms_asl_dir), labels=labels,
+                                                                signers=signers, limit=limit, stats=stats))
+                    summary = stats.summary()
+                splits = sorted({record['split'] for record in self.ms_asl_data})
+                logger.info(f"Loaded {len(self.ms_asl_data)} MS-ASL samples ({', '.join(splits) or 'no splits'}) "
+                            f"for foundational training: {summary}")
             except Exception as e:
                 logger.warning(f"MS-ASL data not loaded: {e}")
     
     def get_command_signs(self) -> List[Dict]:
-        """Get signs that map to robot/system commands"""
+        """Get signs that map to robot/system commands (custom data plus matching MS-ASL glosses)"""
+        if self._command_signs is not None:
+            return list(self._command_signs)
+        
         target_commands = [
             'robot', 'pick up', 'deliver', 'stop', 'go', 'help', 'hello',
             'lights', 'on', 'off', 'call', 'chat', 'ava', 'thank you'
@@ -77,7 +140,19 @@ class ASLDataset:
             if any(cmd in item.get('text', '').lower() for cmd in target_commands):
                 command_signs.append(item)
         
-        return command_signs
+        # MS-ASL: one vectorized class-set lookup on the index; without NumPy, stream the same records
+        if self.ms_asl_index is not None:
+            rows = self.ms_asl_index.select(labels=target_commands)
+            command_signs.extend(self.ms_asl_index.records(rows))
+        elif (self.data_dir / "MS-ASL").exists():
+            try:
+                command_signs.extend(ms_asl.iter_records(data_dir=str(self.data_dir / "MS-ASL"),
+                                                         labels=target_commands))
+            except Exception as e:
+                logger.warning(f"MS-ASL command signs not loaded: {e}")
+        
+        self._command_signs = command_signs
+        return list(command_signs)
     
     def __len__(self):
         return len(self.custom_data) + len(self.ms_asl_data)
@@ -126,6 +201,30 @@ def create_lightweight_training_config(device: str) -> Dict:
     
     return base_config
 
+def autotuned_settings(autotune: bool = False, data_dir: Optional[Path] = None) -> Optional[Dict]:
+    """Frame classifier batch size / loader workers for this host when autotune=True (cached, else measured)
+
+    The trial steps run the classifier's own decode + feature + softmax step, so the result is only
+    applied to sign_classifier.train, never to the SmolVLM TrainingArguments.
+    """
+    if not autotune or training_autotune is None:
+        return None
+    cache_path = Path("../models/autotune_cache.json") if os.getcwd().endswith('ml_training') \
+        else Path("models/autotune_cache.json")
+    tuned = training_autotune.cached_result(training_autotune.WORKLOAD, 'cpu', str(cache_path))
+    if tuned is not None:
+        return tuned
+    
+    logger.info("⏱️  Autotuning batch size and loader workers with timed trial steps...")
+    try:
+        signs_dir = str(Path(data_dir or "training_data") / "asl_signs")
+        load_batch, train_step = training_autotune.frame_classifier_workload(signs_dir)
+        return training_autotune.autotune(training_autotune.WORKLOAD, load_batch, train_step, 'cpu',
+                                          cache_path=str(cache_path))
+    except Exception as e:
+        logger.warning(f"Autotuning failed, keeping default batch settings: {e}")
+        return None
+
 def check_disk_space():
     """Check available disk space"""
     import shutil
@@ -138,8 +237,12 @@ def check_disk_space():
         logger.warning(f"Could not check disk space: {e}")
         return True  # Assume OK if can't check
 
-def fast_baseline_training(dataset: ASLDataset, device: str):
-    """Fast baseline training without heavy ML libraries - perfect for hackathon"""
+def fast_baseline_training(dataset: ASLDataset, device: str, incremental: bool = False):
+    """Fast baseline training without heavy ML libraries - perfect for hackathon
+
+    incremental=True only recomputes patterns for annotation records added or removed
+    since the last run (see incremental_training) and bumps the model version.
+    """
     logger.info("🎯 Starting fast baseline ASL training for hackathon demo")
     
     # Check disk space first
@@ -147,45 +250,21 @@ def fast_baseline_training(dataset: ASLDataset, device: str):
         logger.error("❌ Insufficient disk space for training")
         return create_minimal_model()
     
+    if incremental:
+        return incremental_baseline_training(dataset, device)
+    
     # Simple pattern matching training for demo
     command_patterns = {}
     
-    # Extract patterns from custom data
-    for item in dataset.custom_data:
-        sign_text = item.get('text', '').lower()
-        if sign_text and len(sign_text) > 0:
-            # Simple feature extraction (for demo)
-            features = {
-                'length': len(sign_text),
-                'words': sign_text.split(),
-                'contains_robot': 'robot' in sign_text,
-                'contains_hello': 'hello' in sign_text,
-                'contains_help': 'help' in sign_text,
-                'contains_lights': 'lights' in sign_text,
-                'contains_call': 'call' in sign_text,
-                'contains_chat': 'chat' in sign_text,
-                'timestamp': item.get('timestamp', time.time())
-            }
-            command_patterns[sign_text] = features
-    
-    # Add default command patterns for demo
-    default_commands = {
-        'hello': {'words': ['hello'], 'gesture': 'wave', 'confidence': 0.9},
-        'help': {'words': ['help'], 'gesture': 'fist_on_palm', 'confidence': 0.8},
-        'robot pick up': {'words': ['robot', 'pick', 'up'], 'gesture': 'grasp', 'confidence': 0.85},
-        'robot deliver': {'words': ['robot', 'deliver'], 'gesture': 'place', 'confidence': 0.85},
-        'lights on': {'words': ['lights', 'on'], 'gesture': 'up', 'confidence': 0.8},
-        'lights off': {'words': ['lights', 'off'], 'gesture': 'down', 'confidence': 0.8},
-        'call ava': {'words': ['call', 'ava'], 'gesture': 'phone', 'confidence': 0.8},
-        'chat ava': {'words': ['chat', 'ava'], 'gesture': 'talk', 'confidence': 0.8},
-        'stop': {'words': ['stop'], 'gesture': 'flat_hand', 'confidence': 0.9},
-        'thank you': {'words': ['thank', 'you'], 'gesture': 'chin_forward', 'confidence': 0.9}
-    }
+    # Extract patterns from custom data (one record per text, picked like incremental training does)
+    hashes = dataset.custom_hashes if len(dataset.custom_hashes) == len(dataset.custom_data) else None
+    for sign_text, item in incremental_training.newest_records(dataset.custom_data, hashes).items():
+        command_patterns[sign_text] = incremental_training.record_pattern(sign_text, item.get('timestamp'))
     
-    # Merge with defaults
-    for cmd, features in default_commands.items():
+    # Merge with default command patterns for demo
+    for cmd, features in incremental_training.DEFAULT_COMMANDS.items():
         if cmd not in command_patterns:
-            command_patterns[cmd] = features
+            command_patterns[cmd] = dict(features)
     
     # Create model data
     model_data = {
@@ -210,8 +289,13 @@ def fast_baseline_training(dataset: ASLDataset, device: str):
     try:
         model_path.parent.mkdir(exist_ok=True)
         
-        with open(model_path, 'w') as f:
-            json.dump(model_data, f, indent=1)  # Minimal indentation to save space
+        # Minimal indentation to save space; replaced atomically so a crash never leaves a torn model
+        incremental_training.atomic_write_json(model_path, model_data, indent=1)
+        
+        # A full retrain invalidates the incremental manifest
+        stale_manifest = Path(incremental_training.manifest_path(model_path))
+        if stale_manifest.exists():
+            stale_manifest.unlink()
         
         logger.info(f"✅ Fast baseline training complete! Saved {len(command_patterns)} patterns")
         logger.info(f"📁 Model saved to: {model_path}")
@@ -224,6 +308,67 @@ def fast_baseline_training(dataset: ASLDataset, device: str):
         else:
             raise e
 
+def incremental_baseline_training(dataset: ASLDataset, device: str):
+    """Merge only new/removed annotation records into the existing pattern model"""
+    if os.getcwd().endswith('ml_training'):
+        model_path = Path("../models/asl_patterns.json")
+    else:
+        model_path = Path("models/asl_patterns.json")
+    
+    try:
+        hashes = dataset.custom_hashes if len(dataset.custom_hashes) == len(dataset.custom_data) else None
+        model_data, changes = incremental_training.update_model(dataset.custom_data, str(model_path), device,
+                                                                hashes=hashes)
+    except OSError as e:
+        logger.error(f"❌ Incremental training failed: {e}")
+        return create_minimal_model()
+    
+    if changes['rebuilt']:
+        logger.info(f"🏗️  No usable manifest - rebuilt from {changes['records']} records")
+    elif not changes['added'] and not changes['removed']:
+        logger.info(f"✅ Model v{model_data['version']} already up to date ({changes['records']} records)")
+        return model_path
+    logger.info(f"✅ Incremental training complete: +{changes['added']}/-{changes['removed']} records, "
+                f"{changes['patterns_updated']} patterns updated in {changes['seconds'] * 1000:.0f}ms "
+                f"-> v{model_data['version']}")
+    logger.info(f"📁 Model saved to: {model_path}")
+    return model_path
+
+def cpu_classifier_training(data_dir: Path, autotune: bool = False):
+    """Train the NumPy HOG + softmax classifier on training_data/asl_signs/<class>/ frames (CPU only)
+
+    autotune=True featurizes with the autotuned batch size and loader workers for this host.
+    """
+    if os.getcwd().endswith('ml_training'):
+        model_path = Path("../models/sign_classifier.npy")
+    else:
+        model_path = Path("models/sign_classifier.npy")
+    if sign_classifier is None:
+        logger.warning("CPU sign classifier skipped: NumPy is not installed")
+        return None
+    
+    tuned = autotuned_settings(autotune, data_dir)
+    loader = {'batch_size': tuned['batch_size'], 'workers': tuned['dataloader_num_workers']} if tuned else {}
+    if tuned:
+        logger.info(f"⚙️  Autotuned featurization: batch {tuned['batch_size']}, "
+                    f"{tuned['dataloader_num_workers']} workers ({tuned['samples_per_second']:,.0f} samples/s)")
+    
+    try:
+        # Frames are packed into uint8 shards once; retrains read them instead of re-decoding JPEGs.
+        # Sessions sample a frame every 2s, so runs of near-identical frames are dropped first
+        sidecar = sign_classifier.train(str(data_dir / "asl_signs"), str(model_path),
+                                        shards_dir=str(data_dir / "image_shards"),
+                                        dedup_threshold=frame_dedup.THRESHOLD, **loader)
+    except Exception as e:
+        logger.warning(f"CPU sign classifier training failed: {e}")
+        return None
+    if sidecar is None:
+        return None
+    logger.info(f"📁 Sign classifier saved to: {model_path} ({sidecar['weights_bytes'] / 1024:.0f}KB, "
+                f"holdout accuracy {sidecar['metrics'].get('holdout_accuracy', 'n/a')}, "
+                f"{sidecar['metrics'].get('duplicates_removed', 0)} near-duplicate frames dropped)")
+    return model_path
+
 def advanced_training(dataset: ASLDataset, device: str):
     """Advanced training with transformers (when libraries are available)"""
     try:
@@ -300,8 +445,8 @@ def create_minimal_model():
         
         model_path.parent.mkdir(exist_ok=True)
         
-        with open(model_path, 'w') as f:
-            json.dump(model_data, f, indent=1)  # Minimal indentation to save space
+        # Minimal indentation to save space; replaced atomically so a crash never leaves a torn model
+        incremental_training.atomic_write_json(model_path, model_data, indent=1)
         
         logger.info(f"✅ Minimal model saved to: {model_path}")
         return model_path
@@ -309,8 +454,7 @@ def create_minimal_model():
     except OSError:
         # Fallback to current directory
         model_path = Path("asl_patterns_minimal.json")
-        with open(model_path, 'w') as f:
-            json.dump(model_data, f)
+        incremental_training.atomic_write_json(model_path, model_data, indent=None)
         
         logger.info(f"✅ Minimal model saved to current directory: {model_path}")
         return model_path
@@ -319,6 +463,11 @@ def main():
     """Main training function - tries advanced, falls back to fast baseline"""
     logger.info("🎓 ASL Command Center - Training Pipeline Starting")
     
+    # --incremental (or INCREMENTAL_TRAINING=1) only merges annotation changes into the existing model
+    incremental = '--incremental' in sys.argv[1:] or os.getenv('INCREMENTAL_TRAINING') == '1'
+    # --autotune (or TRAINING_AUTOTUNE=1) measures the sign classifier's batch size / workers on this host
+    autotune = '--autotune' in sys.argv[1:] or os.getenv('TRAINING_AUTOTUNE') == '1'
+    
     # Setup paths
     if os.getcwd().endswith('ml_training'):
         data_dir = Path("../training_data")
@@ -346,8 +495,11 @@ def main():
         logger.info("🎯 Advanced training completed successfully")
     else:
         logger.info("🎯 Using fast baseline training for hackathon demo")
-        model_path = fast_baseline_training(dataset, device)
+        model_path = fast_baseline_training(dataset, device, incremental=incremental)
         logger.info(f"✅ Training complete! Model saved to: {model_path}")
+        
+        # Frame classifier from labelled images (asl_signs/<class>/), alongside the keyword patterns
+        cpu_classifier_training(data_dir, autotune)
     
     return True
 
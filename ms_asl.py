@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for the MS-ASL split files (MSASL_train/val/test.json)
+Each split is one big JSON array. Records are decoded one at a time from
+fixed-size chunks with JSONDecoder.raw_decode, so memory stays at roughly one
+chunk plus one record regardless of split size. Label/signer filters are
+applied as records are parsed and `limit` stops reading early.
+
+    python3 ms_asl.py --split val --label hello --limit 100
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+MS_ASL_DIR = os.path.join('training_data', 'MS-ASL')
+SPLITS = ('train', 'val', 'test')
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def split_path(split, data_dir=MS_ASL_DIR):
+    return os.path.join(data_dir, f"MSASL_{split}.json")
+
+
+def available_splits(data_dir=MS_ASL_DIR):
+    return [split for split in SPLITS if os.path.exists(split_path(split, data_dir))]
+
+
+class StreamStats:
+    """Parse throughput for one or more streamed splits"""
+
+    def __init__(self):
+        self.records_parsed = 0
+        self.records_yielded = 0
+        self.bytes_read = 0
+        self.seconds = 0.0
+
+    @property
+    def records_per_second(self):
+        return self.records_parsed / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self):
+        return self.bytes_read / 2**20 / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (f"{self.records_yielded}/{self.records_parsed} records kept, {self.bytes_read / 2**20:.1f}MB in "
+                f"{self.seconds:.2f}s ({self.records_per_second:,.0f} records/s, {self.mb_per_second:.1f}MB/s)")
+
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE, stats=None):
+    """Yield the elements of a top-level JSON array from a text file, one at a time"""
+    buffer = f.read(chunk_size)
+    if stats is not None:
+        stats.bytes_read += len(buffer)
+    position = 0
+    started = False
+    eof = not buffer
+    while True:
+        # Skip whitespace and the array punctuation between elements
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                char = buffer[position]
+                if not started:
+                    if char != '[':
+                        raise ValueError(f"Expected a JSON array, found {char!r}")
+                    started = True
+                    position += 1
+                    continue
+                if char == ',':
+                    position += 1
+                    continue
+                if char == ']':
+                    return
+                break
+            if eof:
+                if started:
+                    raise ValueError('Unterminated JSON array')
+                return
+            chunk = f.read(chunk_size)
+            if stats is not None:
+                stats.bytes_read += len(chunk)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        try:
+            value, end = _decoder.raw_decode(buffer, position)
+            if end == len(buffer) and not eof:
+                # A scalar ending exactly at the chunk boundary may be truncated (e.g. 12|34)
+                raise json.JSONDecodeError('Value may continue in the next chunk', buffer, end)
+        except json.JSONDecodeError:
+            # The element is cut off at the chunk boundary - read more and retry
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            if stats is not None:
+                stats.bytes_read += len(chunk)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        position = end
+        yield value
+
+
+def _matches(record, labels, signers):
+    if labels is not None and record.get('label') not in labels and record.get('clean_text') not in labels:
+        return False
+    if signers is not None and record.get('signer_id') not in signers:
+        return False
+    return True
+
+
+def iter_records(splits=None, data_dir=MS_ASL_DIR, labels=None, signers=None, limit=None, stats=None,
+                 chunk_size=CHUNK_SIZE):
+    """Stream MS-ASL records from the given splits (default: every split present).
+
+    labels: label ids and/or clean_text glosses to keep; signers: signer_ids to keep;
+    limit: stop after this many matching records. Each record gets a 'split' key.
+    """
+    if isinstance(splits, str):
+        splits = [splits]
+    labels = set(labels) if labels is not None else None
+    signers = set(signers) if signers is not None else None
+    kept = 0
+    for split in splits or available_splits(data_dir):
+        path = split_path(split, data_dir)
+        if not os.path.exists(path):
+            continue
+        start = time.perf_counter()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for record in iter_json_array(f, chunk_size, stats):
+                    if stats is not None:
+                        stats.records_parsed += 1
+                    if not _matches(record, labels, signers):
+                        continue
+                    record['split'] = split
+                    kept += 1
+                    if stats is not None:
+                        stats.records_yielded += 1
+                    yield record
+                    if limit is not None and kept >= limit:
+                        return
+        finally:
+            if stats is not None:
+                stats.seconds += time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default=MS_ASL_DIR)
+    parser.add_argument('--split', action='append', choices=SPLITS, help='repeatable; default: all present')
+    parser.add_argument('--label', action='append', help='label id or gloss (repeatable)')
+    parser.add_argument('--signer', action='append', type=int, help='signer_id (repeatable)')
+    parser.add_argument('--limit', type=int)
+    args = parser.parse_args()
+
+    labels = None
+    if args.label:
+        labels = [int(label) if label.isdigit() else label for label in args.label]
+    stats = StreamStats()
+    records = list(iter_records(args.split, args.data_dir, labels, args.signer, args.limit, stats))
+    print(f"📚 MS-ASL splits available: {', '.join(available_splits(args.data_dir)) or 'none'}")
+    print(f"⚡ {stats.summary()}")
+    for record in records[:5]:
+        print(f"   {record['split']:<5} label={record['label']:<4} signer={record['signer_id']:<4} "
+              f"{record['clean_text']!r} ({record['end_time'] - record['start_time']:.2f}s)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped columnar index over the MS-ASL splits
+A one-time build streams every split (ms_asl.iter_records) into one .npy file
+per column: label, signer_id, start, end etc. as int32, times/fps/size/box as
+float64 (so records round-trip exactly), split as a uint8 code and the text
+columns as int32 codes into one sorted, interned string table. Loading
+memory-maps the columns, so opening the index is instant and queries are
+vectorized masks. The index is rebuilt when a split file changes size or mtime.
+
+    python3 ms_asl_index.py --build
+    python3 ms_asl_index.py --label hello --label help --max-duration 2
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+
+import numpy as np
+
+import ms_asl
+
+INDEX_VERSION = 1
+INDEX_DIRNAME = 'index'
+META = 'meta.json'
+STRINGS = 'strings.npy'
+
+INT_COLUMNS = ('label', 'signer_id', 'signer', 'start', 'end', 'review')
+OPTIONAL_COLUMNS = ('review',)  # only present on some records; -1 means absent
+FLOAT_COLUMNS = ('start_time', 'end_time', 'fps', 'width', 'height')
+STRING_COLUMNS = ('clean_text', 'org_text', 'text', 'file', 'url')
+
+
+def index_path(data_dir=ms_asl.MS_ASL_DIR):
+    return os.path.join(data_dir, INDEX_DIRNAME)
+
+
+def _sources(data_dir):
+    """{split: [size, mtime_ns]} for the split files the index is built from"""
+    sources = {}
+    for split in ms_asl.available_splits(data_dir):
+        st = os.stat(ms_asl.split_path(split, data_dir))
+        sources[split] = [st.st_size, st.st_mtime_ns]
+    return sources
+
+
+def _read_meta(index_dir):
+    try:
+        with open(os.path.join(index_dir, META)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_stale(data_dir=ms_asl.MS_ASL_DIR, index_dir=None):
+    meta = _read_meta(index_dir or index_path(data_dir))
+    return meta is None or meta.get('version') != INDEX_VERSION or meta.get('sources') != _sources(data_dir)
+
+
+def build_index(data_dir=ms_asl.MS_ASL_DIR, index_dir=None):
+    """Stream every split into column files; returns the meta dict"""
+    index_dir = index_dir or index_path(data_dir)
+    sources = _sources(data_dir)
+    start = time.perf_counter()
+    ints = {name: [] for name in INT_COLUMNS}
+    floats = {name: [] for name in FLOAT_COLUMNS}
+    strings = {name: [] for name in STRING_COLUMNS}
+    boxes, splits = [], []
+    stats = ms_asl.StreamStats()
+    for record in ms_asl.iter_records(list(sources), data_dir, stats=stats):
+        for name in INT_COLUMNS:
+            ints[name].append(record.get(name, -1))
+        for name in FLOAT_COLUMNS:
+            floats[name].append(record.get(name, np.nan))
+        for name in STRING_COLUMNS:
+            strings[name].append(record.get(name) or '')
+        boxes.append(record.get('box') or [np.nan] * 4)
+        splits.append(ms_asl.SPLITS.index(record['split']))
+
+    rows = len(splits)
+    columns = {name: np.array(values, dtype=np.int32) for name, values in ints.items()}
+    columns.update({name: np.array(values, dtype=np.float64) for name, values in floats.items()})
+    columns['box'] = np.array(boxes, dtype=np.float64).reshape(rows, 4)
+    columns['split'] = np.array(splits, dtype=np.uint8)
+    # One interned table for every text column: glosses, file names and URLs repeat a lot
+    table, codes = np.unique(np.array([value.encode('utf-8') for name in STRING_COLUMNS
+                                       for value in strings[name]], dtype='S'), return_inverse=True)
+    codes = codes.astype(np.int32).reshape(len(STRING_COLUMNS), rows)
+    for i, name in enumerate(STRING_COLUMNS):
+        columns[name] = codes[i].copy()
+
+    tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, array in columns.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+    np.save(os.path.join(tmp_dir, STRINGS), table)
+    meta = {'version': INDEX_VERSION, 'rows': rows, 'strings': len(table), 'sources': sources,
+            'built_at': time.time(), 'build_seconds': round(time.perf_counter() - start, 3)}
+    with open(os.path.join(tmp_dir, META), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    # Swap directories so readers see either the old index or the new one, never a mix
+    old_dir = f"{index_dir}.old-{os.getpid()}"
+    if os.path.exists(index_dir):
+        os.rename(index_dir, old_dir)
+    os.rename(tmp_dir, index_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return meta
+
+
+class MsAslIndex:
+    """Memory-mapped MS-ASL columns with vectorized filters"""
+
+    def __init__(self, index_dir, mmap=True):
+        self.index_dir = index_dir
+        self.meta = _read_meta(index_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"No MS-ASL index in {index_dir}")
+        mode = 'r' if mmap else None
+        self.columns = {}
+        for name in INT_COLUMNS + FLOAT_COLUMNS + STRING_COLUMNS + ('box', 'split'):
+            self.columns[name] = np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode=mode)
+        self.strings = np.load(os.path.join(index_dir, STRINGS), mmap_mode=mode)
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def duration(self):
+        return self.columns['end_time'] - self.columns['start_time']
+
+    @property
+    def box_area(self):
+        """Fraction of the frame covered by the signer box"""
+        box = self.columns['box']
+        return np.abs((box[:, 2] - box[:, 0]) * (box[:, 3] - box[:, 1]))
+
+    def string_codes(self, values):
+        """Codes of the given strings in the interned table (strings not present are dropped)"""
+        values = np.array([value.encode('utf-8') for value in values], dtype='S')
+        if not len(values) or not len(self.strings):
+            return np.zeros(0, dtype=np.int32)
+        positions = np.minimum(np.searchsorted(self.strings, values), len(self.strings) - 1)
+        return positions[self.strings[positions] == values].astype(np.int32)
+
+    def decode(self, codes):
+        return [value.decode('utf-8') for value in self.strings[np.asarray(codes)].tolist()]
+
+    def label_mask(self, labels):
+        """Rows whose label id or clean_text gloss is in labels (same rule as ms_asl.iter_records)"""
+        ids = [label for label in labels if isinstance(label, (int, np.integer))]
+        glosses = [label for label in labels if isinstance(label, str)]
+        mask = np.isin(self.columns['label'], ids)
+        if glosses:
+            mask |= np.isin(self.columns['clean_text'], self.string_codes(glosses))
+        return mask
+
+    def mask(self, labels=None, signers=None, splits=None, min_duration=None, max_duration=None,
+             min_fps=None, max_fps=None, min_box_area=None):
+        """Boolean mask over all rows; every given filter must match"""
+        mask = np.ones(len(self), dtype=bool)
+        if labels is not None:
+            mask &= self.label_mask(labels)
+        if signers is not None:
+            mask &= np.isin(self.columns['signer_id'], list(signers))
+        if splits is not None:
+            mask &= np.isin(self.columns['split'], [ms_asl.SPLITS.index(split) for split in splits])
+        if min_duration is not None or max_duration is not None:
+            duration = self.duration
+            if min_duration is not None:
+                mask &= duration >= min_duration
+            if max_duration is not None:
+                mask &= duration <= max_duration
+        if min_fps is not None:
+            mask &= self.columns['fps'] >= min_fps
+        if max_fps is not None:
+            mask &= self.columns['fps'] <= max_fps
+        if min_box_area is not None:
+            mask &= self.box_area >= min_box_area
+        return mask
+
+    def select(self, limit=None, **filters):
+        """Row numbers matching the filters (see mask), in split/file order"""
+        rows = np.flatnonzero(self.mask(**filters))
+        return rows[:limit] if limit is not None else rows
+
+    def class_counts(self, rows=None):
+        labels = self.columns['label'] if rows is None else self.columns['label'][rows]
+        return np.bincount(labels[labels >= 0], minlength=1000)
+
+    def records(self, rows):
+        """Rows as dicts shaped like ms_asl.iter_records output"""
+        rows = np.asarray(rows, dtype=np.int64)
+        values = {name: self.columns[name][rows].tolist() for name in INT_COLUMNS + FLOAT_COLUMNS}
+        values.update({name: self.decode(self.columns[name][rows]) for name in STRING_COLUMNS})
+        boxes = self.columns['box'][rows].tolist()
+        splits = self.columns['split'][rows].tolist()
+        records = []
+        for i in range(len(rows)):
+            record = {name: column[i] for name, column in values.items()}
+            for name in OPTIONAL_COLUMNS:
+                if record[name] == -1:
+                    del record[name]
+            record['box'] = boxes[i]
+            record['split'] = ms_asl.SPLITS[splits[i]]
+            records.append(record)
+        return records
+
+
+def open_index(data_dir=ms_asl.MS_ASL_DIR, index_dir=None, build=True):
+    """Load the index, (re)building it first if it is missing or stale; None if there are no splits"""
+    index_dir = index_dir or index_path(data_dir)
+    if not ms_asl.available_splits(data_dir):
+        return None
+    if is_stale(data_dir, index_dir):
+        if not build:
+            return None
+        build_index(data_dir, index_dir)
+    return MsAslIndex(index_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default=ms_asl.MS_ASL_DIR)
+    parser.add_argument('--build', action='store_true', help='rebuild even if the index is up to date')
+    parser.add_argument('--label', action='append', help='label id or gloss (repeatable)')
+    parser.add_argument('--signer', action='append', type=int, help='signer_id (repeatable)')
+    parser.add_argument('--split', action='append', choices=ms_asl.SPLITS)
+    parser.add_argument('--min-duration', type=float)
+    parser.add_argument('--max-duration', type=float)
+    parser.add_argument('--min-fps', type=float)
+    parser.add_argument('--min-box-area', type=float)
+    args = parser.parse_args()
+
+    if args.build:
+        meta = build_index(args.data_dir)
+        print(f"🏗️  Built MS-ASL index: {meta['rows']} rows, {meta['strings']} strings in {meta['build_seconds']}s")
+    index = open_index(args.data_dir)
+    if index is None:
+        print(f"❌ No MS-ASL splits in {args.data_dir}")
+        return False
+
+    labels = [int(label) if label.isdigit() else label for label in args.label] if args.label else None
+    start = time.perf_counter()
+    rows = index.select(labels=labels, signers=args.signer, splits=args.split, min_duration=args.min_duration,
+                        max_duration=args.max_duration, min_fps=args.min_fps, min_box_area=args.min_box_area)
+    elapsed = time.perf_counter() - start
+    print(f"📇 {len(rows)}/{len(index)} rows match ({elapsed * 1000:.2f}ms)")
+    for record in index.records(rows[:5]):
+        print(f"   {record['split']:<5} label={record['label']:<4} signer={record['signer_id']:<4} "
+              f"{record['clean_text']!r} ({record['end_time'] - record['start_time']:.2f}s)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
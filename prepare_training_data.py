@@ -11,6 +11,7 @@ from datetime import datetime
 import base64
 from PIL import Image
 
+
 def create_training_dataset():
     """Create training dataset structure for ASL recognition"""
     print("🗂️  Preparing ASL training dataset...")
@@ -39,6 +40,7 @@ def create_training_dataset():
     os.makedirs(f"{base_dir}/asl_signs", exist_ok=True)
     os.makedirs(f"{base_dir}/annotations", exist_ok=True)
     os.makedirs(f"{base_dir}/processed", exist_ok=True)
+    os.makedirs(f"{base_dir}/columnar", exist_ok=True)
     
     # Training data metadata
     dataset_info = {
@@ -66,9 +68,22 @@ def create_training_dataset():
     return base_dir
 
 def process_collected_data():
-    """Process collected ASL recognition data for training"""
+    """Process collected ASL recognition data into the columnar export (training_data/columnar/)"""
     base_dir = "training_data"
-    processed_dir = f"{base_dir}/processed"
+    export_dir = f"{base_dir}/columnar"
+    
+    # The columnar export needs NumPy; the rest of this script doesn't
+    try:
+        import columnar_export
+        import radata_convert
+        import radisk
+    except ImportError as e:
+        print(f"⚠️  Columnar export unavailable ({e}) - install NumPy to process collected data")
+        return
+    
+    # Samples logged through /ml/log_sign (only those added since the last export)
+    logged_count = columnar_export.export_frame_store(export_dir=export_dir)
+    print(f"✅ Exported {logged_count} new logged training samples")
     
     # Look for collected data
     radata_dir = "radata"
@@ -78,36 +93,16 @@ def process_collected_data():
     
     print("🔄 Processing collected ASL data...")
     
-    # Process each file in radata
-    processed_count = 0
-    for filename in os.listdir(radata_dir):
-        if filename.endswith('.json'):
-            try:
-                with open(f"{radata_dir}/{filename}", 'r') as f:
-                    data = json.load(f)
-                
-                # Extract relevant training data
-                if 'image_data' in data and 'recognized_text' in data:
-                    # Save processed annotation
-                    annotation = {
-                        "image_file": filename.replace('.json', '.jpg'),
-                        "text": data['recognized_text'],
-                        "timestamp": data.get('timestamp', ''),
-                        "confidence": data.get('confidence', 'unknown'),
-                        "source": "asl_collection"
-                    }
-                    
-                    # Save to processed directory
-                    output_file = f"{processed_dir}/{filename}"
-                    with open(output_file, 'w') as f:
-                        json.dump(annotation, f, indent=2)
-                    
-                    processed_count += 1
-                    
-            except Exception as e:
-                print(f"⚠️  Error processing {filename}: {e}")
-    
-    print(f"✅ Processed {processed_count} training samples")
+    # Chunks run on a process pool and are journaled as they finish, so an interrupted run resumes;
+    # the new samples land in one columnar part instead of one JSON file per sample
+    stats = radata_convert.convert(radata_dir, export_dir, base_dir=base_dir)
+    print(f"✅ Processed {stats.rows} training samples ({stats.summary()})")
+    
+    # Sessions, signs and training_data the Gun relay stored as radisk shards (radata/!, ...)
+    radisk_stats = radisk.RadiskStats()
+    added = radata_convert.convert_radisk(radata_dir, export_dir, base_dir, radisk_stats)
+    if radisk_stats.shards:
+        print(f"✅ Exported {added} new records from Gun radisk shards ({radisk_stats.summary()})")
 
 def create_training_script():
     """Create a script for SmolVLM fine-tuning"""
@@ -119,47 +114,31 @@ Berkeley Cal Hacks 2025
 
 import json
 import os
+import sys
 from transformers import AutoProcessor, AutoTokenizer, TrainingArguments, Trainer
 import torch
 from torch.utils.data import Dataset
-from PIL import Image
+
+# token_shards lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import token_shards
 
 class ASLDataset(Dataset):
+    """Reads pre-tokenized shards: the processor runs once per sample, not once per access"""
     def __init__(self, data_dir, processor):
-        self.data_dir = data_dir
-        self.processor = processor
-        self.annotations = []
-        
-        # Load annotations
-        annotations_dir = f"{data_dir}/annotations"
-        for filename in os.listdir(annotations_dir):
-            if filename.endswith('.json'):
-                with open(f"{annotations_dir}/{filename}", 'r') as f:
-                    self.annotations.append(json.load(f))
+        self.shards = None
+        samples = token_shards.annotation_samples(data_dir)
+        if samples:
+            # Rebuilt only when annotations, images or the processor change
+            shards_dir = f"{data_dir}/token_shards"
+            token_shards.build_shards(samples, processor, shards_dir)
+            self.shards = token_shards.ShardedTokenDataset(shards_dir, as_torch=True)
     
     def __len__(self):
-        return len(self.annotations)
+        return len(self.shards) if self.shards is not None else 0
     
     def __getitem__(self, idx):
-        annotation = self.annotations[idx]
-        
-        # Load image
-        image_path = f"{self.data_dir}/asl_signs/{annotation['image_file']}"
-        if os.path.exists(image_path):
-            image = Image.open(image_path)
-        else:
-            # Create dummy image if file not found
-            image = Image.new('RGB', (224, 224), color='white')
-        
-        # Process with SmolVLM processor
-        text = f"This is an ASL sign for: {annotation['text']}"
-        inputs = self.processor(images=image, text=text, return_tensors="pt")
-        
-        return {
-            'pixel_values': inputs['pixel_values'].squeeze(),
-            'input_ids': inputs['input_ids'].squeeze(),
-            'labels': inputs['input_ids'].squeeze()
-        }
+        return self.shards[idx]
 
 def train_asl_model():
     """Train SmolVLM for ASL recognition"""
@@ -224,7 +203,7 @@ def main():
     print("📁 Training data will be collected to:")
     print(f"   📸 Images: {base_dir}/asl_signs/")
     print(f"   📝 Annotations: {base_dir}/annotations/")
-    print(f"   🔄 Processed: {base_dir}/processed/")
+    print(f"   🔄 Processed: {base_dir}/columnar/")
     print("")
     print("🚀 Next Steps:")
     print("   1. Start the ASL system and collect data")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable conversion of collected radata/ samples into the columnar export
+Files not exported yet are split into chunks and converted on a process pool.
+Every finished chunk is appended (and fsynced) to a checkpoint journal in the
+export directory, so a run that crashes or is interrupted resumes with only the
+chunks it had not finished. When all chunks are done their rows are written as
+one packed columnar part, the files are recorded as exported in its manifest,
+and the journal is removed.
+
+The Gun relay's radisk shards in the same directory are streamed by radisk.py
+and their signs and training samples exported as another part.
+
+    CONVERT_WORKERS=8
+    python3 radata_convert.py radata
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import columnar_export
+import radisk
+
+logger = logging.getLogger(__name__)
+
+RADATA_DIR = 'radata'
+JOURNAL_SUFFIX = '.journal.jsonl'
+CONVERT_WORKERS = int(os.getenv('CONVERT_WORKERS', str(os.cpu_count() or 1)))
+# Files per work unit: big enough to amortize the pool round trip, small enough to checkpoint often
+CHUNK_FILES = int(os.getenv('CONVERT_CHUNK_FILES', '256'))
+
+
+class ConvertStats:
+    """What one convert call did"""
+
+    def __init__(self):
+        self.files = 0
+        self.resumed = 0
+        self.converted = 0
+        self.failed = 0
+        self.rows = 0
+        self.chunks = 0
+        self.seconds = 0.0
+        self.pool = None
+        self.complete = False
+
+    def files_per_second(self):
+        return self.converted / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        pool = f" on a {self.pool} pool" if self.pool else ''
+        return (f"{self.files} files ({self.resumed} from the journal, {self.converted} converted{pool}, "
+                f"{self.failed} failed) -> {self.rows} rows in {self.seconds:.2f}s "
+                f"({self.files_per_second():,.0f} files/s)")
+
+
+def sample_record(filename, data, base_dir='training_data'):
+    """Collected sample JSON -> export row, or None if it has no image and recognized text"""
+    if not isinstance(data, dict) or 'image_data' not in data or 'recognized_text' not in data:
+        return None
+    return {
+        "image_file": filename.replace('.json', '.jpg'),
+        "root": f"{base_dir}/asl_signs",
+        "text": data['recognized_text'],
+        "timestamp": data.get('timestamp', ''),
+        "confidence": data.get('confidence', 'unknown'),
+        "source": "asl_collection"
+    }
+
+
+def convert_chunk(radata_dir, filenames, base_dir='training_data'):
+    """Worker: convert one chunk -> (converted filenames, rows, {filename: error})"""
+    done, rows, errors = [], [], {}
+    for filename in filenames:
+        try:
+            with open(os.path.join(radata_dir, filename), 'rb') as f:
+                record = sample_record(filename, json.loads(f.read()), base_dir)
+        except Exception as e:
+            errors[filename] = str(e)
+            continue
+        if record is not None:
+            rows.append(record)
+        done.append(filename)
+    return done, rows, errors
+
+
+def journal_path(export_dir, radata_dir):
+    return os.path.join(export_dir, os.path.basename(os.path.normpath(radata_dir)) + JOURNAL_SUFFIX)
+
+
+def read_journal(path):
+    """Finished chunks [{'files': [...], 'rows': [...]}]; a torn last line (crash mid-append) is dropped"""
+    chunks = []
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                chunks.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return chunks
+
+
+def _append_chunk(journal, files, rows):
+    journal.write(json.dumps({'files': files, 'rows': rows}, separators=(',', ':')) + '\n')
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def _chunks(filenames, size):
+    return [filenames[i:i + size] for i in range(0, len(filenames), size)]
+
+
+def convert(radata_dir=RADATA_DIR, export_dir=columnar_export.EXPORT_DIR, workers=CONVERT_WORKERS,
+            chunk_files=CHUNK_FILES, base_dir='training_data', max_chunks=None, stats=None):
+    """Convert radata_dir/*.json not exported yet into one columnar part; returns ConvertStats.
+
+    max_chunks stops after that many chunks, leaving the journal for the next call to resume.
+    """
+    start = time.perf_counter()
+    stats = stats if stats is not None else ConvertStats()
+    os.makedirs(export_dir, exist_ok=True)
+    source = columnar_export.source_key(radata_dir)
+    exported = set(columnar_export.source_state(columnar_export.read_manifest(export_dir), radata_dir)
+                   .get('files', []))
+
+    path = journal_path(export_dir, radata_dir)
+    # Chunks journaled before a crash that happened after the part was written are already exported
+    journaled = [chunk for chunk in read_journal(path) if not exported.intersection(chunk['files'])]
+    finished = {filename for chunk in journaled for filename in chunk['files']}
+    pending = sorted(filename for filename in os.listdir(radata_dir)
+                     if filename.endswith('.json') and filename not in exported and filename not in finished)
+    stats.files = len(pending) + len(finished)
+    stats.resumed = len(finished)
+
+    work = _chunks(pending, chunk_files)
+    stats.complete = max_chunks is None or len(work) <= max_chunks
+    work = work[:max_chunks]
+    # Rewrite the journal without stale entries (and any torn line), then append as chunks finish
+    with open(f"{path}.tmp", 'w') as journal:
+        for chunk in journaled:
+            _append_chunk(journal, chunk['files'], chunk['rows'])
+    os.replace(f"{path}.tmp", path)
+
+    with open(path, 'a') as journal:
+        def finish(result):
+            done, rows, errors = result
+            for filename, error in errors.items():
+                logger.warning(f"⚠️  Error processing {filename}: {error}")
+            stats.failed += len(errors)
+            stats.converted += len(done)
+            stats.chunks += 1
+            if done:
+                _append_chunk(journal, done, rows)
+                journaled.append({'files': done, 'rows': rows})
+
+        if workers > 1 and len(work) > 1 and (os.cpu_count() or 1) > 1:
+            stats.pool = 'process'
+            with ProcessPoolExecutor(max_workers=min(workers, len(work))) as pool:
+                futures = [pool.submit(convert_chunk, radata_dir, chunk, base_dir) for chunk in work]
+                for future in as_completed(futures):
+                    finish(future.result())
+        else:
+            for chunk in work:
+                finish(convert_chunk(radata_dir, chunk, base_dir))
+
+    if stats.complete:
+        # One packed part for every journaled chunk, in file order; the manifest marks them exported
+        journaled.sort(key=lambda chunk: chunk['files'][0])
+        rows = [row for chunk in journaled for row in chunk['rows']]
+        files = [filename for chunk in journaled for filename in chunk['files']]
+        if files:
+            columnar_export.write_part(export_dir, rows, {source: {'files': sorted(exported.union(files))}})
+        stats.rows = len(rows)
+        os.remove(path)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def convert_radisk(radata_dir=RADATA_DIR, export_dir=columnar_export.EXPORT_DIR, base_dir='training_data',
+                   stats=None):
+    """Export signs and training_data samples from the relay's radisk shards; returns rows added.
+
+    Skipped when no shard changed since the last export; otherwise the shards are streamed
+    and only records whose id was not exported before are added.
+    """
+    if not radisk.shard_files(radata_dir):
+        return 0
+    source = columnar_export.source_key(radata_dir) + '#radisk'
+    state = columnar_export.source_state(columnar_export.read_manifest(export_dir), radata_dir, '#radisk')
+    shards = {}
+    for path in radisk.shard_files(radata_dir):
+        st = os.stat(path)
+        shards[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+    if shards == state.get('shards'):
+        return 0
+    exported = set(state.get('ids', []))
+    rows, ids = radisk.training_rows(radisk.iter_records(radata_dir, stats=stats), base_dir, exported)
+    columnar_export.write_part(export_dir, rows, {source: {'shards': shards, 'ids': sorted(exported.union(ids))}})
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('radata_dir', nargs='?', default=RADATA_DIR)
+    parser.add_argument('--export-dir', default=columnar_export.EXPORT_DIR)
+    parser.add_argument('--workers', type=int, default=CONVERT_WORKERS)
+    parser.add_argument('--chunk-files', type=int, default=CHUNK_FILES)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.radata_dir):
+        print(f"❌ No collected data directory at {args.radata_dir}")
+        return False
+    stats = convert(args.radata_dir, args.export_dir, args.workers, args.chunk_files)
+    print(f"🔄 Converted {stats.summary()}")
+    radisk_stats = radisk.RadiskStats()
+    added = convert_radisk(args.radata_dir, args.export_dir, stats=radisk_stats)
+    if radisk_stats.shards:
+        print(f"🔫 Exported {added} new records from radisk: {radisk_stats.summary()}")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for the Gun relay's radisk shards in radata/
+Radisk stores the graph as a radix tree of "soul<ESC>field" keys, serialized
+as nested JSON objects whose keys are the compressed key fragments. A "" key
+ends a radix key, and its object holds the value (":", links as {"#": soul})
+and the HAM state (">"). The relay writes shards ("!", ...) plus a "%1C" file
+listing them.
+
+Shards are tokenized in fixed-size chunks, so memory does not grow with the
+shard size. The radix tree keeps every field of a soul together, so whole
+nodes are emitted as soon as the next soul starts.
+
+    python3 radisk.py radata              # summary of sessions, signs and training samples
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import base64
+import logging
+import argparse
+from urllib.parse import unquote
+
+logger = logging.getLogger(__name__)
+
+RADATA_DIR = 'radata'
+DIRECTORY_FILE = '%1C'
+CHUNK_SIZE = 1 << 20
+ESC = '\x1b'
+
+# After any commas: a key with the "{" of its object or its scalar value, or a run of "}"
+_TOKEN = re.compile(r'[\s,]*(?:"((?:[^"\\]|\\.)*)"\s*:\s*(?:(\{)|("(?:[^"\\]|\\.)*"|[^\s,{}":]+))|(\}+)|\{)', re.S)
+# Leaf fields after a radix key. Older relays wrote some markers as "undefined"
+_FIELDS = {'': 'value', ':': 'value', ':#': 'link', ':undefined': 'link', '>': 'state', 'undefined': 'state'}
+_SUFFIXES = sorted(_FIELDS, key=len, reverse=True)
+
+
+class RadiskStats:
+    """What one read did"""
+
+    def __init__(self):
+        self.shards = 0
+        self.bytes = 0
+        self.leaves = 0
+        self.nodes = 0
+        self.malformed = 0
+        self.seconds = 0.0
+
+    def summary(self):
+        rate = self.bytes / self.seconds / 2**20 if self.seconds else 0.0
+        return (f"{self.shards} shards, {self.bytes / 2**20:.1f}MB -> {self.nodes} nodes from {self.leaves} fields "
+                f"({self.malformed} malformed) in {self.seconds:.2f}s ({rate:.1f}MB/s)")
+
+
+def _key(raw):
+    return json.loads(f'"{raw}"') if '\\' in raw else raw
+
+
+def _flatten(leaf):
+    """Leaf object -> (marker, scalar) pairs, e.g. {":": {"#": "x"}, ">": 1} -> (":#", "x"), (">", 1)"""
+    for marker, value in leaf.items():
+        if isinstance(value, dict):
+            for suffix, scalar in _flatten(value):
+                yield marker + suffix, scalar
+        else:
+            yield marker, value
+
+
+def iter_leaves(path, chunk_size=CHUNK_SIZE):
+    """(radix key, marker, scalar) for every value in one shard, e.g. ('signs/sign-1\\x1bname', ':', 'hello')
+
+    The shard is read chunk_size bytes at a time; only the current key path is kept.
+    """
+    decoder = json.JSONDecoder()
+    stack = []        # key fragments of the open objects
+    boundary = []     # stack depth of each open "" (end of a radix key)
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+        while True:
+            match = _TOKEN.match(buffer, pos)
+            if not eof and (match is None or match.end() >= len(buffer)):
+                # The token may continue in the next chunk
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            if match is None:
+                if buffer[pos:].strip():
+                    raise ValueError(f"{path}: unexpected data at {buffer[pos:pos + 40]!r}")
+                return
+            key, opened, scalar, closed = match.groups()
+            if key is None:
+                pos = match.end()
+                for _ in range(len(closed or '')):  # (the shard's outer "{" closes nothing)
+                    if boundary and boundary[-1] == len(stack) - 1:
+                        boundary.pop()
+                    if stack:
+                        stack.pop()
+                continue
+            key = _key(key)
+            if opened and key == '' and not boundary:
+                # A whole leaf ({":": value, ">": state}) is small: decode it in one C call
+                try:
+                    leaf, pos = decoder.raw_decode(buffer, match.end() - 1)
+                except ValueError:
+                    if eof:
+                        raise
+                    chunk = f.read(chunk_size)
+                    buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                    continue
+                radix_key = ''.join(stack)
+                for marker, value in leaf.items():
+                    if isinstance(value, dict):
+                        for suffix, scalar in _flatten(value):
+                            yield radix_key, marker + suffix, scalar
+                    else:
+                        yield radix_key, marker, value
+                continue
+            pos = match.end()
+            if opened:
+                if key == '':
+                    boundary.append(len(stack))
+                stack.append(key)
+                continue
+            value = json.loads(scalar)
+            if boundary:
+                depth = boundary[-1]
+                yield ''.join(stack[:depth]), ''.join(stack[depth + 1:]) + key, value
+            else:
+                # Leaf written without the "" level: split the marker off the end of the key
+                full = ''.join(stack) + key
+                suffix = next((s for s in _SUFFIXES if full.endswith(s)), '')
+                yield full[:len(full) - len(suffix)], suffix, value
+
+
+def shard_files(radata_dir=RADATA_DIR):
+    """Shard paths in key order, from the %1C directory file (or the directory listing)"""
+    names = []
+    directory = os.path.join(radata_dir, DIRECTORY_FILE)
+    if os.path.exists(directory):
+        names = [key for key, marker, _ in iter_leaves(directory) if marker in ('', ':')]
+    names = [name for name in names if os.path.exists(os.path.join(radata_dir, name))]
+    if not names:
+        names = sorted(name for name in os.listdir(radata_dir)
+                       if name != DIRECTORY_FILE and not name.startswith('.') and not name.endswith('.json'))
+    # File names are URL-encoded keys; order shards by the key they start at
+    return [os.path.join(radata_dir, name) for name in sorted(names, key=unquote)]
+
+
+def iter_nodes(radata_dir=RADATA_DIR, chunk_size=CHUNK_SIZE, stats=None):
+    """(soul, {field: value}) per graph node across all shards; links are {'#': soul}"""
+    start = time.perf_counter()
+    stats = stats if stats is not None else RadiskStats()
+    soul, fields = None, {}
+    for path in shard_files(radata_dir):
+        stats.shards += 1
+        stats.bytes += os.path.getsize(path)
+        for key, marker, scalar in iter_leaves(path, chunk_size):
+            kind = _FIELDS.get(marker)
+            node_soul, sep, field = key.partition(ESC)
+            if kind is None or not sep:
+                stats.malformed += 1
+                continue
+            stats.leaves += 1
+            if node_soul != soul:
+                if fields:
+                    stats.nodes += 1
+                    yield soul, fields
+                soul, fields = node_soul, {}
+            if kind != 'state':
+                fields[field] = {'#': scalar} if kind == 'link' else scalar
+    if fields:
+        stats.nodes += 1
+        yield soul, fields
+    stats.seconds = time.perf_counter() - start
+
+
+def iter_records(radata_dir=RADATA_DIR, chunk_size=CHUNK_SIZE, stats=None):
+    """('session' | 'sign' | 'training_data', record) rebuilt from the graph, as they are completed.
+
+    A sign is completed by its copy in a session's signs set (an "mc..." soul carrying the
+    sessionId); signs still waiting for one when the shards end are emitted without it.
+    """
+    sessions_of = {}   # sign id -> session, from copies seen before their sign
+    waiting = {}       # sign id -> record, signs seen before their copy
+    for soul, fields in iter_nodes(radata_dir, chunk_size, stats):
+        if 'imageData' in fields and 'sign' in fields:
+            yield 'training_data', dict(fields, soul=soul)
+        elif soul.startswith('signs/'):
+            record = {name: value for name, value in fields.items() if not isinstance(value, dict)}
+            record.setdefault('id', soul[len('signs/'):])
+            session = sessions_of.pop(record['id'], None)
+            if session is None:
+                waiting[record['id']] = record
+                continue
+            record['sessionId'] = session
+            yield 'sign', record
+        elif soul.startswith('sessions/') and soul.count('/') == 1:
+            record = {name: value for name, value in fields.items() if not isinstance(value, dict)}
+            record['id'] = soul[len('sessions/'):]
+            yield 'session', record
+        elif 'sessionId' in fields and isinstance(fields.get('id'), str):
+            record = waiting.pop(fields['id'], None)
+            if record is None:
+                sessions_of[fields['id']] = fields['sessionId']
+                continue
+            record['sessionId'] = fields['sessionId']
+            yield 'sign', record
+    for record in waiting.values():
+        yield 'sign', record
+
+
+def decode_image(data_url):
+    """'data:image/jpeg;base64,...' -> (bytes, extension)"""
+    header, _, payload = data_url.partition(',')
+    extension = 'png' if 'png' in header else 'jpg'
+    return base64.b64decode(payload or header), extension
+
+
+def training_rows(records, base_dir='training_data', skip=()):
+    """Columnar export rows for sign and training_data records (ids in skip are left out).
+
+    training_data images are written to base_dir/asl_signs/gun_<soul>.<ext>. Returns (rows, ids).
+    """
+    images_dir = os.path.join(base_dir, 'asl_signs')
+    rows, ids = [], []
+    for kind, record in records:
+        if kind == 'sign' and record.get('name'):
+            key = str(record['id'])
+            row = {'text': record['name'], 'confidence': record.get('confidence'),
+                   'description': record.get('description'), 'timestamp': record.get('timestamp'),
+                   'session_id': record.get('sessionId'), 'source': 'gun_signs'}
+        elif kind == 'training_data' and isinstance(record.get('imageData'), str):
+            key = record['soul']
+            if key in skip:
+                continue
+            try:
+                image, extension = decode_image(record['imageData'])
+            except ValueError as e:
+                logger.warning(f"⚠️  Bad image data in {key}: {e}")
+                continue
+            image_file = f"gun_{key.replace('/', '_')}.{extension}"
+            os.makedirs(images_dir, exist_ok=True)
+            with open(os.path.join(images_dir, image_file), 'wb') as f:
+                f.write(image)
+            row = {'text': record['sign'], 'image_file': image_file, 'root': images_dir,
+                   'timestamp': record.get('timestamp'), 'session_id': record.get('sessionId'),
+                   'source': 'gun_training_data'}
+        else:
+            continue
+        if key not in skip:
+            rows.append(row)
+            ids.append(key)
+    return rows, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('radata_dir', nargs='?', default=RADATA_DIR)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.radata_dir):
+        print(f"❌ No radisk directory at {args.radata_dir}")
+        return False
+    stats = RadiskStats()
+    counts = {'session': 0, 'sign': 0, 'training_data': 0}
+    for kind, _ in iter_records(args.radata_dir, args.chunk_size, stats):
+        counts[kind] += 1
+    print(f"🔫 {counts['session']} sessions, {counts['sign']} signs, {counts['training_data']} training samples")
+    print(f"   {stats.summary()}")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
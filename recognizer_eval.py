@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Evaluation of the asl_server recognition stack against MS-ASL val/test labels
+Each val/test record gives two recognizer inputs, its clean_text and its
+org_text. Every distinct input is run once through
+asl_server.process_asl_response, the same path chat completions take, and the
+first SIGN it reports is the prediction. Gold glosses and predicted signs are
+both mapped to one canonical name with MSASL_synonym.json. Per-class precision,
+recall and F1 come from a NumPy confusion matrix, and the JSON report
+(key-sorted, sparse confusion cells) can be diffed between model versions.
+
+    python3 recognizer_eval.py --report eval.json
+    python3 recognizer_eval.py --model models/asl_patterns.json --compare eval.json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+import ms_asl
+
+logger = logging.getLogger(__name__)
+
+SPLITS = ('val', 'test')
+FIELDS = ('clean_text', 'org_text')
+NO_SIGN = '<none>'
+REPORT_VERSION = 1
+
+
+def _load_json(data_dir, name):
+    with open(os.path.join(data_dir, name), 'r') as f:
+        return json.load(f)
+
+
+def load_synonyms(data_dir=ms_asl.MS_ASL_DIR):
+    """{word: canonical} from MSASL_synonym.json groups; the first word of a group is canonical"""
+    try:
+        groups = _load_json(data_dir, 'MSASL_synonym.json')
+    except FileNotFoundError:
+        return {}
+    return {word.lower(): group[0].lower() for group in groups for word in group}
+
+
+def canonical(text, synonyms):
+    text = ' '.join(str(text).lower().split())
+    return synonyms.get(text, text)
+
+
+def load_items(splits=SPLITS, fields=FIELDS, data_dir=ms_asl.MS_ASL_DIR, synonyms=None, limit=None):
+    """(inputs, gold, split, field) arrays: one item per record and text field"""
+    synonyms = synonyms if synonyms is not None else load_synonyms(data_dir)
+    try:
+        classes = _load_json(data_dir, 'MSASL_classes.json')
+    except FileNotFoundError:
+        classes = None
+    inputs, gold, split_of, field_of = [], [], [], []
+    for record in ms_asl.iter_records(list(splits), data_dir, limit=limit):
+        label = record.get('label')
+        gloss = classes[label] if classes and isinstance(label, int) and 0 <= label < len(classes) \
+            else record['clean_text']
+        for field in fields:
+            if record.get(field):
+                inputs.append(record[field])
+                gold.append(canonical(gloss, synonyms))
+                split_of.append(record['split'])
+                field_of.append(field)
+    return np.array(inputs, dtype=object), np.array(gold), np.array(split_of), np.array(field_of)
+
+
+def first_sign(output):
+    """Sign name of the first 'SIGN: ... | CONFIDENCE' line of a process_asl_response output, or None"""
+    for line in output.split('\n'):
+        if line.startswith('SIGN:'):
+            return line[len('SIGN:'):].split('|')[0].strip()
+    return None
+
+
+def server_recognizer():
+    """The live matching stack: asl_server.process_asl_response with its loaded model"""
+    import asl_server
+    return lambda text: first_sign(asl_server.process_asl_response(text, None))
+
+
+def confusion_matrix(gold, predicted, classes):
+    """(len(classes), len(classes)) int64 counts, rows = gold, columns = predicted"""
+    k = len(classes)
+    index = {name: i for i, name in enumerate(classes)}
+    rows = np.fromiter((index[name] for name in gold), dtype=np.int64, count=len(gold))
+    columns = np.fromiter((index[name] for name in predicted), dtype=np.int64, count=len(predicted))
+    return np.bincount(rows * k + columns, minlength=k * k).reshape(k, k)
+
+
+def class_metrics(matrix):
+    """(tp, support, predicted, precision, recall, f1) per class; 0 where undefined"""
+    tp = np.diag(matrix).astype(np.float64)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return tp.astype(np.int64), support, predicted, precision, recall, f1
+
+
+def evaluate(inputs, gold, recognize, synonyms=None, groups=None):
+    """Run recognize(text) -> sign or None over the distinct inputs and score them; returns the report dict.
+
+    groups: {name: array of group values per item} for extra accuracy breakdowns (e.g. split, field).
+    """
+    synonyms = synonyms or {}
+    start = time.perf_counter()
+    distinct, inverse = np.unique(inputs.astype(str), return_inverse=True)
+    predictions = []
+    for text in distinct.tolist():
+        sign = recognize(text)
+        predictions.append(canonical(sign, synonyms) if sign else NO_SIGN)
+    predicted = np.array(predictions)[inverse.ravel()] if len(distinct) else np.array([], dtype=str)
+    seconds = time.perf_counter() - start
+
+    classes = sorted(set(gold.tolist()) | set(predicted.tolist()) | {NO_SIGN})
+    matrix = confusion_matrix(gold, predicted, classes)
+    tp, support, predicted_counts, precision, recall, f1 = class_metrics(matrix)
+    scored = support > 0    # macro averages over the classes that occur in the labels
+    correct = gold == predicted
+    rows, columns = np.nonzero(matrix)
+    report = {
+        'items': len(inputs),
+        'distinct_inputs': len(distinct),
+        'seconds': round(seconds, 3),
+        'items_per_second': round(len(inputs) / seconds, 1) if seconds else None,
+        'accuracy': round(float(correct.mean()), 4) if len(inputs) else 0.0,
+        'detected_rate': round(float((predicted != NO_SIGN).mean()), 4) if len(inputs) else 0.0,
+        'macro_precision': round(float(precision[scored].mean()), 4) if scored.any() else 0.0,
+        'macro_recall': round(float(recall[scored].mean()), 4) if scored.any() else 0.0,
+        'macro_f1': round(float(f1[scored].mean()), 4) if scored.any() else 0.0,
+        'classes': {name: {'support': int(support[i]), 'predicted': int(predicted_counts[i]), 'correct': int(tp[i]),
+                           'precision': round(float(precision[i]), 4), 'recall': round(float(recall[i]), 4),
+                           'f1': round(float(f1[i]), 4)}
+                    for i, name in enumerate(classes) if support[i] or predicted_counts[i]},
+        # Sparse confusion cells [gold, predicted, count], most frequent first
+        'confusion': sorted(([classes[r], classes[c], int(matrix[r, c])] for r, c in zip(rows, columns)),
+                            key=lambda cell: (-cell[2], cell[0], cell[1])),
+    }
+    for name, values in (groups or {}).items():
+        report[f"accuracy_by_{name}"] = {str(value): round(float(correct[values == value].mean()), 4)
+                                         for value in np.unique(values)}
+    return report
+
+
+def model_info(model_path=None):
+    """What is being evaluated: the model file's hash, version and pattern count"""
+    import asl_server
+    model = asl_server.TRAINED_MODEL or {}
+    info = {'path': model_path, 'version': model.get('version'), 'model_type': model.get('model_type'),
+            'patterns': len(model.get('patterns', {}))}
+    if model_path and os.path.exists(model_path):
+        with open(model_path, 'rb') as f:
+            info['sha256'] = hashlib.sha256(f.read()).hexdigest()[:16]
+    return info
+
+
+def compare(report, baseline, top=10):
+    """Lines describing how report differs from an earlier one"""
+    lines = []
+    for key in ('accuracy', 'detected_rate', 'macro_precision', 'macro_recall', 'macro_f1', 'items_per_second'):
+        old, new = baseline.get(key), report.get(key)
+        if old is not None and new is not None and old != new:
+            lines.append(f"{key}: {old} → {new} ({new - old:+.4g})")
+    changes = []
+    for name, metrics in report['classes'].items():
+        old = baseline.get('classes', {}).get(name, {})
+        delta = metrics['recall'] - old.get('recall', 0.0)
+        if metrics['support'] and abs(delta) > 1e-9:
+            changes.append((abs(delta), name, old.get('recall', 0.0), metrics['recall']))
+    for _, name, old, new in sorted(changes, reverse=True)[:top]:
+        lines.append(f"recall {name}: {old} → {new}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default=ms_asl.MS_ASL_DIR)
+    parser.add_argument('--split', action='append', choices=ms_asl.SPLITS, help=f"repeatable; default: {' '.join(SPLITS)}")
+    parser.add_argument('--field', action='append', choices=FIELDS, help='repeatable; default: both')
+    parser.add_argument('--model', help='pattern model JSON to evaluate (default: the one asl_server loads)')
+    parser.add_argument('--limit', type=int, help='records to read')
+    parser.add_argument('--report', help='write the JSON report here')
+    parser.add_argument('--compare', help='earlier JSON report to diff against')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    synonyms = load_synonyms(args.data_dir)
+    inputs, gold, splits, fields = load_items(args.split or SPLITS, args.field or FIELDS, args.data_dir, synonyms,
+                                              args.limit)
+    if not len(inputs):
+        print(f"❌ No MS-ASL val/test records in {args.data_dir}")
+        return False
+    import asl_server
+    if args.model:
+        with open(args.model, 'r') as f:
+            asl_server.TRAINED_MODEL = json.load(f)
+    report = evaluate(inputs, gold, server_recognizer(), synonyms, {'split': splits, 'field': fields})
+    report = dict(report, version=REPORT_VERSION, evaluated_at=datetime.now().isoformat(),
+                  model=model_info(args.model or 'models/asl_patterns.json'),
+                  splits=sorted(set(splits.tolist())), fields=sorted(set(fields.tolist())))
+
+    print(f"📏 {report['items']} items ({report['distinct_inputs']} distinct) in {report['seconds']:.2f}s "
+          f"({report['items_per_second']:,.0f} items/s)")
+    print(f"   accuracy {report['accuracy']:.2%}, detected {report['detected_rate']:.2%}, macro P/R/F1 "
+          f"{report['macro_precision']:.3f}/{report['macro_recall']:.3f}/{report['macro_f1']:.3f}")
+    best = sorted(((m['f1'], name) for name, m in report['classes'].items() if m['correct']), reverse=True)[:5]
+    if best:
+        print(f"   best classes: {', '.join(f'{name} ({f1:.2f})' for f1, name in best)}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"📝 Report written to {args.report}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            lines = compare(report, json.load(f))
+        print(f"🔀 Against {args.compare}:" if lines else f"🔀 No metric changes against {args.compare}")
+        for line in lines:
+            print(f"   {line}")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
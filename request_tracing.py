@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+End-to-end request tracing for the ASL Command Center
+Trace IDs travel in HTTP headers across proxy -> asl_server -> llama -> robot hops.
+Finished spans go to an in-process ring buffer and, if TRACE_FILE is set, to a
+JSON-lines file shared by every service so /debug/traces (admin token required)
+can show whole traces.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+
+from admin_auth import admin_error, is_admin
+
+TRACE_HEADER = 'X-Trace-Id'
+PARENT_HEADER = 'X-Parent-Span-Id'
+
+ENABLED = os.getenv('TRACING_ENABLED', '1') != '0'
+TRACE_FILE = os.getenv('TRACE_FILE')
+RING_SIZE = int(os.getenv('TRACE_RING_SIZE', '2048'))
+
+# Only the tail of the shared trace file is read by the viewer
+_FILE_TAIL_BYTES = 2 * 1024 * 1024
+
+_local = threading.local()
+
+
+def new_trace_id():
+    return os.urandom(16).hex()
+
+
+def new_span_id():
+    return os.urandom(8).hex()
+
+
+class TraceCollector:
+    """Ring buffer of finished spans with an optional shared JSON-lines file"""
+
+    def __init__(self, size=RING_SIZE, trace_file=TRACE_FILE):
+        self.spans = deque(maxlen=size)
+        self.trace_file = trace_file
+        self._file_lock = threading.Lock()
+
+    def record(self, span):
+        self.spans.append(span)
+        if self.trace_file:
+            line = json.dumps(span, separators=(',', ':')) + '\n'
+            try:
+                with self._file_lock, open(self.trace_file, 'a') as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    def _file_spans(self):
+        if not self.trace_file or not os.path.exists(self.trace_file):
+            return []
+        spans = []
+        with open(self.trace_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - _FILE_TAIL_BYTES))
+            if size > _FILE_TAIL_BYTES:
+                f.readline()  # skip the partial first line
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+        return spans
+
+    def traces(self):
+        """Group spans by trace id -> {trace_id: [span, ...]}"""
+        grouped = {}
+        seen = set()
+        for span in self._file_spans() + list(self.spans):
+            if span['span_id'] in seen:
+                continue
+            seen.add(span['span_id'])
+            grouped.setdefault(span['trace_id'], []).append(span)
+        return grouped
+
+    def slowest(self, limit=10):
+        """Slowest recent traces, each with its spans ordered as stages"""
+        summaries = []
+        for trace_id, spans in self.traces().items():
+            start = min(s['start'] for s in spans)
+            end = max(s['start'] + s['duration'] for s in spans)
+            stages = [{
+                'service': s['service'],
+                'name': s['name'],
+                'offset_ms': round((s['start'] - start) * 1000, 3),
+                'duration_ms': round(s['duration'] * 1000, 3),
+                'span_id': s['span_id'],
+                'parent_id': s['parent_id'],
+                'attrs': s.get('attrs', {})
+            } for s in sorted(spans, key=lambda s: s['start'])]
+            summaries.append({
+                'trace_id': trace_id,
+                'started': start,
+                'duration_ms': round((end - start) * 1000, 3),
+                'services': sorted({s['service'] for s in spans}),
+                'stages': stages
+            })
+        summaries.sort(key=lambda t: t['duration_ms'], reverse=True)
+        return summaries[:limit]
+
+
+COLLECTOR = TraceCollector()
+
+
+class Span:
+    """A timed stage of a trace; use as a context manager"""
+
+    def __init__(self, name, service, trace_id=None, parent_id=None, collector=None, **attrs):
+        parent = current_span()
+        if trace_id is None and parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        self.name = name
+        self.service = service
+        self.trace_id = trace_id or new_trace_id()
+        self.parent_id = parent_id
+        self.span_id = new_span_id()
+        self.attrs = attrs
+        self.collector = collector or COLLECTOR
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+        self._previous = None
+        self.finished = False
+
+    def __enter__(self):
+        self._previous = current_span()
+        _local.span = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        _local.span = self._previous
+        self.finish()
+        return False
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if ENABLED:
+            self.collector.record({
+                'trace_id': self.trace_id,
+                'span_id': self.span_id,
+                'parent_id': self.parent_id,
+                'service': self.service,
+                'name': self.name,
+                'start': self.start,
+                'duration': time.perf_counter() - self._perf_start,
+                'attrs': self.attrs
+            })
+
+    def headers(self):
+        """Propagation headers naming this span as the parent"""
+        return {TRACE_HEADER: self.trace_id, PARENT_HEADER: self.span_id}
+
+
+def current_span():
+    return getattr(_local, 'span', None)
+
+
+def start_span(name, service, **attrs):
+    """Start a child of the current span (or a new trace when there is none)"""
+    return Span(name, service, **attrs)
+
+
+def span_from_headers(name, service, headers, **attrs):
+    """Continue the trace carried by incoming request headers"""
+    return Span(name, service, trace_id=headers.get(TRACE_HEADER),
+                parent_id=headers.get(PARENT_HEADER), **attrs)
+
+
+def outgoing_headers(headers=None):
+    """Copy of headers with the current span's trace context added"""
+    headers = dict(headers or {})
+    span = current_span()
+    if span is not None:
+        headers.update(span.headers())
+    return headers
+
+
+def format_trace(trace):
+    """Plain-text waterfall of one trace summary"""
+    lines = [f"trace {trace['trace_id']}  {trace['duration_ms']:.1f} ms  ({', '.join(trace['services'])})"]
+    for stage in trace['stages']:
+        lines.append(f"  +{stage['offset_ms']:9.1f} ms  {stage['duration_ms']:9.1f} ms  "
+                     f"{stage['service']}:{stage['name']}")
+    return '\n'.join(lines)
+
+
+def instrument_flask(app, service, collector=None):
+    """Open a span per request, honour incoming trace headers and add /debug/traces"""
+    from flask import Response, g, jsonify, request
+
+    collector = collector or COLLECTOR
+
+    @app.before_request
+    def _trace_start():
+        if ENABLED:
+            rule = request.url_rule
+            route = rule.rule if rule is not None else 'unmatched'
+            span = span_from_headers(f"{request.method} {route}", service, request.headers,
+                                     collector=collector)
+            span.__enter__()
+            g._trace_span = span
+
+    @app.after_request
+    def _trace_header(response):
+        span = g.get('_trace_span')
+        if span is not None:
+            span.attrs['status'] = response.status_code
+            response.headers[TRACE_HEADER] = span.trace_id
+        return response
+
+    @app.teardown_request
+    def _trace_finish(exc):
+        span = g.pop('_trace_span', None)
+        if span is not None:
+            span.__exit__(type(exc) if exc else None, exc, None)
+
+    @app.route('/debug/traces', methods=['GET'])
+    def debug_traces():
+        """Slowest recent traces, stage by stage (?limit=N, ?trace_id=..., ?format=text); admin only"""
+        if not is_admin(request.headers):
+            return admin_error()
+        limit = request.args.get('limit', 10, type=int)
+        trace_id = request.args.get('trace_id')
+        traces = collector.slowest(limit=limit if not trace_id else RING_SIZE)
+        if trace_id:
+            traces = [t for t in traces if t['trace_id'] == trace_id]
+        if request.args.get('format') == 'text':
+            return Response('\n\n'.join(format_trace(t) for t in traces) + '\n', mimetype='text/plain')
+        return jsonify({'service': service, 'count': len(traces), 'traces': traces})
+
+    return app
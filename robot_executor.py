@@ -6,15 +6,22 @@ Simple robot executor server to bridge frontend ASL commands to actual robot exe
 from flask import Flask, request, jsonify
 import subprocess
 import os
+import logging
 import threading
 
+import request_tracing
+from structured_log import log_event, setup_logging
+
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
+request_tracing.instrument_flask(app, service='robot_executor')
 
 # Simple CORS header for local development
 @app.after_request
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Trace-Id,X-Parent-Span-Id')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE')
     return response
 
@@ -27,21 +34,26 @@ def execute_robot():
         data = request.json if request.json else {}
         command = data.get('command', 'pick_up')
         
-        print(f"🤖 Executing robot command: {command}")
+        log_event(logger, '/robot/execute_real', "Executing robot command: %s", command, command=command)
         
         # Use the exact working command with venv activation
         robot_command = "cd ../Cal-Hacks--Hack-for-Impact--2025 && source .venv/bin/activate && python -m lerobot.replay --robot.type=so101_follower --robot.port=/dev/tty.usbmodem5A7A0186141 --robot.id=my_awesome_follower_arm --dataset.repo_id=lerobot/svla_so101_pickplace --dataset.episode=0"
         
         # Execute in background thread to avoid blocking
+        parent = request_tracing.current_span()
+        trace_headers = parent.headers() if parent else {}
+        
         def run_robot():
             try:
-                result = subprocess.run(["bash", "-c", robot_command],
-                                      capture_output=True, text=True, timeout=30)
-                print(f"✅ Robot execution completed: {result.stdout}")
+                with request_tracing.span_from_headers('replay', 'robot_executor', trace_headers, command=command):
+                    result = subprocess.run(["bash", "-c", robot_command],
+                                          capture_output=True, text=True, timeout=30)
+                log_event(logger, '/robot/execute_real', "Robot execution completed", command=command,
+                          returncode=result.returncode, stdout=result.stdout)
                 if result.stderr:
-                    print(f"Robot stderr: {result.stderr}")
+                    logger.warning("Robot stderr: %s", result.stderr)
             except Exception as e:
-                print(f"❌ Robot execution error: {e}")
+                logger.error("Robot execution error: %s", e)
         
         # Start robot execution in background
         robot_thread = threading.Thread(target=run_robot)
@@ -64,5 +76,6 @@ def health():
     return jsonify({"status": "Robot executor ready"})
 
 if __name__ == '__main__':
+    setup_logging('robot_executor')
     print("🤖 Starting Robot Executor Server on port 5002...")
     app.run(host='0.0.0.0', port=5002, debug=True)
\ No newline at end of file
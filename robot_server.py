@@ -4,19 +4,37 @@ Simple Robot Control Server for ASL Integration
 Simulates robot arm commands for Berkeley Cal Hacks 2025 demo
 """
 
+import os
 import json
 import time
 import logging
+import threading
+from collections import deque
 from datetime import datetime
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import live_profiler
+import memory_diagnostics
+import request_tracing
+from audit_log import AuditLog
+from request_tracing import start_span
+from server_metrics import REGISTRY, instrument_flask
+from structured_log import log_event, setup_logging
+
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app, service='robot_server')
+request_tracing.instrument_flask(app, service='robot_server')
+live_profiler.instrument_flask(app)
+memory_diagnostics.instrument_flask(app, tracked={
+    'command_history_entries': lambda: len(command_history)
+})
+
+COMMAND_LATENCY = REGISTRY.histogram('robot_command_duration_seconds',
+                                     'Simulated robot command execution time.', ('command', 'status'))
 
 # Robot state
 robot_state = {
@@ -27,8 +45,24 @@ robot_state = {
     'status': 'ready'
 }
 
-# Command history
-command_history = []
+# Recent commands in memory; the full history is in the audit log
+COMMAND_HISTORY_SIZE = int(os.getenv('COMMAND_HISTORY_SIZE', '100'))
+command_history = deque(maxlen=COMMAND_HISTORY_SIZE)
+# Opened by init_storage() on the first request (or at startup), so importing this module touches no files.
+audit = None
+_storage_lock = threading.Lock()
+
+def init_storage():
+    """Open the command audit log (once)"""
+    global audit
+    with _storage_lock:
+        if audit is None:
+            audit = AuditLog(os.getenv('ROBOT_AUDIT_DIR', 'logs/robot_audit'), name='robot_server')
+
+@app.before_request
+def _ensure_storage():
+    if audit is None:
+        init_storage()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -49,7 +83,8 @@ def execute_command():
         source = data.get('source', 'unknown')
         timestamp = data.get('timestamp', time.time())
         
-        logger.info(f"Robot command: {command} from {source}")
+        log_event(logger, '/command', "Robot command: %s from %s", command, source,
+                  command=command, source=source)
         
         # Validate command
         valid_commands = ['pick_up', 'deliver', 'stop', 'home']
@@ -64,16 +99,20 @@ def execute_command():
             'datetime': datetime.fromtimestamp(timestamp).isoformat()
         }
         command_history.append(command_entry)
+        audit.append(command_entry)
         
         # Execute command (simulated)
-        result = simulate_robot_command(command)
+        command_start = time.perf_counter()
+        with start_span('execute', 'robot_server', command=command):
+            result = simulate_robot_command(command)
+        COMMAND_LATENCY.labels(command, result['status']).observe(time.perf_counter() - command_start)
         
         # Update robot state
         robot_state['last_command'] = command
         robot_state['last_command_time'] = timestamp
         robot_state['status'] = result['status']
         
-        logger.info(f"Command executed: {result}")
+        log_event(logger, '/command', "Command executed: %s", command, command=command, status=result['status'])
         
         return jsonify({
             'success': True,
@@ -84,7 +123,7 @@ def execute_command():
         })
         
     except Exception as e:
-        logger.error(f"Command execution error: {str(e)}")
+        logger.error("Command execution error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/status', methods=['GET'])
@@ -92,16 +131,19 @@ def get_status():
     """Get robot status"""
     return jsonify({
         'robot_state': robot_state,
-        'command_count': len(command_history),
-        'recent_commands': command_history[-5:]  # Last 5 commands
+        'command_count': audit.count,
+        'recent_commands': list(command_history)[-5:]  # Last 5 commands
     })
 
 @app.route('/history', methods=['GET'])
 def get_history():
-    """Get command history"""
+    """Get command history from the audit log (?since=&until= unix seconds, ?limit=N)"""
+    since = request.args.get('since', type=float)
+    until = request.args.get('until', type=float)
+    limit = min(request.args.get('limit', 100, type=int), 10000)
     return jsonify({
-        'total_commands': len(command_history),
-        'commands': command_history
+        'total_commands': audit.count,
+        'commands': audit.query(since, until, limit)
     })
 
 def simulate_robot_command(command):
@@ -171,7 +213,10 @@ def simulate_robot_command(command):
     }
 
 if __name__ == '__main__':
+    # JSON lines written off the request thread
+    setup_logging('robot_server')
     logger.info("Starting Robot Control Server for Berkeley Cal Hacks 2025")
     logger.info("Simulating robot arm for ASL integration demo")
+    init_storage()
     
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+SQLite index over logged training samples
+Rows and per-sign counters are added once per ingest batch (WAL mode, so
+readers never block the writer). The index is derived from samples.jsonl:
+it remembers how far into the log it has indexed and catches up on startup,
+so it can be deleted and rebuilt at any time.
+
+    SAMPLE_INDEX_PATH=training_data/logged_frames/samples.db
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY,
+    sign TEXT NOT NULL,
+    session_id TEXT,
+    timestamp REAL,
+    logged_at REAL NOT NULL,
+    frame TEXT NOT NULL,
+    ext TEXT,
+    bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS samples_sign ON samples (sign, id);
+CREATE INDEX IF NOT EXISTS samples_session ON samples (session_id, id);
+CREATE INDEX IF NOT EXISTS samples_logged_at ON samples (logged_at);
+CREATE TABLE IF NOT EXISTS sign_counts (
+    sign TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    first_logged_at REAL,
+    last_logged_at REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+# Fields add_batch needs; log lines without them are skipped
+_REQUIRED = {'sign', 'logged_at', 'frame'}
+
+_COLUMNS = ('id', 'sign', 'session_id', 'timestamp', 'logged_at', 'frame', 'ext', 'bytes')
+
+
+def _epoch(logged_at):
+    """logged_at may be unix seconds or an ISO string (as written by log_sign)"""
+    if isinstance(logged_at, (int, float)):
+        return float(logged_at)
+    return datetime.fromisoformat(logged_at).timestamp()
+
+
+class SampleIndex:
+    """Queryable sample rows plus per-sign counters, one connection per thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.skipped_lines = 0
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL makes NORMAL durable enough: the log is the source of truth anyway
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # Writing ------------------------------------------------------------
+
+    def indexed_offset(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'log_offset'").fetchone()
+        return row[0] if row else 0
+
+    def add_batch(self, samples, log_offset=None):
+        """Insert one batch and bump counters in a single transaction"""
+        rows = [(sample['sign'], sample.get('session_id'), sample.get('timestamp'), _epoch(sample['logged_at']),
+                 sample['frame'], sample.get('ext'), sample.get('bytes')) for sample in samples]
+        counts = Counter(row[0] for row in rows)
+        first, last = {}, {}
+        for row in rows:
+            first.setdefault(row[0], row[3])
+            last[row[0]] = row[3]
+
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.executemany('INSERT INTO samples (sign, session_id, timestamp, logged_at, frame, ext, bytes) '
+                                 'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                conn.executemany(
+                    'INSERT INTO sign_counts (sign, count, first_logged_at, last_logged_at) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(sign) DO UPDATE SET count = count + excluded.count, '
+                    'last_logged_at = excluded.last_logged_at',
+                    [(sign, count, first[sign], last[sign]) for sign, count in counts.items()])
+                if log_offset is not None:
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('log_offset', ?)", (log_offset,))
+
+    def catch_up(self, samples_path, batch_size=5000, quiet=False):
+        """Index records appended to samples.jsonl since the last indexed offset
+
+        The offset only moves with committed rows, so a batch whose insert failed is re-read on the next call.
+        """
+        if not os.path.exists(samples_path):
+            return 0
+        offset = self.indexed_offset()
+        if offset > os.path.getsize(samples_path):
+            logger.warning("⚠️ Sample index is ahead of %s - rebuilding", samples_path)
+            self.clear()
+            offset = 0
+        added = skipped = 0
+        batch = []
+        with open(samples_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict) or not _REQUIRED.issubset(record):
+                    skipped += 1
+                    continue
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self.add_batch(batch, offset)
+                    added += len(batch)
+                    batch = []
+        if batch or skipped:
+            # Also records the offset past trailing undecodable lines, so they are not re-read
+            self.add_batch(batch, offset)
+            added += len(batch)
+        self.skipped_lines += skipped
+        if skipped:
+            logger.warning("⚠️ Skipped %d undecodable lines in %s", skipped, samples_path)
+        if added:
+            logger.log(logging.DEBUG if quiet else logging.INFO, "📇 Indexed %d training samples from %s",
+                       added, samples_path)
+        return added
+
+    def clear(self):
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute('DELETE FROM samples')
+                conn.execute('DELETE FROM sign_counts')
+                conn.execute('DELETE FROM meta')
+
+    # Queries ------------------------------------------------------------
+
+    def total(self):
+        return self._conn().execute('SELECT COALESCE(SUM(count), 0) FROM sign_counts').fetchone()[0]
+
+    def sign_counts(self):
+        rows = self._conn().execute('SELECT sign, count FROM sign_counts ORDER BY count DESC, sign').fetchall()
+        return {row['sign']: row['count'] for row in rows}
+
+    def query(self, sign=None, session_id=None, since=None, until=None, limit=50, before_id=None):
+        """Newest-first page of samples; pass the returned next_cursor as before_id for the next page"""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses, params = [], []
+        for clause, value in (('sign = ?', sign), ('session_id = ?', session_id), ('logged_at >= ?', since),
+                              ('logged_at <= ?', until), ('id < ?', before_id)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._conn().execute(f"SELECT {', '.join(_COLUMNS)} FROM samples {where} ORDER BY id DESC LIMIT ?",
+                                    params + [limit + 1]).fetchall()
+        samples = [dict(row) for row in rows[:limit]]
+        next_cursor = samples[-1]['id'] if len(rows) > limit else None
+        return samples, next_cursor
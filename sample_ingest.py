@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Asynchronous ingestion of training samples for /ml/log_sign
+Request threads validate and enqueue; one writer thread drains the bounded
+queue in batches, stores the frames, appends all metadata with one write and
+one fsync per batch, then hands the batch to listeners (counters, indexes).
+When the queue is full samples are shed and counted instead of blocking.
+
+    INGEST_QUEUE_SIZE=5000
+    INGEST_BATCH_SIZE=256
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+
+from server_metrics import REGISTRY, LATENCY_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '5000'))
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '256'))
+
+QUEUE_DEPTH = REGISTRY.gauge('ingest_queue_depth', 'Training samples waiting to be written.')
+SHED = REGISTRY.counter('ingest_shed_total', 'Training samples rejected because the ingest queue was full.')
+WRITTEN = REGISTRY.counter('ingest_samples_written_total', 'Training samples written to the frame store.')
+BATCH_SIZE = REGISTRY.histogram('ingest_batch_samples', 'Samples per ingest batch.',
+                                buckets=(1, 4, 16, 64, 256, 1024))
+BATCH_LATENCY = REGISTRY.histogram('ingest_batch_duration_seconds', 'Time to write one ingest batch.',
+                                   buckets=LATENCY_BUCKETS)
+
+
+class SampleIngestor:
+    """Bounded queue plus a batch writer thread in front of a FrameStore"""
+
+    def __init__(self, store, maxsize=INGEST_QUEUE_SIZE, batch_size=INGEST_BATCH_SIZE):
+        self.store = store
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.listeners = []
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._writer = threading.Thread(target=self._run, name='sample-ingest', daemon=True)
+        self._writer.start()
+
+    def add_listener(self, listener):
+        """listener(samples, stored_flags) is called on the writer thread after each durable batch"""
+        self.listeners.append(listener)
+
+    def submit(self, sample, frame, extension='jpg'):
+        """Queue a sample (metadata dict without 'frame'); False if the queue is full"""
+        with self._idle:
+            self._in_flight += 1
+        try:
+            self.queue.put_nowait((sample, frame, extension))
+        except queue.Full:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+            SHED.inc()
+            return False
+        QUEUE_DEPTH.set(self.queue.qsize())
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            QUEUE_DEPTH.set(self.queue.qsize())
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error("❌ Failed to write %d training samples: %s", len(batch), e)
+            with self._idle:
+                self._in_flight -= len(batch)
+                self._idle.notify_all()
+
+    def _write_batch(self, batch):
+        start = time.perf_counter()
+        samples, stored_flags = [], []
+        for sample, frame, extension in batch:
+            digest, stored = self.store.put_frame(frame, extension)
+            samples.append(dict(sample, frame=digest, ext=extension, bytes=len(frame)))
+            stored_flags.append(stored)
+        # One sync for the batch's new frames, then one for the metadata: no record points at a lost frame
+        self.store.sync_objects([(sample['frame'], sample['ext'])
+                                 for sample, stored in zip(samples, stored_flags) if stored])
+        self.store.append_samples(samples, fsync=True)
+        WRITTEN.inc(len(samples))
+        BATCH_SIZE.observe(len(samples))
+        BATCH_LATENCY.observe(time.perf_counter() - start)
+        for listener in self.listeners:
+            try:
+                listener(samples, stored_flags)
+            except Exception as e:
+                logger.error("❌ Ingest listener %s failed: %s", getattr(listener, '__name__', listener), e)
+
+    def flush(self, timeout=None):
+        """Wait until every submitted sample has been written; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout=10):
+        if not self.flush(timeout):
+            logger.warning("⚠️ %d training samples still queued at shutdown", self.queue.qsize())
+
+
+def start_ingestor(store, **kwargs):
+    """Create an ingestor that drains its queue at interpreter exit"""
+    ingestor = SampleIngestor(store, **kwargs)
+    atexit.register(ingestor.close)
+    return ingestor
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the ASL Command Center servers
+Prometheus text-format counters, gauges and histograms with no external service
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+
+# Metrics can be switched off at runtime (used by the overhead benchmark)
+ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+
+# Default buckets (seconds) - tuned for sub-millisecond matching up to slow llama calls
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def set_enabled(enabled):
+    """Turn metric collection on or off for this process"""
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _CounterChild:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        if ENABLED:
+            with self._lock:
+                self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount=1, force=False):
+        """force=True applies even while disabled, to pair with an inc() made while enabled"""
+        if ENABLED or force:
+            with self._lock:
+                self.value -= amount
+
+    def set(self, value):
+        if ENABLED:
+            with self._lock:
+                self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ('_lock', '_bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        if not ENABLED:
+            return
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class _Metric:
+    """A metric family; label values are passed positionally to labels()"""
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self):
+        return list(self._children.items())
+
+    def get(self, *values):
+        """Current value of a counter/gauge series"""
+        return self.labels(*values).value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, child in sorted(self.samples()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}')
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+    def set(self, value):
+        self._default.set(value)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, child in sorted(self.samples()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}')
+            label_str = _format_labels(self.labelnames, values)
+            lines.append(f'{self.name}_sum{label_str} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_str} {count}')
+        return lines
+
+
+class Registry:
+    """Holds metric families; creating a metric twice returns the existing one"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Render every metric in Prometheus text exposition format"""
+        lines = _process_metrics()
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+_PROCESS_START = time.time()
+
+
+def _process_metrics():
+    """Standard process_* metrics read from the OS at scrape time"""
+    lines = []
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        lines += ['# HELP process_cpu_seconds_total Total user and system CPU time spent in seconds.',
+                  '# TYPE process_cpu_seconds_total counter',
+                  f'process_cpu_seconds_total {usage.ru_utime + usage.ru_stime:.6f}']
+    except ImportError:
+        pass
+
+    rss = resident_memory_bytes()
+    if rss is not None:
+        lines += ['# HELP process_resident_memory_bytes Resident memory size in bytes.',
+                  '# TYPE process_resident_memory_bytes gauge',
+                  f'process_resident_memory_bytes {rss}']
+
+    lines += ['# HELP process_start_time_seconds Start time of the process since unix epoch in seconds.',
+              '# TYPE process_start_time_seconds gauge',
+              f'process_start_time_seconds {_PROCESS_START:.3f}',
+              '# HELP process_threads Number of live Python threads.',
+              '# TYPE process_threads gauge',
+              f'process_threads {threading.active_count()}']
+    return lines
+
+
+def resident_memory_bytes():
+    """Current RSS in bytes (None if the platform does not expose it)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux reports kilobytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return None
+
+
+def record_cache(cache, hit, registry=REGISTRY):
+    """Count a cache lookup; hit ratio = hits / (hits + misses)"""
+    registry.counter('cache_requests_total', 'Cache lookups by cache name and result.',
+                     ('cache', 'result')).labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def instrument_flask(app, registry=REGISTRY, service=None):
+    """Add per-route latency histograms, in-flight gauges and a /metrics endpoint to a Flask app"""
+    from flask import Response, g, request
+
+    service = service or app.name
+    durations = registry.histogram('http_request_duration_seconds',
+                                   'HTTP request latency by route.',
+                                   ('service', 'method', 'route', 'status'))
+    in_flight = registry.gauge('http_requests_in_flight',
+                               'HTTP requests currently being handled.',
+                               ('service', 'route'))
+
+    @app.before_request
+    def _metrics_start():
+        if ENABLED:
+            rule = request.url_rule
+            route = rule.rule if rule is not None else 'unmatched'
+            g._metrics = (time.perf_counter(), route)
+            in_flight.labels(service, route).inc()
+
+    @app.after_request
+    def _metrics_observe(response):
+        started = g.pop('_metrics', None)
+        if started is not None:
+            start, route = started
+            durations.labels(service, request.method, route, str(response.status_code)).observe(
+                time.perf_counter() - start)
+            # The inc happened, so the dec must too - even if metrics were switched off meanwhile
+            in_flight.labels(service, route).dec(force=True)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # after_request is skipped on unhandled errors - keep the gauge honest
+        started = g.pop('_metrics', None)
+        if started is not None:
+            in_flight.labels(service, started[1]).dec(force=True)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus scrape endpoint"""
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    return app
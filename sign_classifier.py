@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+CPU-only sign classifier: HOG-style + pooled-patch features, softmax regression
+Frames from training_data/asl_signs/<class>/*.jpg are decoded to grayscale,
+downsampled in batches with NumPy and turned into fixed-size features
+(8x8 cells x 9 orientation bins plus an 8x8 intensity grid). A multinomial
+logistic regression is trained with full-batch gradient descent. Feature
+standardization is folded into the weights, which are saved as one float16
+.npy (memory-mapped at load) with a JSON sidecar for classes and settings.
+
+    python3 sign_classifier.py train            # -> models/sign_classifier.npy + .json
+    python3 sign_classifier.py predict frame.jpg
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError as e:
+    Image = None
+    logger.warning(f"Pillow unavailable ({e}) - sign classifier can only use pre-decoded frames")
+
+ASL_SIGNS_DIR = os.path.join('training_data', 'asl_signs')
+MODEL_PATH = os.path.join('models', 'sign_classifier.npy')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+LOAD_SIZE = 128      # frames are decoded to LOAD_SIZE x LOAD_SIZE grayscale
+IMAGE_SIZE = 64      # ... then mean-pooled down to IMAGE_SIZE in NumPy
+CELL_SIZE = 8        # HOG cell size in pixels
+ORIENTATIONS = 9     # unsigned gradient orientation bins
+POOL_GRID = 8        # pooled-patch intensity grid
+FEATURE_DIM = (IMAGE_SIZE // CELL_SIZE) ** 2 * ORIENTATIONS + POOL_GRID ** 2
+FORMAT_VERSION = 1
+
+
+def sidecar_path(model_path):
+    return os.path.splitext(model_path)[0] + '.json'
+
+
+def load_frame(source):
+    """Path, bytes or file object -> LOAD_SIZE x LOAD_SIZE uint8 grayscale array"""
+    if Image is None:
+        raise RuntimeError('Pillow is required to decode frames')
+    image = Image.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    # JPEG draft mode decodes at reduced scale straight from the DCT - much cheaper than a full decode
+    image.draft('L', (LOAD_SIZE, LOAD_SIZE))
+    image = image.convert('L').resize((LOAD_SIZE, LOAD_SIZE), Image.BILINEAR)
+    return np.asarray(image, dtype=np.uint8)
+
+
+def downsample(frames):
+    """(N, H, W) uint8 -> (N, IMAGE_SIZE, IMAGE_SIZE) float32 in [0, 1] by block averaging"""
+    frames = np.asarray(frames)
+    n, height, width = frames.shape
+    fy, fx = height // IMAGE_SIZE, width // IMAGE_SIZE
+    if fy < 1 or fx < 1:
+        raise ValueError(f"Frames must be at least {IMAGE_SIZE}x{IMAGE_SIZE}")
+    frames = frames[:, :fy * IMAGE_SIZE, :fx * IMAGE_SIZE].astype(np.float32)
+    return frames.reshape(n, IMAGE_SIZE, fy, IMAGE_SIZE, fx).mean(axis=(2, 4)) / 255.0
+
+
+def extract_features(frames):
+    """(N, H, W) grayscale frames -> (N, FEATURE_DIM) float32, all images at once"""
+    images = downsample(frames)
+    n = len(images)
+
+    # Central-difference gradients, unsigned orientation binned into ORIENTATIONS
+    gx = np.zeros_like(images)
+    gy = np.zeros_like(images)
+    gx[:, :, 1:-1] = images[:, :, 2:] - images[:, :, :-2]
+    gy[:, 1:-1, :] = images[:, 2:, :] - images[:, :-2, :]
+    magnitude = np.hypot(gx, gy)
+    orientation = np.arctan2(gy, gx) % np.pi
+    bins = np.minimum((orientation * (ORIENTATIONS / np.pi)).astype(np.int64), ORIENTATIONS - 1)
+
+    # One bincount builds every cell histogram of every image
+    cells = IMAGE_SIZE // CELL_SIZE
+    cell_index = (np.arange(IMAGE_SIZE) // CELL_SIZE)
+    cell_id = cell_index[:, None] * cells + cell_index[None, :]
+    flat = (np.arange(n)[:, None, None] * cells * cells + cell_id) * ORIENTATIONS + bins
+    hog = np.bincount(flat.ravel(), weights=magnitude.ravel(), minlength=n * cells * cells * ORIENTATIONS)
+    hog = np.sqrt(hog.reshape(n, -1))
+    hog /= np.linalg.norm(hog, axis=1, keepdims=True) + 1e-6
+
+    # Coarse intensity layout, normalized per image for lighting
+    step = IMAGE_SIZE // POOL_GRID
+    pooled = images.reshape(n, POOL_GRID, step, POOL_GRID, step).mean(axis=(2, 4)).reshape(n, -1)
+    pooled -= pooled.mean(axis=1, keepdims=True)
+    pooled /= pooled.std(axis=1, keepdims=True) + 1e-6
+
+    return np.concatenate([hog, pooled / np.sqrt(POOL_GRID ** 2)], axis=1).astype(np.float32)
+
+
+def list_dataset(signs_dir=ASL_SIGNS_DIR):
+    """(paths, class indices, class names) from signs_dir/<class>/*.jpg"""
+    classes = sorted(entry.name for entry in os.scandir(signs_dir) if entry.is_dir()) \
+        if os.path.isdir(signs_dir) else []
+    paths, labels = [], []
+    for label, name in enumerate(classes):
+        for filename in sorted(os.listdir(os.path.join(signs_dir, name))):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(signs_dir, name, filename))
+                labels.append(label)
+    return paths, np.array(labels, dtype=np.int64), classes
+
+
+def featurize_paths(paths, batch_size=256, workers=0):
+    """Decode and featurize image files in batches (bounded memory); workers > 0 runs batches on threads"""
+    features = np.empty((len(paths), FEATURE_DIM), dtype=np.float32)
+    starts = range(0, len(paths), batch_size)
+
+    def featurize(start):
+        batch = paths[start:start + batch_size]
+        features[start:start + len(batch)] = extract_features(np.stack([load_frame(path) for path in batch]))
+
+    if workers > 0:
+        # PIL decoding and the NumPy feature math release the GIL
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(featurize, starts))
+    else:
+        for start in starts:
+            featurize(start)
+    return features
+
+
+def featurize_shards(shards, batch_size=256):
+    """Features for every frame of an image_shards.ImageShards packed at LOAD_SIZE grayscale"""
+    if tuple(shards.index['frame_shape']) != (LOAD_SIZE, LOAD_SIZE):
+        raise ValueError(f"Shards hold {shards.index['frame_shape']} frames, need {LOAD_SIZE}x{LOAD_SIZE} grayscale")
+    features = np.empty((len(shards), FEATURE_DIM), dtype=np.float32)
+    start = 0
+    for frames, _ in shards.iter_batches(batch_size):
+        features[start:start + len(frames)] = extract_features(frames)
+        start += len(frames)
+    return features
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+def fit_softmax(features, labels, num_classes, iterations=300, l2=1e-3):
+    """Multinomial logistic regression by full-batch gradient descent with Nesterov momentum.
+
+    Returns (weights, bias, mean, scale) for standardized features.
+    """
+    mean = features.mean(axis=0)
+    # Floored so near-constant features cannot blow up the folded float16 weights
+    scale = np.maximum(features.std(axis=0), 1e-3)
+    x = (features - mean) / scale
+    n, dim = x.shape
+    onehot = np.zeros((n, num_classes), dtype=np.float32)
+    onehot[np.arange(n), labels] = 1.0
+    # Step size from the Lipschitz bound of the softmax loss gradient
+    lipschitz = 0.5 * np.linalg.norm(x, 2) ** 2 / n + l2
+    step = 1.0 / lipschitz
+
+    weights = np.zeros((dim, num_classes), dtype=np.float32)
+    bias = np.zeros(num_classes, dtype=np.float32)
+    velocity_w, velocity_b = np.zeros_like(weights), np.zeros_like(bias)
+    for _ in range(iterations):
+        look_w, look_b = weights + 0.9 * velocity_w, bias + 0.9 * velocity_b
+        error = (_softmax(x @ look_w + look_b) - onehot) / n
+        grad_w = x.T @ error + l2 * look_w
+        grad_b = error.sum(axis=0)
+        velocity_w = 0.9 * velocity_w - step * grad_w
+        velocity_b = 0.9 * velocity_b - step * grad_b
+        weights += velocity_w
+        bias += velocity_b
+    return weights, bias, mean, scale
+
+
+def split_holdout(labels, fraction=0.2, seed=0):
+    """Per-class random split; classes with fewer than 5 frames stay entirely in training"""
+    rng = np.random.default_rng(seed)
+    train, holdout = [], []
+    for label in np.unique(labels):
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        cut = int(len(rows) * fraction) if len(rows) >= 5 else 0
+        holdout.extend(rows[:cut])
+        train.extend(rows[cut:])
+    return np.sort(np.array(train, dtype=np.int64)), np.sort(np.array(holdout, dtype=np.int64))
+
+
+def fold_weights(weights, bias, mean, scale):
+    """Fold standardization into one (FEATURE_DIM + 1, classes) float16 matrix (last row = bias)"""
+    folded = weights / scale[:, None]
+    folded_bias = bias - (mean / scale) @ weights
+    return np.vstack([folded, folded_bias[None, :]]).astype(np.float16)
+
+
+def _logits(matrix, features):
+    return np.matmul(features, matrix[:-1], dtype=np.float32) + matrix[-1].astype(np.float32)
+
+
+def save_model(model_path, matrix, classes, metrics=None):
+    """Write the float16 weight matrix plus a JSON sidecar with classes and feature settings"""
+    os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+    tmp_path = f"{model_path}.tmp.npy"
+    np.save(tmp_path, matrix)
+    os.replace(tmp_path, model_path)
+    sidecar = {
+        'model_type': 'softmax_hog',
+        'format_version': FORMAT_VERSION,
+        'classes': list(classes),
+        'feature_dim': FEATURE_DIM,
+        'load_size': LOAD_SIZE,
+        'image_size': IMAGE_SIZE,
+        'cell_size': CELL_SIZE,
+        'orientations': ORIENTATIONS,
+        'pool_grid': POOL_GRID,
+        'weights_dtype': str(matrix.dtype),
+        'weights_bytes': os.path.getsize(model_path),
+        'training_date': datetime.now().isoformat(),
+        'metrics': metrics or {},
+    }
+    tmp_path = f"{sidecar_path(model_path)}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(sidecar, f, indent=2)
+    os.replace(tmp_path, sidecar_path(model_path))
+    return sidecar
+
+
+def train(signs_dir=ASL_SIGNS_DIR, model_path=MODEL_PATH, iterations=300, shards_dir=None, dedup_threshold=None,
+          batch_size=256, workers=0):
+    """Train on signs_dir/<class>/ frames and save the model; returns the sidecar, or None without data
+
+    With shards_dir the frames are packed there once (image_shards) and later runs read the
+    packed frames instead of decoding every JPEG again. With dedup_threshold, near-duplicate
+    frames (frame_dedup) are dropped before the holdout split, so copies of one pose cannot
+    land on both sides of it. batch_size and workers set how frames are decoded and featurized
+    (training_autotune measures them per host).
+    """
+    paths, labels, classes = list_dataset(signs_dir)
+    if len(classes) < 2:
+        logger.warning(f"⚠️ Need frames for at least 2 classes in {signs_dir}/<class>/ to train the classifier")
+        return None
+    start = time.perf_counter()
+    if shards_dir:
+        import image_shards
+        image_shards.pack(signs_dir, shards_dir, size=LOAD_SIZE, mode='L')
+        shards = image_shards.ImageShards(shards_dir)
+        features = featurize_shards(shards, batch_size)
+    else:
+        features = featurize_paths(paths, batch_size, workers)
+    feature_seconds = time.perf_counter() - start
+
+    duplicates = {}
+    if dedup_threshold is not None:
+        import frame_dedup
+        hashes = frame_dedup.hash_shards(shards) if shards_dir else frame_dedup.hash_paths(paths)
+        keep, _, dedup_stats = frame_dedup.dedup(hashes, labels, dedup_threshold)
+        duplicates = {name: counts['removed'] for name, counts in frame_dedup.class_report(labels, keep, classes).items()
+                      if counts['removed']}
+        logger.info(f"🔍 Dropped {dedup_stats['removed']} near-duplicate frames of {len(paths)}")
+        features, labels = features[keep], labels[keep]
+
+    train_rows, holdout_rows = split_holdout(labels)
+    start = time.perf_counter()
+    matrix = fold_weights(*fit_softmax(features[train_rows], labels[train_rows], len(classes), iterations))
+    fit_seconds = time.perf_counter() - start
+
+    # Scored with the float16 weights, i.e. exactly what inference will use
+    def accuracy(rows):
+        return round(float((_logits(matrix, features[rows]).argmax(axis=1) == labels[rows]).mean()), 4)
+
+    metrics = {'frames': len(paths), 'train_frames': len(train_rows), 'holdout_frames': len(holdout_rows),
+               'feature_seconds': round(feature_seconds, 3), 'fit_seconds': round(fit_seconds, 3),
+               'train_accuracy': accuracy(train_rows)}
+    if dedup_threshold is not None:
+        metrics['duplicates_removed'] = sum(duplicates.values())
+        metrics['duplicates_by_class'] = duplicates
+    if len(holdout_rows):
+        metrics['holdout_accuracy'] = accuracy(holdout_rows)
+    sidecar = save_model(model_path, matrix, classes, metrics)
+    logger.info(f"✅ Sign classifier trained on {len(paths)} frames / {len(classes)} classes: {metrics}")
+    return sidecar
+
+
+class SignClassifier:
+    """Inference with a saved model: one matmul over memory-mapped float16 weights"""
+
+    def __init__(self, model_path=MODEL_PATH):
+        with open(sidecar_path(model_path)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('feature_dim') != FEATURE_DIM or self.meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"{model_path} was trained with different feature settings - retrain it")
+        self.classes = self.meta['classes']
+        self.matrix = np.load(model_path, mmap_mode='r')
+
+    def scores(self, features):
+        """(N, FEATURE_DIM) -> (N, classes) probabilities"""
+        return _softmax(_logits(self.matrix, features))
+
+    def predict(self, features):
+        return _logits(self.matrix, features).argmax(axis=1)
+
+    def classify_frames(self, frames):
+        """(N, H, W) grayscale frames -> [(sign, confidence)]"""
+        probabilities = self.scores(extract_features(frames))
+        best = probabilities.argmax(axis=1)
+        return [(self.classes[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    def classify(self, image):
+        """One image (path, encoded bytes or file object) -> (sign, confidence)"""
+        return self.classify_frames(load_frame(image)[None])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('train', 'predict'))
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--signs-dir', default=ASL_SIGNS_DIR)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--dedup', type=int, metavar='BITS', help='drop near-duplicate frames within BITS of 64')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.command == 'train':
+        sidecar = train(args.signs_dir, args.model, args.iterations, dedup_threshold=args.dedup)
+        if sidecar is None:
+            return False
+        print(f"💾 {args.model}: {sidecar['weights_bytes'] / 1024:.0f}KB, {len(sidecar['classes'])} classes, "
+              f"holdout accuracy {sidecar['metrics'].get('holdout_accuracy', 'n/a')}")
+        return True
+    classifier = SignClassifier(args.model)
+    for path in args.images:
+        sign, confidence = classifier.classify(path)
+        print(f"🤟 {path}: {sign} ({confidence:.2f})")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
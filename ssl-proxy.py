@@ -13,8 +13,14 @@ import urllib.parse
 import urllib.error
 import json
 import sys
+import logging
 from socketserver import ThreadingMixIn
 
+from request_tracing import TRACE_HEADER, PARENT_HEADER, span_from_headers
+from structured_log import log_event, setup_logging
+
+logger = logging.getLogger('ssl_proxy')
+
 class SSLProxyHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
         self.proxy_request()
@@ -26,15 +32,16 @@ class SSLProxyHandler(http.server.BaseHTTPRequestHandler):
         self.proxy_request()
     
     def proxy_request(self):
+        # Build target URL for AI server
+        target_url = f"http://localhost:8080{self.path}"  # Ensure correct AI server port
+        span = span_from_headers('proxy', 'ssl_proxy', self.headers, target=target_url)
         try:
-            # Build target URL for AI server
-            target_url = f"http://localhost:8080{self.path}"  # Ensure correct AI server port
-            
-            # Prepare headers
+            # Prepare headers (trace context is replaced with this hop's span)
             headers = {}
             for header, value in self.headers.items():
-                if header.lower() not in ['host', 'connection']:
+                if header.lower() not in ['host', 'connection', TRACE_HEADER.lower(), PARENT_HEADER.lower()]:
                     headers[header] = value
+            headers.update(span.headers())
             
             # Handle request body for POST
             content_length = int(self.headers.get('Content-Length', 0))
@@ -48,31 +55,38 @@ class SSLProxyHandler(http.server.BaseHTTPRequestHandler):
             # Make request to backend
             with urllib.request.urlopen(req, timeout=30) as response:
                 # Send response status
+                span.attrs['status'] = response.getcode()
                 self.send_response(response.getcode())
                 
                 # Forward headers
                 for header, value in response.headers.items():
-                    if header.lower() not in ['connection', 'transfer-encoding']:
+                    if header.lower() not in ['connection', 'transfer-encoding', TRACE_HEADER.lower()]:
                         self.send_header(header, value)
+                self.send_header(TRACE_HEADER, span.trace_id)
                 
                 # Add CORS headers
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Trace-Id, X-Parent-Span-Id')
+                self.send_header('Access-Control-Expose-Headers', 'X-Trace-Id')
                 self.end_headers()
                 
                 # Forward response body
                 self.wfile.write(response.read())
                 
         except urllib.error.URLError as e:
+            span.attrs['status'] = 502
             self.send_error(502, f"Backend server error: {e}")
         except Exception as e:
+            span.attrs['status'] = 500
             self.send_error(500, f"Proxy error: {e}")
+        finally:
+            span.finish()
     
     def log_message(self, format, *args):
         # Suppress logs unless verbose
         if '--verbose' in sys.argv:
-            super().log_message(format, *args)
+            log_event(logger, 'access', "%s - " + format, self.address_string(), *args)
 
 class ThreadedHTTPServer(ThreadingMixIn, http.server.HTTPServer):
     daemon_threads = True
@@ -83,6 +97,7 @@ def main():
     backend_port = 8080
     cert_file = 'server.crt'
     key_file = 'server.key'
+    setup_logging('ssl_proxy')
     
     print(f"🔐 Starting SSL proxy on port {ssl_port}")
     print(f"   Forwarding to HTTP backend on port {backend_port}")
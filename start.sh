@@ -28,22 +28,6 @@ mkdir -p models/SmolVLM
 mkdir -p training_data/asl_signs
 mkdir -p training_data/annotations
 
-# Auto-train model if needed
-echo "🎓 Checking for trained ASL model..."
-if [ ! -f "models/asl_patterns.json" ] && [ ! -d "models/smolvlm_asl" ]; then
-    echo "🚀 No model found - triggering auto-training..."
-    cd ml_training
-    if $PYTHON_CMD train_asl_model.py; then
-        echo "✅ Auto-training completed successfully!"
-        cd ..
-    else
-        echo "⚠️  Auto-training failed - system will use default patterns"
-        cd ..
-    fi
-else
-    echo "✅ Trained model found - skipping auto-training"
-fi
-
 # Kill any existing processes first (be specific about llama-server path)
 echo "🧹 Cleaning up any existing processes..."
 pkill -f "python.*asl_server" 2>/dev/null || true
@@ -96,6 +80,11 @@ else
     $PYTHON_CMD -m pip install flask flask-cors requests python-dotenv
 fi
 
+# Retrain in the background only if the annotations or training code changed since the model was built;
+# the servers below start on the current model either way
+echo "🎓 Checking ASL model training status..."
+$PYTHON_CMD auto_train.py || echo "⚠️  Auto-training check failed - system will use the current model"
+
 # Check for Node.js (needed for Gun.js relay)
 if ! command -v node &> /dev/null; then
     echo "❌ Node.js not found. Installing Node.js for data persistence..."
@@ -199,21 +188,6 @@ download_model() {
 
 if [ "$AI_SERVER" = true ]; then
     download_model
-    
-    # Auto-train ASL model if no training exists
-    echo "🎓 Checking ASL model training status..."
-    if [ ! -d "ml_training/asl_model_checkpoints" ] || [ ! -f "ml_training/asl_model_checkpoints/baseline_model.json" ]; then
-        echo "🚀 First boot detected - setting up ASL recognition training..."
-        cd ml_training
-        if $PYTHON_CMD train_asl_model.py; then
-            echo "✅ ASL baseline model created successfully!"
-        else
-            echo "⚠️  ASL training setup had issues, but system will still work"
-        fi
-        cd ..
-    else
-        echo "✅ ASL model training already exists"
-    fi
 fi
 
 # Find available ports
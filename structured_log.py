@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Off-thread structured logging for the ASL Command Center servers
+Log calls merge the message args and snapshot any traceback, then enqueue the
+record; a background writer thread formats JSON lines and writes them in batches. Per-route sampling drops chatty
+hot-path records early, and a bounded queue drops (and counts) records instead
+of blocking request threads.
+
+    LOG_SAMPLE_RATES="/v1/chat/completions=0.1,/ml/log_sign=0.5"
+    LOG_QUEUE_SIZE=10000
+    LOG_FILE=asl-server.jsonl      # default: stderr
+"""
+
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+
+from server_metrics import REGISTRY
+
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_FILE = os.getenv('LOG_FILE')
+LOG_BATCH_SIZE = 256
+
+DROPPED = REGISTRY.counter('log_records_dropped_total', 'Log records dropped because the log queue was full.')
+SAMPLED_OUT = REGISTRY.counter('log_records_sampled_total', 'Log records skipped by per-route sampling.',
+                               ('route',))
+
+_EXC_FORMATTER = logging.Formatter()
+_RESERVED = set(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
+
+def parse_sample_rates(spec):
+    """'route=rate,route=rate' -> {route: rate}"""
+    rates = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            route, rate = item.rsplit('=', 1)
+            rates[route.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line; runs on the writer thread"""
+
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'service': self.service,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = value
+        fields = entry.pop('fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        elif record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RouteSampler:
+    """Keep a fraction of INFO/DEBUG events per route; warnings and errors always pass"""
+
+    def __init__(self, rates=None, default_rate=1.0):
+        self.rates = rates or {}
+        self.default_rate = default_rate
+
+    def keep(self, route, levelno):
+        if levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(route, self.default_rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        SAMPLED_OUT.labels(route or 'none').inc()
+        return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue a snapshot of each record; drop and count when the queue is full"""
+
+    def __init__(self, log_queue, maxsize):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+
+    def prepare(self, record):
+        # Not super().prepare(): that folds the traceback into msg, and the writer keeps it as a separate
+        # 'exc' field. Args and exc_info are resolved here, since they may change before the writer runs;
+        # only the JSON encoding is deferred.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # SimpleQueue is unbounded and lock-free on put; qsize() keeps it bounded
+        if self.queue.qsize() >= self.maxsize:
+            DROPPED.inc()
+        else:
+            self.queue.put(record)
+
+
+class BatchWriter(threading.Thread):
+    """Drains the log queue, formats records and writes each batch with one write()"""
+
+    _STOP = object()
+
+    def __init__(self, log_queue, stream, formatter, batch_size=LOG_BATCH_SIZE):
+        super().__init__(name='log-writer', daemon=True)
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+
+    def run(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is self._STOP:
+                    running = False
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception as e:
+                    lines.append(json.dumps({'level': 'ERROR', 'msg': f"Unformattable log record: {e}"}))
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
+
+    def stop(self):
+        self.queue.put(self._STOP)
+        self.join()
+
+
+_writer = None
+_handler = None
+_sampler = RouteSampler()
+
+
+def setup_logging(service, level=logging.INFO, stream=None, sample_rates=None, queue_size=LOG_QUEUE_SIZE):
+    """Route the root logger through a bounded queue to a background JSON-lines writer"""
+    shutdown_logging()
+
+    if stream is None:
+        stream = open(LOG_FILE, 'a', buffering=1) if LOG_FILE else sys.stderr
+    log_queue = queue.SimpleQueue()
+    handler = DroppingQueueHandler(log_queue, queue_size)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    # The JSON lines don't include process info - skip collecting it
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv('LOG_SAMPLE_RATES'))
+
+    global _writer, _handler, _sampler
+    _handler = handler
+    _sampler = RouteSampler(sample_rates)
+    _writer = BatchWriter(log_queue, stream, JsonLinesFormatter(service))
+    _writer.start()
+    return _writer
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _writer, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+atexit.register(shutdown_logging)
+
+
+def log_event(logger, route, message, *args, level=logging.INFO, **fields):
+    """Log a structured event; `message` uses %-style args so formatting stays lazy.
+    Sampling happens here, before a LogRecord is built."""
+    if logger.isEnabledFor(level) and _sampler.keep(route, level):
+        logger.log(level, message, *args, extra={'route': route, 'fields': fields})
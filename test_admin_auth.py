@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for admin endpoint authentication
+"""
+
+from flask import Flask
+
+import admin_auth
+from admin_auth import admin_error, is_admin
+
+
+def _with_token(token, fn):
+    saved = admin_auth.ADMIN_TOKEN
+    admin_auth.ADMIN_TOKEN = token
+    try:
+        return fn()
+    finally:
+        admin_auth.ADMIN_TOKEN = saved
+
+
+def test_token_required():
+    """Bearer and X-Admin-Token headers are accepted; wrong or missing tokens are not"""
+    def check():
+        assert admin_auth.admin_enabled()
+        assert is_admin({'Authorization': 'Bearer s3cret'})
+        assert is_admin({'X-Admin-Token': 's3cret'})
+        for headers in [{}, {'X-Admin-Token': 'wrong'}, {'Authorization': 'Basic s3cret'},
+                        {'Authorization': 'Bearer s3cret2'}, {'X-Admin-Token': 'bad', 'Authorization': 'Bearer s3cret'}]:
+            assert not is_admin(headers), headers
+    _with_token('s3cret', check)
+
+
+def test_disabled_without_token():
+    """With ADMIN_TOKEN unset nothing is admin, and endpoints answer 404 rather than 401"""
+    def check():
+        assert not admin_auth.admin_enabled()
+        assert not is_admin({'X-Admin-Token': ''})
+        with Flask(__name__).app_context():
+            assert admin_error()[1] == 404
+    _with_token(None, check)
+    with Flask(__name__).app_context():
+        assert _with_token('s3cret', admin_error)[1] == 401
+
+
+if __name__ == "__main__":
+    test_token_required()
+    test_disabled_without_token()
+    print("✅ Admin auth tests passed")
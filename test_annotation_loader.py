@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel, cached annotation loading
+"""
+
+import json
+import os
+import tempfile
+
+import annotation_loader
+
+
+def _write(directory, name, data):
+    with open(os.path.join(directory, name), 'w') as f:
+        json.dump(data, f)
+
+
+def test_cache_reuses_unchanged_files():
+    """Second load parses nothing; changed, added and removed files are picked up"""
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(20):
+            _write(directory, f"sign_{i:02d}.json", {'text': f"sign {i}"})
+        _write(directory, 'batch.json', [{'text': 'hello'}, {'text': 'help'}])
+        _write(directory, 'notes.txt', {'text': 'ignored'})
+
+        stats = annotation_loader.LoadStats()
+        records = annotation_loader.load_annotations(directory, stats=stats)
+        assert len(records) == 22 and records[:2] == [{'text': 'hello'}, {'text': 'help'}]
+        assert (stats.files, stats.cached, stats.parsed) == (21, 0, 21)
+
+        stats = annotation_loader.LoadStats()
+        hashes = []
+        assert annotation_loader.load_annotations(directory, stats=stats, hashes=hashes) == records
+        assert (stats.cached, stats.parsed, stats.pool) == (21, 0, None)
+        assert hashes == [annotation_loader.record_hash(record) for record in records]
+        assert annotation_loader.record_hash({'b': 1, 'a': 2}) == annotation_loader.record_hash({'a': 2, 'b': 1})
+
+        _write(directory, 'sign_00.json', {'text': 'sign zero, edited'})
+        _write(directory, 'sign_99.json', {'text': 'new'})
+        os.remove(os.path.join(directory, 'sign_05.json'))
+        stats = annotation_loader.LoadStats()
+        records = annotation_loader.load_annotations(directory, stats=stats)
+        assert (stats.files, stats.cached, stats.parsed) == (21, 19, 2)
+        texts = [r['text'] for r in records]
+        assert 'sign zero, edited' in texts and 'new' in texts and 'sign 5' not in texts
+        assert len(annotation_loader.read_cache(os.path.join(directory, annotation_loader.CACHE_NAME))) == 21
+
+
+def test_bad_files_and_process_pool():
+    """Unparseable files are skipped (and retried next run); the process pool path gives the same records"""
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(30):
+            _write(directory, f"{i:02d}.json", {'text': str(i)})
+        with open(os.path.join(directory, 'broken.json'), 'w') as f:
+            f.write('{"text": ')
+
+        stats = annotation_loader.LoadStats()
+        threaded = annotation_loader.load_annotations(directory, cache_path=False, stats=stats)
+        assert len(threaded) == 30 and stats.failed == 1
+
+        original = annotation_loader.PROCESS_POOL_MIN_FILES
+        annotation_loader.PROCESS_POOL_MIN_FILES = 1
+        try:
+            assert annotation_loader.load_annotations(directory, cache_path=False) == threaded
+        finally:
+            annotation_loader.PROCESS_POOL_MIN_FILES = original
+
+        annotation_loader.load_annotations(directory)
+        stats = annotation_loader.LoadStats()
+        annotation_loader.load_annotations(directory, stats=stats)
+        assert (stats.cached, stats.failed) == (30, 1)
+
+
+def test_cache_is_plain_json():
+    """The cache is JSON that is never loaded as annotations; an unreadable cache just means a full parse"""
+    with tempfile.TemporaryDirectory() as directory:
+        _write(directory, 'sign.json', {'text': 'hello'})
+        annotation_loader.load_annotations(directory)
+        cache_path = os.path.join(directory, annotation_loader.CACHE_NAME)
+        with open(cache_path) as f:
+            assert json.load(f)['version'] == annotation_loader.CACHE_VERSION
+
+        stats = annotation_loader.LoadStats()
+        assert annotation_loader.load_annotations(directory, stats=stats) == [{'text': 'hello'}]
+        assert (stats.files, stats.cached) == (1, 1)
+
+        with open(cache_path, 'wb') as f:
+            f.write(b'\x80\x04garbage')
+        stats = annotation_loader.LoadStats()
+        assert annotation_loader.load_annotations(directory, stats=stats) == [{'text': 'hello'}]
+        assert (stats.cached, stats.parsed) == (0, 1)
+
+
+if __name__ == "__main__":
+    test_cache_reuses_unchanged_files()
+    test_bad_files_and_process_pool()
+    test_cache_is_plain_json()
+    print("✅ Annotation loader tests passed")
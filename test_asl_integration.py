@@ -67,6 +67,44 @@ def test_asl_server_import():
         print(f"❌ ASL Server import failed: {e}")
         return False
 
+def test_asl_server_import_is_side_effect_free():
+    """Importing asl_server opens no storage; the first request does"""
+    print("\n🧪 Testing ASL Server lazy storage...")
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, FRAME_STORE_DIR=os.path.join(data_dir, 'frames'),
+                   SAMPLE_INDEX_PATH=os.path.join(data_dir, 'samples.db'),
+                   ASL_AUDIT_DIR=os.path.join(data_dir, 'audit'))
+        script = ("import os, asl_server\n"
+                  "assert asl_server.sample_ingestor is None and not os.listdir(%r)\n"
+                  "asl_server.app.test_client().get('/training/data')\n"
+                  "assert {'audit', 'frames', 'samples.db'} <= set(os.listdir(%r))\n") % (data_dir, data_dir)
+        result = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        print("✅ Storage opened on first request, not at import")
+        return True
+
+def test_robot_server_import_is_side_effect_free():
+    """Importing robot_server opens no audit log; the first request does"""
+    print("\n🧪 Testing Robot Server lazy audit log...")
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, ROBOT_AUDIT_DIR=os.path.join(data_dir, 'audit'))
+        script = ("import os, robot_server\n"
+                  "assert robot_server.audit is None and not os.listdir(%r)\n"
+                  "robot_server.app.test_client().get('/status')\n"
+                  "assert os.listdir(%r) == ['audit']\n") % (data_dir, data_dir)
+        result = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        print("✅ Audit log opened on first request, not at import")
+        return True
+
 def test_confidence_function():
     """Test the ASL confidence calculation"""
     print("\n🧪 Testing ASL Confidence Calculation...")
@@ -101,6 +139,8 @@ def main():
     tests = [
         test_model_loading,
         test_asl_server_import,
+        test_asl_server_import_is_side_effect_free,
+        test_robot_server_import_is_side_effect_free,
         test_confidence_function
     ]
     
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the robot command audit log: group commit, rotation, time-index
+queries and recovery from a torn final record or corrupt records
+"""
+
+import os
+import tempfile
+import threading
+
+from audit_log import AuditLog
+
+
+def test_group_commit_and_queries():
+    """Concurrent appends are durable, rotate across segments and can be queried by time"""
+    with tempfile.TemporaryDirectory() as directory:
+        log = AuditLog(directory, segment_bytes=2000, index_every=4, commit_interval=0.002)
+
+        times = []
+        def writer(worker):
+            for i in range(50):
+                times.append(log.append({'command': 'home', 'worker': worker, 'i': i})['logged_at'])
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert log.count == 200
+        assert len(log.segments) > 1, "segments should rotate at segment_bytes"
+        assert [record['seq'] for record in log.last(3)] == [198, 199, 200]
+
+        times.sort()
+        window = log.between(times[50], times[120])
+        assert len(window) == 71
+        assert all(times[50] <= record['logged_at'] <= times[120] for record in window)
+        assert len(log.between(times[10], limit=5)) == 5
+        log.close()
+
+
+def test_recovers_torn_record():
+    """A partially written final line is truncated and sequence numbers resume"""
+    with tempfile.TemporaryDirectory() as directory:
+        log = AuditLog(directory, index_every=2)
+        for command in ['pick_up', 'deliver', 'home']:
+            log.append({'command': command})
+        log.close()
+
+        segment = log.segments[-1]
+        with open(segment.path, 'ab') as f:
+            f.write(b'{"command": "st')
+        os.remove(segment.index_path)
+
+        reopened = AuditLog(directory, index_every=2)
+        assert reopened.count == 3
+        assert reopened.append({'command': 'stop'})['seq'] == 4
+        assert [record['command'] for record in reopened.last(10)] == ['pick_up', 'deliver', 'home', 'stop']
+        assert len(reopened.segments[-1].index) == 2
+        reopened.close()
+
+
+def test_corrupt_middle_record_is_skipped():
+    """A corrupt line between good records is skipped, not a reason to truncate what follows"""
+    with tempfile.TemporaryDirectory() as directory:
+        log = AuditLog(directory, index_every=2)
+        for command in ['pick_up', 'deliver']:
+            log.append({'command': command})
+        log.close()
+
+        segment = log.segments[-1]
+        with open(segment.path, 'rb') as f:
+            first, second = f.read().splitlines(keepends=True)
+        with open(segment.path, 'wb') as f:
+            f.write(first + b'{"garbled\n' + second + b'not json either\n{"command": "ho')
+        os.remove(segment.index_path)
+
+        reopened = AuditLog(directory, index_every=2)
+        assert reopened.count == 2
+        assert reopened.append({'command': 'home'})['seq'] == 3
+        assert [record['command'] for record in reopened.last(10)] == ['pick_up', 'deliver', 'home']
+        assert [record['command'] for record in reopened.between()] == ['pick_up', 'deliver', 'home']
+        with open(segment.path, 'rb') as f:
+            assert b'{"garbled' in f.read()
+        reopened.close()
+
+
+if __name__ == "__main__":
+    test_group_commit_and_queries()
+    test_recovers_torn_record()
+    test_corrupt_middle_record_is_skipped()
+    print("✅ Audit log tests passed")
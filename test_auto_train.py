@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for fingerprint-based auto-training
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+import auto_train
+
+
+def _layout(directory):
+    annotations_dir = os.path.join(directory, 'annotations')
+    os.makedirs(annotations_dir)
+    with open(os.path.join(annotations_dir, 'a.json'), 'w') as f:
+        json.dump([{'sign': 'hello'}], f)
+    with open(os.path.join(directory, 'train.py'), 'w') as f:
+        f.write('print("v1")\n')
+    return annotations_dir
+
+
+def test_fingerprint_tracks_data_and_code():
+    """Training data and code changes change the fingerprint; unrelated files do not"""
+    with tempfile.TemporaryDirectory() as directory:
+        annotations_dir = _layout(directory)
+        data = (('columnar', 'columnar/manifest.json', 'contents'), ('asl_signs', 'asl_signs', 'tree'),
+                ('ms_asl', 'MS-ASL', 'json'))
+        fingerprint = lambda: auto_train.training_fingerprint(annotations_dir, ('train.py',), directory, data)
+        seen = [fingerprint()]
+        assert fingerprint() == seen[0]
+
+        def write(relative, text):
+            os.makedirs(os.path.dirname(os.path.join(directory, relative)), exist_ok=True)
+            with open(os.path.join(directory, relative), 'w') as f:
+                f.write(text)
+            return fingerprint()
+
+        assert write('annotations/notes.txt', 'ignored') == seen[0]
+        assert write('MS-ASL/index/meta.json', '{}') == seen[0]   # derived cache
+        for relative, text in [('annotations/b.json', '[]'), ('train.py', 'print("v2")\n'),
+                               ('columnar/manifest.json', '{"rows": 1}'), ('asl_signs/hello/1.jpg', 'x'),
+                               ('MS-ASL/MSASL_val.json', '[]')]:
+            current = write(relative, text)
+            assert current not in seen, relative
+            seen.append(current)
+
+
+def test_lock_is_exclusive_and_dies_with_its_holder():
+    """A live holder blocks acquisition; a lock file left by a dead process (any contents) does not"""
+    with tempfile.TemporaryDirectory() as directory:
+        lock_path = os.path.join(directory, 'models', '.training.lock')
+        assert auto_train.acquire_lock(lock_path, 'abc')
+        assert auto_train.lock_owner(lock_path) == os.getpid()
+        assert not auto_train.acquire_lock(lock_path)
+        auto_train.release_lock(lock_path)
+        assert auto_train.lock_owner(lock_path) is None
+
+        for contents in ('{"pid": 1}', '{"pi'):
+            with open(lock_path, 'w') as f:
+                f.write(contents)
+            assert auto_train.lock_owner(lock_path) is None and auto_train.acquire_lock(lock_path)
+            auto_train.release_lock(lock_path)
+
+        # Held by another process: blocked until it exits, then free without any cleanup
+        script = ('import sys, auto_train; auto_train.acquire_lock(sys.argv[1]); '
+                  'print("held", flush=True); sys.stdin.read()')
+        holder = subprocess.Popen([sys.executable, '-c', script, lock_path],
+                                  cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        assert holder.stdout.readline().strip() == 'held'
+        assert auto_train.lock_owner(lock_path) == holder.pid and not auto_train.acquire_lock(lock_path)
+        holder.kill()
+        holder.wait()
+        assert auto_train.lock_owner(lock_path) is None and auto_train.acquire_lock(lock_path)
+        auto_train.release_lock(lock_path)
+
+
+def test_training_stamps_model_and_clears_staleness():
+    """A successful run records the pre-training fingerprint in the model; a failed run leaves it stale"""
+    with tempfile.TemporaryDirectory() as directory:
+        annotations_dir = _layout(directory)
+        model_path = os.path.join(directory, 'models', 'asl_patterns.json')
+        lock_path = os.path.join(directory, 'models', '.training.lock')
+        write_model = (f"import json, os; os.makedirs({os.path.dirname(model_path)!r}, exist_ok=True); "
+                       f"json.dump({{'version': '1.0.0', 'patterns': {{}}}}, open({model_path!r}, 'w'))")
+        assert auto_train.stored_fingerprint(model_path) is None
+
+        assert not auto_train.trigger_training(model_path, annotations_dir, lock_path,
+                                               ([sys.executable, '-c', 'raise SystemExit(1)'], directory))
+        assert auto_train.stored_fingerprint(model_path) is None and auto_train.lock_owner(lock_path) is None
+
+        assert auto_train.trigger_training(model_path, annotations_dir, lock_path,
+                                           ([sys.executable, '-c', write_model], directory))
+        status = auto_train.model_status(model_path, annotations_dir, lock_path)
+        assert not status['stale'] and status['stored'] == auto_train.training_fingerprint(annotations_dir)
+        with open(model_path) as f:
+            assert json.load(f)['version'] == '1.0.0'
+
+        assert auto_train.acquire_lock(lock_path)
+        # Another training holds the lock: nothing runs, and that is not a failure
+        assert auto_train.trigger_training(model_path, annotations_dir, lock_path,
+                                           ([sys.executable, '-c', 'raise SystemExit(1)'], directory))
+        auto_train.release_lock(lock_path)
+
+
+def test_background_training_is_detached():
+    """The worker runs in its own session and does not block the caller"""
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, 'auto_train.log')
+        start = time.perf_counter()
+        process = auto_train.start_background_training(log_path, ('--help',))
+        assert time.perf_counter() - start < 5
+        assert os.getsid(process.pid) == process.pid
+        assert process.wait(timeout=30) == 0
+        with open(log_path) as f:
+            log = f.read()
+        assert 'auto-training started' in log and '--foreground' in log
+
+
+if __name__ == "__main__":
+    test_fingerprint_tracks_data_and_code()
+    test_lock_is_exclusive_and_dies_with_its_holder()
+    test_training_stamps_model_and_clears_staleness()
+    test_background_training_is_detached()
+    print("✅ Auto-train tests passed")
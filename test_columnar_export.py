@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar training sample export: incremental parts, merged
+string tables and compaction
+"""
+
+import os
+import tempfile
+
+import columnar_export
+from frame_store import FrameStore
+
+
+def _sample(sign, i):
+    return {'sign': sign, 'session_id': f"s{i % 2}", 'timestamp': i * 1000, 'logged_at': 1000.0 + i,
+            'frame': f"{i:064x}", 'ext': 'jpg', 'bytes': 10}
+
+
+def test_incremental_export_and_load():
+    """Re-running the export only appends new samples; parts merge into one set of columns"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FrameStore(directory)
+        export_dir = os.path.join(store.root, 'columnar')
+        store.append_samples([_sample(sign, i) for i, sign in enumerate(['hello', 'stop', 'hello'])])
+        assert columnar_export.export_frame_store(store.root, export_dir) == 3
+        assert columnar_export.export_frame_store(store.root, export_dir) == 0
+
+        store.append_samples([_sample('thank you', 3), _sample('stop', 4)])
+        assert columnar_export.export_frame_store(store.root, export_dir) == 2
+        assert len(columnar_export.read_manifest(export_dir)['parts']) == 2
+
+        columns = columnar_export.load_columns(export_dir)
+        assert len(columns) == 5
+        assert columns.column('text').tolist() == ['hello', 'stop', 'hello', 'thank you', 'stop']
+        assert columns.equals('text', 'stop').tolist() == [False, True, False, False, True]
+        assert not columns.equals('text', 'missing').any()
+
+        record = list(columns.records())[3]
+        assert record['text'] == 'thank you' and record['logged_at'] == 1003.0
+        assert columnar_export.image_path(record) == store.object_path(f"{3:064x}")
+
+
+def test_compact_keeps_rows_and_offsets():
+    """Compaction merges parts without re-exporting already exported samples"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FrameStore(directory)
+        export_dir = os.path.join(store.root, 'columnar')
+        for i in range(3):
+            store.append_samples([_sample('help', i)])
+            columnar_export.export_frame_store(store.root, export_dir)
+
+        before = columnar_export.load_columns(export_dir).column('frame').tolist()
+        manifest = columnar_export.compact(export_dir)
+        assert len(manifest['parts']) == 1 and manifest['rows'] == 3
+        assert sorted(os.listdir(export_dir)) == [columnar_export.MANIFEST, manifest['parts'][0]['file']]
+        assert columnar_export.load_columns(export_dir).column('frame').tolist() == before
+        assert columnar_export.export_frame_store(store.root, export_dir) == 0
+
+
+def test_interrupted_compact_keeps_old_parts():
+    """If compaction dies writing the merged part, the old manifest and parts still load"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FrameStore(directory)
+        export_dir = os.path.join(store.root, 'columnar')
+        for i in range(2):
+            store.append_samples([_sample('help', i)])
+            columnar_export.export_frame_store(store.root, export_dir)
+
+        def crash(path, **arrays):
+            raise OSError('disk full')
+        real_savez = columnar_export.np.savez
+        columnar_export.np.savez = crash
+        try:
+            columnar_export.compact(export_dir)
+            raise AssertionError('compact did not fail')
+        except OSError:
+            pass
+        finally:
+            columnar_export.np.savez = real_savez
+        assert len(columnar_export.read_manifest(export_dir)['parts']) == 2
+        assert len(columnar_export.load_columns(export_dir)) == 2
+
+
+def test_source_keys_survive_moving_the_checkout():
+    """Sources in the repo are keyed relative to its root; older absolute keys are still honoured"""
+    inside = os.path.join(columnar_export.ROOT, 'training_data', 'logged_frames', 'samples.jsonl')
+    assert columnar_export.source_key(inside) == os.path.join('training_data', 'logged_frames', 'samples.jsonl')
+    with tempfile.TemporaryDirectory() as outside:
+        assert columnar_export.source_key(outside) == outside
+
+        manifest = {'sources': {inside: {'offset': 5}, inside + '#radisk': {'ids': ['a']}}}
+        assert columnar_export.source_state(manifest, inside) == {'offset': 5}
+        assert columnar_export.source_state(manifest, inside, '#radisk') == {'ids': ['a']}
+        assert columnar_export.source_state(manifest, outside) == {}
+
+
+if __name__ == "__main__":
+    test_incremental_export_and_load()
+    test_compact_keeps_rows_and_offsets()
+    test_interrupted_compact_keeps_old_parts()
+    test_source_keys_survive_moving_the_checkout()
+    print("✅ Columnar export tests passed")
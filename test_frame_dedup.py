@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for perceptual-hash near-duplicate removal
+"""
+
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+import frame_dedup
+import sign_classifier
+
+
+def _runs(runs, run_length, flips, seed=0):
+    """Hashes for `runs` bursts of `run_length` frames, each frame `flips` random bits off its burst's base"""
+    rng = np.random.default_rng(seed)
+    hashes = np.repeat(rng.integers(0, 2**63, runs, dtype=np.int64).astype(np.uint64) << np.uint64(1), run_length)
+    for _ in range(flips):
+        hashes ^= np.uint64(1) << rng.integers(0, 64, len(hashes)).astype(np.uint64)
+    return hashes
+
+
+def _brute_force(hashes, labels, threshold):
+    """Reference greedy pass: keep a frame unless it is within threshold of a kept frame of its class"""
+    kept, keep = [], np.zeros(len(hashes), dtype=bool)
+    for i, value in enumerate(hashes.tolist()):
+        if not any(labels[j] == labels[i] and (value ^ hashes[j].item()).bit_count() <= threshold for j in kept):
+            kept.append(i)
+            keep[i] = True
+    return keep
+
+
+def test_phash_is_robust_to_noise():
+    """Noise and brightness barely move the hash; different images are far apart"""
+    rng = np.random.default_rng(1)
+    frames = np.kron(rng.integers(0, 256, (6, 16, 16)), np.ones((8, 8))).astype(np.float32)
+    hashes = frame_dedup.phash(frames.astype(np.uint8))
+    noisy = frame_dedup.phash(np.clip(frames + rng.normal(0, 8, frames.shape), 0, 255).astype(np.uint8))
+    brighter = frame_dedup.phash(np.clip(frames * 1.1 + 10, 0, 255).astype(np.uint8))
+    assert hashes.dtype == np.uint64 and hashes.shape == (6,)
+    assert frame_dedup.popcount(hashes ^ noisy).max() <= 4 and frame_dedup.popcount(hashes ^ brighter).max() <= 4
+    assert frame_dedup.popcount(hashes[0] ^ hashes[1:]).min() > 2 * frame_dedup.THRESHOLD
+
+
+def test_dedup_matches_brute_force():
+    """The LSH pass keeps what comparing every frame with every kept frame keeps"""
+    hashes = _runs(60, 15, flips=2)
+    labels = np.repeat(np.arange(60) % 4, 15)
+    hashes[100:103] = hashes[99]              # exact copies
+    keep, duplicate_of, stats = frame_dedup.dedup(hashes, labels)
+    assert np.array_equal(keep, _brute_force(hashes, labels, frame_dedup.THRESHOLD))
+    assert keep.sum() == 60 and stats['removed'] == 840 and stats['exact'] >= 3
+    dropped = np.flatnonzero(~keep)
+    assert (duplicate_of[keep] == -1).all() and keep[duplicate_of[dropped]].all()
+    assert (duplicate_of[dropped] < dropped).all() and (labels[duplicate_of[dropped]] == labels[dropped]).all()
+    assert (frame_dedup.popcount(hashes[dropped] ^ hashes[duplicate_of[dropped]]) <= frame_dedup.THRESHOLD).all()
+
+
+def test_dedup_finds_non_adjacent_duplicates():
+    """Near-duplicates scattered through the set (shuffled, or copies of much earlier frames) are all found"""
+    rng = np.random.default_rng(3)
+    hashes = _runs(40, 10, flips=2, seed=3)
+    labels = np.repeat(np.arange(40) % 3, 10)
+    order = rng.permutation(len(hashes))
+    hashes, labels = hashes[order], labels[order]
+    keep, _, _ = frame_dedup.dedup(hashes, labels)
+    assert np.array_equal(keep, _brute_force(hashes, labels, frame_dedup.THRESHOLD)) and keep.sum() == 40
+
+    # Crowded buckets: every band key comes from 8 values at least 7 bits apart, so each combination is
+    # a distinct kept frame; one-bit-off copies of random earlier frames follow far behind their sources
+    pool = []
+    while len(pool) < 8:
+        value = int(rng.integers(0, 1 << 16))
+        if all((value ^ other).bit_count() >= 7 for other in pool):
+            pool.append(value)
+    combos = rng.permutation(8 ** 4)[:1500]
+    distinct = sum(np.array(pool, dtype=np.uint64)[(combos >> (3 * band)) % 8] << np.uint64(16 * band)
+                   for band in range(4))
+    sources = rng.integers(0, len(distinct), 100)
+    copies = distinct[sources] ^ (np.uint64(1) << rng.integers(0, 64, 100).astype(np.uint64))
+    hashes = np.concatenate([distinct, copies])
+    labels = np.zeros(len(hashes), dtype=np.int64)
+    keep, duplicate_of, _ = frame_dedup.dedup(hashes, labels)
+    assert keep[:len(distinct)].all() and (duplicate_of[len(distinct):] == sources).all()
+    assert np.array_equal(keep, _brute_force(hashes, labels, frame_dedup.THRESHOLD))
+
+
+def test_dedup_respects_labels_and_drift():
+    """Equal frames of different classes are both kept; a drifting run keeps a frame per threshold step"""
+    hashes = np.zeros(2, dtype=np.uint64)
+    keep, _, _ = frame_dedup.dedup(hashes, np.array([0, 1]))
+    assert keep.all()
+
+    drift = np.array([(1 << bits) - 1 for bits in range(0, 20)], dtype=np.uint64)  # one more bit set per frame
+    keep, duplicate_of, _ = frame_dedup.dedup(drift, threshold=3)
+    assert list(np.flatnonzero(keep)) == [0, 4, 8, 12, 16] and duplicate_of[7] == 4
+
+    try:
+        frame_dedup.dedup(drift, threshold=8, bands=4)
+        assert False, 'one-bit probes on 4 bands cannot guarantee 8-bit matches'
+    except ValueError:
+        pass
+
+
+def test_classifier_drops_duplicates_before_split():
+    """train(dedup_threshold=...) trains on one frame per burst and reports removals per class"""
+    with tempfile.TemporaryDirectory() as directory:
+        signs_dir = os.path.join(directory, 'asl_signs')
+        rng = np.random.default_rng(0)
+        for name in ('hello', 'stop'):
+            os.makedirs(os.path.join(signs_dir, name))
+            for burst in range(3):
+                base = np.kron(rng.integers(0, 256, (12, 16)), np.ones((10, 10)))
+                for i in range(4):
+                    frame = np.clip(base + rng.normal(0, 4, base.shape), 0, 255).astype(np.uint8)
+                    Image.fromarray(frame).save(os.path.join(signs_dir, name, f"{burst}_{i}.png"))
+        paths, labels, classes = sign_classifier.list_dataset(signs_dir)
+        keep, _, _ = frame_dedup.dedup(frame_dedup.hash_paths(paths), labels)
+        assert keep.sum() == 6
+        assert frame_dedup.class_report(labels, keep, classes) == {'hello': {'frames': 12, 'removed': 9},
+                                                                   'stop': {'frames': 12, 'removed': 9}}
+
+        sidecar = sign_classifier.train(signs_dir, os.path.join(directory, 'model.npy'), iterations=20,
+                                        dedup_threshold=frame_dedup.THRESHOLD)
+        metrics = sidecar['metrics']
+        assert metrics['duplicates_removed'] == 18 and metrics['duplicates_by_class'] == {'hello': 9, 'stop': 9}
+        assert metrics['train_frames'] + metrics['holdout_frames'] == 6
+
+
+if __name__ == "__main__":
+    test_phash_is_robust_to_noise()
+    test_dedup_matches_brute_force()
+    test_dedup_finds_non_adjacent_duplicates()
+    test_dedup_respects_labels_and_drift()
+    test_classifier_drops_duplicates_before_split()
+    print("✅ Frame dedup tests passed")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed training frame store and its ingest queue
+"""
+
+import os
+import base64
+import tempfile
+import threading
+
+import columnar_export
+import frame_store
+from frame_store import FrameStore, decode_data_url
+from sample_index import SampleIndex
+from sample_ingest import SHED, SampleIngestor
+
+JPEG = b'\xff\xd8\xff\xe0' + bytes(range(256)) * 4
+
+
+def test_decode_data_url():
+    """Full JPEG bytes come back from the data URL; non-images are rejected"""
+    frame, extension = decode_data_url('data:image/jpeg;base64,' + base64.b64encode(JPEG).decode())
+    assert frame == JPEG and extension == 'jpg'
+    for bad in [None, 'not a data url', 'data:image/jpeg;base64,AAAA', 'data:image/jpeg;base64,!!!']:
+        try:
+            decode_data_url(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_duplicate_frames_stored_once():
+    """Identical frames share one object; every sample still gets a metadata record"""
+    with tempfile.TemporaryDirectory() as root:
+        store = FrameStore(root)
+        first, stored_first = store.log_sample('hello', 's1', 1.0, 'now', JPEG)
+        second, stored_second = store.log_sample('help', 's1', 2.0, 'now', JPEG)
+        assert stored_first and not stored_second
+        assert first['frame'] == second['frame']
+        assert store.get_frame(first['frame']) == JPEG
+        assert store.count_samples() == 2
+        assert [sample['sign'] for sample in store.iter_samples()] == ['hello', 'help']
+        store.close()
+
+
+def test_torn_tail_is_truncated_and_bad_lines_skipped():
+    """A crash mid-append leaves a partial line: reopening cuts it off, readers skip undecodable lines"""
+    with tempfile.TemporaryDirectory() as root:
+        store = FrameStore(root)
+        store.log_sample('hello', 's1', 1.0, '2025-01-01T00:00:00', JPEG)
+        store.close()
+        with open(store.samples_path, 'ab') as f:
+            f.write(b'not json\n{"sign": "help", "frame": "ab')   # corrupt line, then a torn record
+
+        store = FrameStore(root)
+        assert store.truncated_bytes == len(b'{"sign": "help", "frame": "ab')
+        store.log_sample('stop', 's1', 2.0, '2025-01-01T00:00:01', JPEG)
+        assert [sample['sign'] for sample in store.iter_samples()] == ['hello', 'stop'] and store.corrupt_lines == 1
+
+        index = SampleIndex(os.path.join(root, 'samples.db'))
+        assert index.catch_up(store.samples_path) == 2 and index.skipped_lines == 1
+        assert index.sign_counts() == {'hello': 1, 'stop': 1}
+        export_dir = os.path.join(root, 'columnar')
+        assert columnar_export.export_frame_store(root, export_dir) == 2
+        state = columnar_export.read_manifest(export_dir)['sources'][columnar_export.source_key(store.samples_path)]
+        assert state['skipped_lines'] == 1
+        store.close()
+
+
+def test_ingest_batches_and_sheds():
+    """Queued samples reach disk in batches; a full queue sheds instead of blocking"""
+    with tempfile.TemporaryDirectory() as root:
+        store = FrameStore(root)
+        ingestor = SampleIngestor(store, maxsize=2)
+        release = threading.Event()
+        batches = []
+        ingestor.add_listener(lambda samples, stored: (batches.append(len(samples)), release.wait(5)))
+
+        assert ingestor.submit({'sign': 'hello'}, JPEG)
+        while not batches:  # writer is now parked in the listener
+            threading.Event().wait(0.001)
+        shed_before = SHED.get()
+        results = [ingestor.submit({'sign': 'help', 'i': i}, JPEG + bytes([i])) for i in range(4)]
+        assert results == [True, True, False, False]
+        assert SHED.get() - shed_before == 2
+
+        release.set()
+        assert ingestor.flush(timeout=5)
+        assert batches == [1, 2]
+        assert store.count_samples() == 3
+
+
+def _synced_batch(root, syncfs):
+    """Ingest one batch of 3 samples (2 distinct frames) into root and list what was synced, in order"""
+    store = FrameStore(root)
+    ingestor = SampleIngestor(store)
+    synced = []
+    real_fsync, real_syncfs = os.fsync, frame_store._syncfs
+    os.fsync = lambda fd: (synced.append(os.readlink(f"/proc/self/fd/{fd}")), real_fsync(fd))[1]
+    if syncfs:
+        frame_store._syncfs = lambda fd: (synced.append('syncfs'), 0)[1]
+    else:
+        frame_store._syncfs = None
+    try:
+        for i in range(3):
+            assert ingestor.submit({'sign': 'hello', 'i': i}, JPEG + bytes([i % 2]))
+        assert ingestor.flush(timeout=5)
+    finally:
+        os.fsync, frame_store._syncfs = real_fsync, real_syncfs
+    assert store.count_samples() == 3
+    return store, synced
+
+
+def test_batch_frames_are_durable_before_metadata():
+    """A batch syncs its new frames once, then samples.jsonl once - never per frame"""
+    with tempfile.TemporaryDirectory() as root:
+        store, synced = _synced_batch(root, syncfs=True)
+        assert synced == ['syncfs', os.path.realpath(store.samples_path)]
+
+    # Without syncfs: each new frame, then each fan-out directory, then the metadata
+    with tempfile.TemporaryDirectory() as root:
+        store, synced = _synced_batch(root, syncfs=False)
+        objects = os.path.realpath(store.objects_dir)
+        assert synced[-1] == os.path.realpath(store.samples_path)
+        assert [os.path.dirname(os.path.dirname(path)) for path in synced[:2]] == [objects, objects]
+        assert all(os.path.dirname(path) == objects for path in synced[2:-1])
+
+
+def test_log_sign_sheds_with_503():
+    """/ml/log_sign answers 503 with Retry-After when the ingest queue is full"""
+    import asl_server
+
+    with tempfile.TemporaryDirectory() as root:
+        store = FrameStore(root)
+        ingestor = SampleIngestor(store, maxsize=1)
+        release = threading.Event()
+        ingestor.add_listener(lambda samples, stored: release.wait(5))
+        saved = asl_server.frame_store, asl_server.sample_ingestor
+        asl_server.frame_store, asl_server.sample_ingestor = store, ingestor
+        try:
+            client = asl_server.app.test_client()
+            body = {'sign': 'hello', 'imageData': 'data:image/jpeg;base64,' + base64.b64encode(JPEG).decode()}
+            assert client.post('/ml/log_sign', json=body).status_code == 202
+            while not ingestor.queue.empty():  # writer picked up the first sample and is parked
+                threading.Event().wait(0.001)
+            assert client.post('/ml/log_sign', json=body).status_code == 202
+            response = client.post('/ml/log_sign', json=body)
+            assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+        finally:
+            release.set()
+            asl_server.frame_store, asl_server.sample_ingestor = saved
+        assert ingestor.flush(timeout=5) and store.count_samples() == 2
+
+
+if __name__ == "__main__":
+    test_decode_data_url()
+    test_duplicate_frames_stored_once()
+    test_torn_tail_is_truncated_and_bad_lines_skipped()
+    test_ingest_batches_and_sheds()
+    test_batch_frames_are_durable_before_metadata()
+    test_log_sign_sheds_with_503()
+    print("✅ Frame store tests passed")
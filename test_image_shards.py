@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for packed image shards
+"""
+
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+import image_shards
+import sign_classifier
+
+
+def _write_frames(signs_dir, per_class=5, classes=('hello', 'stop', 'wave')):
+    rng = np.random.default_rng(0)
+    for name in classes:
+        os.makedirs(os.path.join(signs_dir, name))
+        for i in range(per_class):
+            frame = rng.integers(0, 256, (96, 160, 3), dtype=np.uint8)
+            Image.fromarray(frame).save(os.path.join(signs_dir, name, f"{i:03d}.jpg"), quality=90)
+
+
+def test_pack_and_read_views():
+    """Packed frames equal a direct decode; batches are views, repacking is skipped until a frame changes"""
+    with tempfile.TemporaryDirectory() as directory:
+        signs_dir, shards_dir = os.path.join(directory, 'asl_signs'), os.path.join(directory, 'image_shards')
+        _write_frames(signs_dir)
+        index = image_shards.pack(signs_dir, shards_dir, size=32, shard_rows=4)
+        assert index['rows'] == 15 and len(index['shards']) == 4 and index['classes'] == ['hello', 'stop', 'wave']
+
+        shards = image_shards.ImageShards(shards_dir)
+        paths, labels, _ = sign_classifier.list_dataset(signs_dir)
+        assert list(shards.labels) == list(labels)
+        frame, label = shards[9]
+        assert label == labels[9] and np.array_equal(frame, image_shards.load_image(paths[9], 32))
+        assert not frame.flags.writeable and frame.base is not None
+
+        frames, batch_labels = shards.batch([14, 0, 5, 9])
+        assert frames.shape == (4, 32, 32) and list(batch_labels) == [labels[i] for i in (14, 0, 5, 9)]
+        assert np.array_equal(frames[3], frame)
+
+        seen = []
+        for frames, batch_labels in shards.iter_batches(3, shuffle=True, seed=1):
+            assert len(frames) == len(batch_labels) <= 3 and not frames.flags.owndata
+            seen.extend(batch_labels)
+        assert sorted(seen) == sorted(labels)
+
+        mtime = os.stat(os.path.join(shards_dir, 'index.json')).st_mtime_ns
+        assert image_shards.pack(signs_dir, shards_dir, size=32, shard_rows=4) == index
+        assert os.stat(os.path.join(shards_dir, 'index.json')).st_mtime_ns == mtime
+        os.remove(paths[0])
+        assert image_shards.pack(signs_dir, shards_dir, size=32)['rows'] == 14
+
+
+def test_classifier_features_from_shards():
+    """Features from shards packed at the classifier's load size match featurizing the JPEGs"""
+    with tempfile.TemporaryDirectory() as directory:
+        signs_dir, shards_dir = os.path.join(directory, 'asl_signs'), os.path.join(directory, 'image_shards')
+        _write_frames(signs_dir, per_class=3, classes=('a', 'b'))
+        image_shards.pack(signs_dir, shards_dir)
+        paths, _, _ = sign_classifier.list_dataset(signs_dir)
+        assert np.allclose(sign_classifier.featurize_shards(image_shards.ImageShards(shards_dir)),
+                           sign_classifier.featurize_paths(paths))
+
+        sidecar = sign_classifier.train(signs_dir, os.path.join(directory, 'model.npy'), iterations=20,
+                                        shards_dir=shards_dir)
+        assert sidecar['classes'] == ['a', 'b'] and sidecar['metrics']['frames'] == 6
+
+
+if __name__ == "__main__":
+    test_pack_and_read_views()
+    test_classifier_features_from_shards()
+    print("✅ Image shard tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental retraining of the pattern model
+"""
+
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import incremental_training
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_training'))
+
+
+def _records(texts, start=0):
+    return [{'text': text, 'timestamp': 1000 + start + i, 'image_file': f"{start + i}.jpg"}
+            for i, text in enumerate(texts)]
+
+
+def test_incremental_matches_full_rebuild():
+    """Only changed texts are recomputed, and the result equals a rebuild from scratch"""
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'asl_patterns.json')
+        records = _records(['Open door', 'wave', 'open door', 'hello'])
+
+        model, changes = incremental_training.update_model(records, model_path)
+        assert changes['rebuilt'] and model['version'] == '1.0.1'
+        assert model['patterns']['open door']['timestamp'] == 1002
+        assert set(incremental_training.DEFAULT_COMMANDS) <= set(model['patterns'])
+
+        mtime = os.stat(model_path).st_mtime_ns
+        model, changes = incremental_training.update_model(list(reversed(records)), model_path)
+        assert (changes['added'], changes['removed'], model['version']) == (0, 0, '1.0.1')
+        assert os.stat(model_path).st_mtime_ns == mtime
+
+        records = records[1:] + _records(['wave', 'fetch'], start=10)
+        model, changes = incremental_training.update_model(records, model_path)
+        assert (changes['added'], changes['removed'], changes['patterns_updated']) == (2, 1, 3)
+        assert not changes['rebuilt'] and model['version'] == '1.0.2'
+        with open(model_path) as f:
+            assert json.load(f) == model
+
+        full, _ = incremental_training.update_model(records, os.path.join(directory, 'full.json'))
+        assert full['patterns'] == model['patterns']
+
+
+def test_removals_and_manifest_mismatch():
+    """Removed texts disappear (defaults fall back to built-ins); a stale manifest forces a rebuild"""
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'asl_patterns.json')
+        incremental_training.update_model(_records(['hello', 'fetch']), model_path)
+
+        model, changes = incremental_training.update_model([], model_path)
+        assert changes['removed'] == 2 and 'fetch' not in model['patterns']
+        assert model['patterns']['hello'] == incremental_training.DEFAULT_COMMANDS['hello']
+
+        model['version'] = '2.0.0'
+        with open(model_path, 'w') as f:
+            json.dump(model, f)
+        model, changes = incremental_training.update_model(_records(['fetch']), model_path)
+        assert changes['rebuilt'] and model['version'] == '2.0.1'
+        with open(incremental_training.manifest_path(model_path)) as f:
+            assert json.load(f)['model_version'] == '2.0.1'
+
+
+def test_full_training_picks_the_same_records():
+    """fast_baseline_training and incremental update_model build each text from the same record"""
+    import train_asl_model
+
+    records = [{'text': 'wave', 'timestamp': 1005, 'image_file': 'a.jpg'},
+               {'text': 'Wave', 'timestamp': 1001, 'image_file': 'b.jpg'},          # older, listed later
+               {'text': 'fetch', 'timestamp': '1970-01-01T00:20:00', 'image_file': 'c.jpg'},
+               {'text': 'fetch', 'timestamp': 1200.0, 'image_file': 'd.jpg'},       # same instant
+               {'text': 'fetch', 'image_file': 'e.jpg'}]                            # no timestamp
+    with tempfile.TemporaryDirectory() as directory:
+        incremental, _ = incremental_training.update_model(records[:2], os.path.join(directory, 'incremental.json'))
+        incremental, _ = incremental_training.update_model(records, os.path.join(directory, 'incremental.json'))
+
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            dataset = SimpleNamespace(custom_data=records, custom_hashes=[])
+            with open(train_asl_model.fast_baseline_training(dataset, 'cpu')) as f:
+                full = json.load(f)
+        finally:
+            os.chdir(cwd)
+        assert full['patterns'] == incremental['patterns']
+        assert full['patterns']['wave']['timestamp'] == 1005
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_rebuild()
+    test_removals_and_manifest_mismatch()
+    test_full_training_picks_the_same_records()
+    print("✅ Incremental training tests passed")
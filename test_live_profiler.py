@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for live profiling: the stack sampler and the admin-gated Flask hooks
+"""
+
+import time
+import threading
+
+from flask import Flask
+
+import admin_auth
+import live_profiler
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_starts_and_stops():
+    """profile_live samples other threads, joins its own thread and allows one run at a time"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name='busy-worker', daemon=True)
+    worker.start()
+    try:
+        results = []
+        runner = threading.Thread(target=lambda: results.append(live_profiler.profile_live(0.3, interval=0.005)))
+        runner.start()
+        time.sleep(0.05)
+        assert live_profiler.profile_live(0.1) is None  # already running
+        runner.join()
+    finally:
+        stop.set()
+        worker.join()
+
+    sampler = results[0]
+    assert sampler.samples > 5
+    assert any(stack.startswith('busy-worker;') and '_busy' in stack for stack in sampler.stacks)
+    assert not any(t.name == 'stack-sampler' for t in threading.enumerate())
+    assert live_profiler.profile_live(0.01) is not None  # lock released
+
+
+def _app():
+    app = Flask(__name__)
+    live_profiler.instrument_flask(app)
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+    return app
+
+
+def test_nothing_installed_without_token():
+    """With ADMIN_TOKEN unset no request hooks are added and /admin/profile is hidden"""
+    saved = admin_auth.ADMIN_TOKEN
+    admin_auth.ADMIN_TOKEN = None
+    try:
+        app = _app()
+        assert not app.before_request_funcs and not app.after_request_funcs
+        client = app.test_client()
+        assert client.get('/ping?profile=1').data == b'pong'
+        assert client.get('/admin/profile?seconds=0.01').status_code == 404
+    finally:
+        admin_auth.ADMIN_TOKEN = saved
+
+
+def test_profile_requires_token():
+    """?profile=1 and /admin/profile only work with the admin token"""
+    saved = admin_auth.ADMIN_TOKEN
+    admin_auth.ADMIN_TOKEN = 's3cret'
+    try:
+        client = _app().test_client()
+        assert client.get('/ping?profile=1').data == b'pong'
+        assert client.get('/ping?profile=1', headers={'X-Admin-Token': 'wrong'}).data == b'pong'
+        assert client.get('/admin/profile?seconds=0.01').status_code == 401
+
+        profiled = client.get('/ping?profile=1', headers={'X-Admin-Token': 's3cret'})
+        assert profiled.headers['X-Profiled-Status'] == '200' and b'function calls' in profiled.data
+        sampled = client.get('/admin/profile?seconds=0.05&format=json', headers={'X-Admin-Token': 's3cret'})
+        assert sampled.status_code == 200 and sampled.get_json()['samples'] > 0
+    finally:
+        admin_auth.ADMIN_TOKEN = saved
+
+
+if __name__ == "__main__":
+    test_sampler_starts_and_stops()
+    test_nothing_installed_without_token()
+    test_profile_requires_token()
+    print("✅ Live profiler tests passed")
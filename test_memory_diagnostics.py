@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for memory diagnostics: lazy RSS sampler, tracked sizes and the
+admin snapshot/diff endpoints
+"""
+
+import time
+
+from flask import Flask
+
+import admin_auth
+from memory_diagnostics import MemoryDiagnostics, instrument_flask
+
+
+def _app(diagnostics, **kwargs):
+    app = Flask(__name__)
+    instrument_flask(app, diagnostics=diagnostics, **kwargs)
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+    return app
+
+
+def test_sampler_starts_on_first_request():
+    """Instrumenting an app starts no thread; the first request does, and stop_sampler joins it"""
+    items = [1, 2, 3]
+    diagnostics = MemoryDiagnostics(rss_interval=0.01)
+    app = _app(diagnostics, tracked={'items': lambda: len(items), 'broken': lambda: 1 / 0})
+    assert diagnostics._sampler is None
+
+    app.test_client().get('/ping')
+    sampler = diagnostics._sampler
+    assert sampler is not None and sampler.is_alive()
+    deadline = time.time() + 5
+    while not diagnostics.rss_samples and time.time() < deadline:
+        time.sleep(0.01)
+    sample = diagnostics.rss_samples[0]
+    assert sample['tracked']['items'] == 3 and sample['tracked']['broken'].startswith('error:')
+
+    diagnostics.stop_sampler()
+    assert diagnostics._sampler is None and not sampler.is_alive()
+
+
+def test_snapshot_and_diff_endpoints():
+    """Endpoints need the admin token; diff reports growth between snapshots"""
+    diagnostics = MemoryDiagnostics(rss_interval=0)
+    client = _app(diagnostics).test_client()
+    token = admin_auth.ADMIN_TOKEN
+    admin_auth.ADMIN_TOKEN = 'secret'
+    try:
+        assert client.post('/admin/memory/snapshot').status_code == 401
+        headers = {'Authorization': 'Bearer secret'}
+        first = client.post('/admin/memory/snapshot', headers=headers).get_json()['id']
+        grown = [bytearray(1024) for _ in range(1000)]
+        diff = client.get(f'/admin/memory/diff?from={first}', headers=headers).get_json()
+        assert diff['from'] == first and diff['traced_diff_bytes'] > 1000 * 1024
+        assert client.get('/admin/memory/diff?from=999', headers=headers).status_code == 404
+        assert client.post('/admin/memory/stop', headers=headers).get_json() == {'status': 'stopped'}
+        assert not diagnostics.snapshots and len(grown) == 1000
+    finally:
+        admin_auth.ADMIN_TOKEN = token
+        diagnostics.stop_tracing()
+
+
+if __name__ == "__main__":
+    test_sampler_starts_on_first_request()
+    test_snapshot_and_diff_endpoints()
+    print("✅ Memory diagnostics tests passed")
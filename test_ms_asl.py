@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming MS-ASL reader
+"""
+
+import io
+import json
+import os
+import tempfile
+
+import ms_asl
+
+
+def test_chunk_boundaries():
+    """Elements split across chunks (including bare numbers) decode exactly like json.loads"""
+    data = ' [ 1 , 22,333 ,{"a": [1, 2], "b": "x,]"}, "tail" ]\n'
+    for chunk_size in (1, 2, 3, 7, 1000):
+        assert list(ms_asl.iter_json_array(io.StringIO(data), chunk_size)) == json.loads(data)
+    assert list(ms_asl.iter_json_array(io.StringIO('[]'))) == []
+
+
+def test_filters_and_early_stop():
+    """Label/signer filters apply while streaming; limit stops reading; splits are tagged"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        records = [{'label': i % 3, 'clean_text': ['hello', 'help', 'stop'][i % 3], 'signer_id': i % 4}
+                   for i in range(30)]
+        for split in ('val', 'test'):
+            with open(ms_asl.split_path(split, data_dir), 'w') as f:
+                json.dump(records, f)
+
+        assert ms_asl.available_splits(data_dir) == ['val', 'test']
+        stats = ms_asl.StreamStats()
+        hello = list(ms_asl.iter_records(data_dir=data_dir, labels=['hello'], stats=stats))
+        assert len(hello) == 20 and {r['split'] for r in hello} == {'val', 'test'}
+        assert stats.records_parsed == 60 and stats.records_yielded == 20
+
+        by_signer = list(ms_asl.iter_records('val', data_dir, labels=[1], signers=[1]))
+        assert [r['signer_id'] for r in by_signer] == [1, 1, 1]
+
+        stats = ms_asl.StreamStats()
+        assert len(list(ms_asl.iter_records(data_dir=data_dir, limit=5, stats=stats, chunk_size=64))) == 5
+        assert stats.records_parsed == 5 and stats.bytes_read < os.path.getsize(ms_asl.split_path('val', data_dir))
+
+
+if __name__ == "__main__":
+    test_chunk_boundaries()
+    test_filters_and_early_stop()
+    print("✅ MS-ASL streaming tests passed")
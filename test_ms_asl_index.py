@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped MS-ASL index
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import ms_asl
+import ms_asl_index
+
+
+def _write_splits(data_dir, count=40):
+    records = []
+    for i in range(count):
+        record = {'label': i % 5, 'clean_text': ['hello', 'help', 'stop', 'thank you', 'café'][i % 5],
+                  'org_text': f"Sign {i % 5}", 'text': f"sign {i % 5}", 'file': f"clip {i // 3}",
+                  'url': f"https://www.youtube.com/watch?v={i // 3}", 'signer_id': i % 7, 'signer': -1,
+                  'start': i, 'end': i + 30, 'start_time': i * 0.5, 'end_time': i * 0.5 + 1 + (i % 4) * 0.5,
+                  'fps': 25.0 if i % 2 else 29.97, 'width': 640.0, 'height': 360.0,
+                  'box': [0.1, 0.1, 0.1 + (i % 10) / 10, 0.9]}
+        if i % 6 == 0:
+            record['review'] = 1
+        records.append(record)
+    for split, part in (('val', records[:25]), ('test', records[25:])):
+        with open(ms_asl.split_path(split, data_dir), 'w') as f:
+            json.dump(part, f)
+    return records
+
+
+def test_build_and_round_trip():
+    """Columns are memory-mapped and every record reads back exactly as streamed"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_splits(data_dir)
+        assert ms_asl_index.is_stale(data_dir)
+        index = ms_asl_index.open_index(data_dir)
+        assert len(index) == 40 and not ms_asl_index.is_stale(data_dir)
+        assert isinstance(index['label'], np.memmap) and index['box'].shape == (40, 4)
+        assert index.records(range(len(index))) == list(ms_asl.iter_records(data_dir=data_dir))
+
+
+def test_queries_match_streaming_filters():
+    """Vectorized label/signer/split/duration/fps/box filters agree with plain Python filtering"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_splits(data_dir)
+        index = ms_asl_index.open_index(data_dir)
+        streamed = list(ms_asl.iter_records(data_dir=data_dir))
+
+        def expected(predicate):
+            return [i for i, record in enumerate(streamed) if predicate(record)]
+
+        assert list(index.select(labels=['hello', 2, 'missing'])) == expected(lambda r: r['label'] in (0, 2))
+        assert list(index.select(signers=[3], splits=['test'])) == \
+            expected(lambda r: r['signer_id'] == 3 and r['split'] == 'test')
+        assert list(index.select(min_duration=1.5, max_duration=2.0, min_fps=26)) == \
+            expected(lambda r: 1.5 <= r['end_time'] - r['start_time'] <= 2.0 and r['fps'] >= 26)
+        assert list(index.select(min_box_area=0.4)) == \
+            expected(lambda r: (r['box'][2] - r['box'][0]) * (r['box'][3] - r['box'][1]) >= 0.4)
+        assert list(index.select(labels=['café'], limit=3)) == expected(lambda r: r['clean_text'] == 'café')[:3]
+        assert index.class_counts()[:5].tolist() == [8, 8, 8, 8, 8]
+
+
+def test_rebuilt_when_split_changes():
+    """Changing a split file makes the index stale; open_index rebuilds it in place"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        records = _write_splits(data_dir)
+        assert len(ms_asl_index.open_index(data_dir)) == 40
+        with open(ms_asl.split_path('test', data_dir), 'w') as f:
+            json.dump(records[25:30], f)
+        assert ms_asl_index.is_stale(data_dir)
+        assert ms_asl_index.open_index(data_dir, build=False) is None
+        assert len(ms_asl_index.open_index(data_dir)) == 30
+        assert sorted(os.listdir(data_dir)) == ['MSASL_test.json', 'MSASL_val.json', 'index']
+
+
+if __name__ == "__main__":
+    test_build_and_round_trip()
+    test_queries_match_streaming_filters()
+    test_rebuilt_when_split_changes()
+    print("✅ MS-ASL index tests passed")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel, resumable radata/ conversion
+"""
+
+import json
+import os
+import tempfile
+
+import columnar_export
+import radata_convert
+
+
+def _write_samples(radata_dir, count, start=0):
+    os.makedirs(radata_dir, exist_ok=True)
+    for i in range(start, start + count):
+        sample = {'image_data': 'data:image/jpeg;base64,AAAA', 'recognized_text': f"sign {i % 3}",
+                  'timestamp': 1750000000 + i, 'confidence': 'high'}
+        with open(os.path.join(radata_dir, f"sample_{i:04d}.json"), 'w') as f:
+            json.dump(sample, f)
+
+
+def test_interrupted_run_resumes_into_one_part():
+    """A run stopped after some chunks resumes from the journal and packs everything into one part"""
+    with tempfile.TemporaryDirectory() as directory:
+        radata_dir, export_dir = os.path.join(directory, 'radata'), os.path.join(directory, 'columnar')
+        _write_samples(radata_dir, 25)
+        with open(os.path.join(radata_dir, 'no_text.json'), 'w') as f:
+            json.dump({'image_data': 'x'}, f)
+        with open(os.path.join(radata_dir, 'broken.json'), 'w') as f:
+            f.write('{"image_data": ')
+
+        stats = radata_convert.convert(radata_dir, export_dir, workers=1, chunk_files=10, max_chunks=2)
+        assert not stats.complete and stats.converted == 19 and stats.failed == 1
+        journal = radata_convert.journal_path(export_dir, radata_dir)
+        assert len(radata_convert.read_journal(journal)) == 2
+        assert columnar_export.read_manifest(export_dir)['parts'] == []
+
+        # Crash mid-append: the torn line is ignored
+        with open(journal, 'a') as f:
+            f.write('{"files": ["sample_00')
+        stats = radata_convert.convert(radata_dir, export_dir, workers=2, chunk_files=10)
+        assert stats.complete and (stats.resumed, stats.converted, stats.failed) == (19, 7, 1)
+        assert stats.rows == 25 and not os.path.exists(journal)
+
+        manifest = columnar_export.read_manifest(export_dir)
+        assert len(manifest['parts']) == 1 and manifest['rows'] == 25
+        assert 'no_text.json' in manifest['sources'][radata_dir]['files']
+        assert 'broken.json' not in manifest['sources'][radata_dir]['files']
+        columns = columnar_export.load_columns(export_dir)
+        assert list(columns.column('image_file')) == [f"sample_{i:04d}.jpg" for i in range(25)]
+
+        # Only new files on the next run
+        _write_samples(radata_dir, 5, start=25)
+        stats = radata_convert.convert(radata_dir, export_dir, workers=1)
+        assert (stats.files, stats.rows) == (6, 5)
+        assert columnar_export.read_manifest(export_dir)['rows'] == 30
+
+
+if __name__ == "__main__":
+    test_interrupted_run_resumes_into_one_part()
+    print("✅ radata conversion tests passed")
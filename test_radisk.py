@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming radisk reader
+"""
+
+import base64
+import io
+import json
+import os
+import tempfile
+
+from PIL import Image
+
+import columnar_export
+import radata_convert
+import radisk
+
+E = radisk.ESC
+
+
+def _leaf(value, state=1750000000000):
+    return {'': {':': value, '>': state}}
+
+
+def _frame():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'white').save(buffer, 'JPEG')
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def _write_radata(radata_dir):
+    """Two shards in relay layout: signs/ before the session copies, one leaf without its "" level"""
+    os.makedirs(radata_dir)
+    first = {'s': {
+        'essions': {'/scan_1': {E: {'id': _leaf('scan_1'), 'startTime': _leaf(1750000000000)},
+                                '/signs' + E + 'mcA': _leaf({'#': 'mcA'})}},
+        'igns': {'/sign-1' + E: {'id': _leaf('sign-1'), 'name': _leaf('hello'), 'confidence': _leaf('High')},
+                 '/sign-2' + E: {'name': {':': 'stop', '>': 1}}},
+    }}
+    second = {'mcA' + E: {'id': _leaf('sign-1'), 'sessionId': _leaf('scan_1')},
+              'td1' + E: {'sign': _leaf('help'), 'imageData': _leaf(_frame()), 'timestamp': _leaf(17)}}
+    with open(os.path.join(radata_dir, '!'), 'w') as f:
+        f.write(json.dumps(first))
+    with open(os.path.join(radata_dir, 'mc'), 'w') as f:
+        f.write(json.dumps(second))
+    with open(os.path.join(radata_dir, radisk.DIRECTORY_FILE), 'w') as f:
+        f.write(json.dumps({'!': {'': 1}, 'mc': {'': 1}}))
+
+
+def test_streaming_matches_whole_shard_and_rebuilds_records():
+    """Any chunk size yields the same leaves; nodes and joined records come out of two shards"""
+    with tempfile.TemporaryDirectory() as directory:
+        radata_dir = os.path.join(directory, 'radata')
+        _write_radata(radata_dir)
+        shard = os.path.join(radata_dir, '!')
+        expected = list(radisk.iter_leaves(shard))
+        assert ('signs/sign-1' + E + 'name', ':', 'hello') in expected
+        assert ('sessions/scan_1/signs' + E + 'mcA', ':#', 'mcA') in expected
+        assert ('signs/sign-2' + E + 'name', ':', 'stop') in expected
+        for chunk_size in (1, 5, 64):
+            assert list(radisk.iter_leaves(shard, chunk_size)) == expected
+
+        assert [os.path.basename(path) for path in radisk.shard_files(radata_dir)] == ['!', 'mc']
+        nodes = dict(radisk.iter_nodes(radata_dir))
+        assert nodes['sessions/scan_1/signs'] == {'mcA': {'#': 'mcA'}}
+        assert nodes['signs/sign-1'] == {'id': 'sign-1', 'name': 'hello', 'confidence': 'High'}
+
+        stats = radisk.RadiskStats()
+        records = list(radisk.iter_records(radata_dir, chunk_size=16, stats=stats))
+        assert ('session', {'id': 'scan_1', 'startTime': 1750000000000}) in records
+        assert ('sign', {'id': 'sign-1', 'name': 'hello', 'confidence': 'High', 'sessionId': 'scan_1'}) in records
+        assert ('sign', {'id': 'sign-2', 'name': 'stop'}) in records
+        assert [record['soul'] for kind, record in records if kind == 'training_data'] == ['td1']
+        assert stats.shards == 2 and stats.nodes == 6
+
+
+def test_convert_radisk_exports_once():
+    with tempfile.TemporaryDirectory() as directory:
+        radata_dir, export_dir = os.path.join(directory, 'radata'), os.path.join(directory, 'columnar')
+        _write_radata(radata_dir)
+        assert radata_convert.convert_radisk(radata_dir, export_dir, directory) == 3
+        assert radata_convert.convert_radisk(radata_dir, export_dir, directory) == 0
+
+        rows = list(columnar_export.load_columns(export_dir).records())
+        sample = next(row for row in rows if row['source'] == 'gun_training_data')
+        assert sample['text'] == 'help' and os.path.exists(columnar_export.image_path(sample))
+        assert {row['text'] for row in rows} == {'hello', 'stop', 'help'}
+
+        # A rewritten shard is streamed again, but only unseen records are added
+        os.utime(os.path.join(radata_dir, '!'), ns=(1, 1))
+        assert radata_convert.convert_radisk(radata_dir, export_dir, directory) == 0
+        assert columnar_export.read_manifest(export_dir)['rows'] == 3
+
+
+if __name__ == "__main__":
+    test_streaming_matches_whole_shard_and_rebuilds_records()
+    test_convert_radisk_exports_once()
+    print("✅ radisk reader tests passed")
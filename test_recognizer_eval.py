@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the MS-ASL recognizer evaluation
+"""
+
+import os
+import json
+import tempfile
+
+import numpy as np
+
+import recognizer_eval
+
+
+def _write_ms_asl(directory):
+    classes = ['hello', 'father', 'stop']
+    with open(os.path.join(directory, 'MSASL_classes.json'), 'w') as f:
+        json.dump(classes, f)
+    with open(os.path.join(directory, 'MSASL_synonym.json'), 'w') as f:
+        json.dump([['father', 'dad', 'daddy']], f)
+    records = {
+        'val': [{'label': 0, 'clean_text': 'hello', 'org_text': 'HELLO', 'signer_id': 1},
+                {'label': 1, 'clean_text': 'dad', 'org_text': 'DAD', 'signer_id': 2}],
+        'test': [{'label': 2, 'clean_text': 'stop', 'org_text': 'stop', 'signer_id': 3},
+                 {'label': 1, 'clean_text': 'father', 'org_text': 'FATHER', 'signer_id': 1}],
+    }
+    for split, rows in records.items():
+        with open(os.path.join(directory, f"MSASL_{split}.json"), 'w') as f:
+            json.dump(rows, f)
+
+
+def test_confusion_matrix_and_metrics():
+    """Counts land in gold rows / predicted columns; undefined precision and recall are 0"""
+    classes = ['a', 'b', '<none>']
+    matrix = recognizer_eval.confusion_matrix(np.array(['a', 'a', 'b', 'b']), np.array(['a', 'b', 'b', '<none>']),
+                                              classes)
+    assert matrix.tolist() == [[1, 1, 0], [0, 1, 1], [0, 0, 0]]
+    tp, support, predicted, precision, recall, f1 = recognizer_eval.class_metrics(matrix)
+    assert tp.tolist() == [1, 1, 0] and support.tolist() == [2, 2, 0] and predicted.tolist() == [1, 2, 1]
+    assert np.allclose(precision, [1.0, 0.5, 0.0]) and np.allclose(recall, [0.5, 0.5, 0.0])
+    assert np.allclose(f1, [2 / 3, 0.5, 0.0])
+
+
+def test_evaluate_resolves_synonyms_and_runs_each_input_once():
+    """Gold labels come from the class list, synonyms collapse, identical inputs hit the recognizer once"""
+    with tempfile.TemporaryDirectory() as directory:
+        _write_ms_asl(directory)
+        synonyms = recognizer_eval.load_synonyms(directory)
+        inputs, gold, splits, fields = recognizer_eval.load_items(data_dir=directory, synonyms=synonyms)
+        assert len(inputs) == 8 and sorted(set(gold.tolist())) == ['father', 'hello', 'stop']
+
+        calls = []
+
+        def recognize(text):
+            calls.append(text)
+            return {'hello': 'hello', 'dad': 'Daddy', 'father': 'hello'}.get(text.lower())
+
+        report = recognizer_eval.evaluate(inputs, gold, recognize, synonyms, {'split': splits})
+        assert len(calls) == len(set(inputs.tolist())) == 7 == report['distinct_inputs']
+        assert report['items'] == 8 and report['accuracy'] == 0.5 and report['detected_rate'] == 0.75
+        assert report['classes']['father'] == {'support': 4, 'predicted': 2, 'correct': 2, 'precision': 1.0,
+                                               'recall': 0.5, 'f1': 0.6667}
+        assert report['classes']['stop']['recall'] == 0.0 and report['accuracy_by_split'] == {'test': 0.0, 'val': 1.0}
+        assert report['confusion'][0] == ['father', 'father', 2] and ['stop', '<none>', 2] in report['confusion']
+
+        worse = dict(report, accuracy=0.25, classes=dict(report['classes'], father=dict(report['classes']['father'],
+                                                                                      recall=0.25)))
+        assert recognizer_eval.compare(report, worse) == ['accuracy: 0.25 → 0.5 (+0.25)',
+                                                          'recall father: 0.25 → 0.5']
+
+
+def test_first_sign_parses_server_output():
+    """The prediction is read from the SIGN lines process_asl_response appends"""
+    output = ("I see a wave\n\nDETECTED ASL COMMANDS:\nSIGN: hello | CONFIDENCE: High | ACTION: greeting\n"
+              "KEYWORD: wave\nSIGN: stop | CONFIDENCE: Medium | ACTION: system_stop\n")
+    assert recognizer_eval.first_sign(output) == 'hello'
+    assert recognizer_eval.first_sign("x\n\nASL RECOGNITION: No clear sign language detected in this frame.") is None
+
+
+if __name__ == "__main__":
+    test_confusion_matrix_and_metrics()
+    test_evaluate_resolves_synonyms_and_runs_each_input_once()
+    test_first_sign_parses_server_output()
+    print("✅ Recognizer evaluation tests passed")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for request tracing: header propagation and the admin-only trace viewer
+"""
+
+from flask import Flask
+
+import admin_auth
+from request_tracing import PARENT_HEADER, TRACE_HEADER, TraceCollector, instrument_flask
+
+
+def _client():
+    collector = TraceCollector(trace_file=None)
+    app = Flask(__name__)
+    instrument_flask(app, 'test', collector=collector)
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+    return app.test_client(), collector
+
+
+def test_incoming_trace_is_continued():
+    """A request with trace headers joins that trace and echoes its id"""
+    client, collector = _client()
+    response = client.get('/ping', headers={TRACE_HEADER: 'a' * 32, PARENT_HEADER: 'b' * 16})
+    assert response.headers[TRACE_HEADER] == 'a' * 32
+    span = collector.spans[-1]
+    assert span['trace_id'] == 'a' * 32 and span['parent_id'] == 'b' * 16 and span['name'] == 'GET /ping'
+
+
+def test_debug_traces_requires_admin_token():
+    """/debug/traces is hidden without ADMIN_TOKEN and rejects a wrong token"""
+    client, _ = _client()
+    client.get('/ping')
+    token = admin_auth.ADMIN_TOKEN
+    try:
+        admin_auth.ADMIN_TOKEN = None
+        assert client.get('/debug/traces').status_code == 404
+        admin_auth.ADMIN_TOKEN = 'secret'
+        assert client.get('/debug/traces').status_code == 401
+        assert client.get('/debug/traces', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+        response = client.get('/debug/traces', headers={'X-Admin-Token': 'secret'})
+        assert response.status_code == 200 and response.get_json()['count'] >= 1
+    finally:
+        admin_auth.ADMIN_TOKEN = token
+
+
+if __name__ == "__main__":
+    test_incoming_trace_is_continued()
+    test_debug_traces_requires_admin_token()
+    print("✅ Request tracing tests passed")
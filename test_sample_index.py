@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite training sample index: counters, filters, pagination
+and rebuilding from samples.jsonl
+"""
+
+import os
+import tempfile
+
+from frame_store import FrameStore
+from sample_index import SampleIndex
+
+
+def _sample(sign, session_id, logged_at):
+    return {'sign': sign, 'session_id': session_id, 'timestamp': logged_at * 1000, 'logged_at': logged_at,
+            'frame': 'ab' * 32, 'ext': 'jpg', 'bytes': 100}
+
+
+def test_counters_filters_and_pages():
+    """Counters follow batches; queries filter and page newest-first"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = SampleIndex(os.path.join(directory, 'samples.db'))
+        index.add_batch([_sample(['hello', 'stop'][i % 2], f"s{i % 3}", 1000.0 + i) for i in range(10)])
+        index.add_batch([_sample('hello', 's0', 2000.0)])
+
+        assert index.sign_counts() == {'hello': 6, 'stop': 5}
+        assert index.total() == 11
+
+        page, cursor = index.query(limit=4)
+        assert [row['id'] for row in page] == [11, 10, 9, 8] and cursor == 8
+        page, cursor = index.query(limit=4, before_id=cursor)
+        assert [row['id'] for row in page] == [7, 6, 5, 4]
+
+        rows, _ = index.query(sign='hello', session_id='s0')
+        assert [row['logged_at'] for row in rows] == [2000.0, 1006.0, 1000.0]
+        rows, cursor = index.query(since=1003.0, until=1005.0)
+        assert [row['logged_at'] for row in rows] == [1005.0, 1004.0, 1003.0] and cursor is None
+
+
+def test_catch_up_rebuilds_from_log():
+    """A missing or stale index is rebuilt from the metadata log"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FrameStore(directory)
+        store.append_samples([_sample('help', 's1', 1000.0 + i) for i in range(5)])
+        index = SampleIndex(os.path.join(store.root, 'samples.db'))
+        assert index.catch_up(store.samples_path) == 5
+        assert index.catch_up(store.samples_path) == 0
+
+        store.append_samples([_sample('stop', 's1', 1010.0)])
+        assert index.catch_up(store.samples_path) == 1
+        assert index.sign_counts() == {'help': 5, 'stop': 1}
+        assert index.indexed_offset() == store.samples_size()
+
+
+def test_failed_batch_is_retried():
+    """Rows from a batch whose insert failed are indexed by the next catch-up, not skipped"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FrameStore(directory)
+        index = SampleIndex(os.path.join(store.root, 'samples.db'))
+        store.append_samples([_sample('help', 's1', 1000.0 + i) for i in range(3)])
+
+        add_batch = index.add_batch
+        def failing_add_batch(samples, log_offset=None):
+            raise OSError('disk full')
+        index.add_batch = failing_add_batch
+        try:
+            index.catch_up(store.samples_path)
+        except OSError:
+            pass
+        else:
+            raise AssertionError('expected the insert to fail')
+        index.add_batch = add_batch
+        assert index.indexed_offset() == 0
+
+        store.append_samples([_sample('stop', 's1', 1010.0)])
+        assert index.catch_up(store.samples_path) == 4
+        assert index.sign_counts() == {'help': 3, 'stop': 1}
+        assert index.indexed_offset() == store.samples_size()
+
+
+if __name__ == "__main__":
+    test_counters_filters_and_pages()
+    test_catch_up_rebuilds_from_log()
+    test_failed_batch_is_retried()
+    print("✅ Sample index tests passed")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process metrics: text rendering, histogram buckets, label
+validation and the Flask in-flight gauge
+"""
+
+from flask import Flask
+
+import server_metrics
+from server_metrics import Registry, instrument_flask
+
+
+def test_render_counters_and_gauges():
+    """Series render sorted by labels with escaped values; integral floats print as ints"""
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ('route',))
+    requests.labels('/b').inc()
+    requests.labels('/a"x').inc(2.5)
+    depth = registry.gauge('queue_depth', 'Depth.')
+    depth.set(7)
+    depth.dec(2)
+
+    lines = requests.render() + depth.render()
+    assert lines == [
+        '# HELP requests_total Requests.', '# TYPE requests_total counter',
+        'requests_total{route="/a\\"x"} 2.5', 'requests_total{route="/b"} 1',
+        '# HELP queue_depth Depth.', '# TYPE queue_depth gauge', 'queue_depth 5',
+    ]
+    text = registry.render()
+    assert text.endswith('queue_depth 5\n') and 'process_start_time_seconds' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Each value lands in the first bucket >= it; buckets render cumulatively up to +Inf"""
+    histogram = Registry().histogram('latency_seconds', 'Latency.', buckets=(1, 0.1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 3.65',
+        'latency_seconds_count 4',
+    ]
+
+
+def test_label_validation():
+    """Wrong label counts and re-registering a name as another type are rejected"""
+    registry = Registry()
+    counter = registry.counter('hits_total', 'Hits.', ('cache', 'result'))
+    assert registry.counter('hits_total', 'Hits.', ('cache', 'result')) is counter
+    for bad in [lambda: counter.labels('only-one'), lambda: registry.gauge('hits_total', 'Hits.')]:
+        try:
+            bad()
+        except ValueError:
+            continue
+        raise AssertionError('accepted invalid labels')
+
+
+def test_in_flight_gauge_survives_disable_mid_request():
+    """Switching metrics off during a request still releases its in-flight slot"""
+    registry = Registry()
+    app = Flask(__name__)
+    app.logger.disabled = True  # the /fail traceback is expected
+    instrument_flask(app, registry=registry, service='test')
+
+    @app.route('/toggle')
+    def toggle():
+        server_metrics.set_enabled(False)
+        return 'off'
+
+    @app.route('/fail')
+    def fail():
+        server_metrics.set_enabled(False)
+        raise RuntimeError('boom')
+
+    client = app.test_client()
+    in_flight = registry.get('http_requests_in_flight')
+    try:
+        client.get('/toggle')
+        assert in_flight.get('test', '/toggle') == 0
+        server_metrics.set_enabled(True)
+        assert client.get('/fail').status_code == 500
+        assert in_flight.get('test', '/fail') == 0
+    finally:
+        server_metrics.set_enabled(True)
+
+
+if __name__ == "__main__":
+    test_render_counters_and_gauges()
+    test_histogram_buckets_are_cumulative()
+    test_label_validation()
+    test_in_flight_gauge_survives_disable_mid_request()
+    print("✅ Server metrics tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy sign classifier
+"""
+
+import io
+import os
+import json
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+import sign_classifier
+
+
+def _shape_frames(label, count, size=128, seed=0):
+    """Noisy frames of a disc (0), horizontal bar (1) or vertical bar (2) at random positions"""
+    rng = np.random.default_rng(seed + label)
+    yy, xx = np.mgrid[:size, :size]
+    frames = []
+    for _ in range(count):
+        cy, cx = rng.integers(size // 3, 2 * size // 3, 2)
+        r = int(rng.integers(size // 8, size // 4))
+        if label == 0:
+            mask = (yy - cy) ** 2 + (xx - cx) ** 2 < r * r
+        elif label == 1:
+            mask = (abs(yy - cy) < r // 4) & (abs(xx - cx) < r)
+        else:
+            mask = (abs(xx - cx) < r // 4) & (abs(yy - cy) < r)
+        frames.append(np.clip(rng.normal(90, 20, (size, size)) + mask * 120, 0, 255).astype(np.uint8))
+    return frames
+
+
+def test_features_are_batched_and_fixed_size():
+    """Any frame size >= 64px gives FEATURE_DIM features; batching does not change the result"""
+    frames = np.stack(_shape_frames(0, 4, size=160))
+    features = sign_classifier.extract_features(frames)
+    assert features.shape == (4, sign_classifier.FEATURE_DIM) and features.dtype == np.float32
+    assert np.allclose(features[1:2], sign_classifier.extract_features(frames[1:2]), atol=1e-6)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, frame in enumerate(_shape_frames(1, 5)):
+            paths.append(os.path.join(directory, f"{i}.png"))
+            Image.fromarray(frame).save(paths[-1])
+        # Autotuned batch size and worker threads give the same features as the defaults
+        assert np.array_equal(sign_classifier.featurize_paths(paths, batch_size=2, workers=2),
+                              sign_classifier.featurize_paths(paths))
+
+
+def test_train_save_and_classify():
+    """Trains from signs_dir/<class>/ JPEGs; float16 weights are memory-mapped and classify new frames"""
+    with tempfile.TemporaryDirectory() as signs_dir, tempfile.TemporaryDirectory() as model_dir:
+        for label, name in enumerate(['hello', 'lights on', 'stop']):
+            os.makedirs(os.path.join(signs_dir, name))
+            for i, frame in enumerate(_shape_frames(label, 20)):
+                Image.fromarray(frame).save(os.path.join(signs_dir, name, f"{i:03d}.jpg"), quality=90)
+        model_path = os.path.join(model_dir, 'sign_classifier.npy')
+
+        sidecar = sign_classifier.train(signs_dir, model_path, iterations=200)
+        assert sidecar['classes'] == ['hello', 'lights on', 'stop']
+        assert sidecar['metrics']['holdout_frames'] == 12 and sidecar['metrics']['holdout_accuracy'] >= 0.9
+        with open(sign_classifier.sidecar_path(model_path)) as f:
+            assert json.load(f)['weights_dtype'] == 'float16'
+
+        classifier = sign_classifier.SignClassifier(model_path)
+        assert isinstance(classifier.matrix, np.memmap) and classifier.matrix.dtype == np.float16
+        assert classifier.matrix.shape == (sign_classifier.FEATURE_DIM + 1, 3)
+        new_frames = [_shape_frames(label, 5, seed=100)[4] for label in range(3)]
+        results = classifier.classify_frames(np.stack(new_frames))
+        assert [sign for sign, _ in results] == ['hello', 'lights on', 'stop']
+        assert all(0 < confidence <= 1 for _, confidence in results)
+
+        buffer = io.BytesIO()
+        Image.fromarray(new_frames[2]).save(buffer, format='JPEG')
+        assert classifier.classify(buffer.getvalue())[0] == 'stop'
+
+
+def test_needs_two_classes():
+    with tempfile.TemporaryDirectory() as signs_dir:
+        os.makedirs(os.path.join(signs_dir, 'hello'))
+        assert sign_classifier.train(signs_dir, os.path.join(signs_dir, 'model.npy')) is None
+
+
+if __name__ == "__main__":
+    test_features_are_batched_and_fixed_size()
+    test_train_save_and_classify()
+    test_needs_two_classes()
+    print("✅ Sign classifier tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for off-thread structured logging: JSON lines, record snapshots,
+per-route sampling and the bounded queue
+"""
+
+import io
+import json
+import queue
+import logging
+
+import structured_log
+from structured_log import DroppingQueueHandler, RouteSampler, log_event, parse_sample_rates
+
+
+def _capture(fn, **kwargs):
+    """Run fn with logging routed to a StringIO; restore the root logger afterwards"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    stream = io.StringIO()
+    structured_log.setup_logging('test', stream=stream, **kwargs)
+    try:
+        fn(logging.getLogger('test_structured_log'))
+    finally:
+        structured_log.shutdown_logging()
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_snapshot_args_and_traceback():
+    """Args are merged when logged, not when written; tracebacks become an 'exc' field"""
+    def log(logger):
+        items = ['a']
+        logger.info("items %s", items, extra={'route': '/x'})
+        items.append('b')
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger.exception("failed")
+        log_event(logger, '/y', "sign %s", 'hello', confidence=0.9)
+
+    first, second, third = _capture(log)
+    assert first['msg'] == "items ['a']" and first['route'] == '/x' and first['service'] == 'test'
+    assert second['level'] == 'ERROR' and 'ValueError: boom' in second['exc']
+    assert 'boom' not in second['msg']
+    assert third['msg'] == 'sign hello' and third['confidence'] == 0.9
+
+
+def test_setup_logging_leaves_caller_info_alone():
+    """setup_logging doesn't disable caller file/line collection for other handlers"""
+    srcfile = logging._srcfile
+    _capture(lambda logger: logger.info("hi"))
+    assert logging._srcfile == srcfile
+
+
+def test_route_sampling():
+    """Rates are parsed and clamped; warnings always pass"""
+    assert parse_sample_rates("/a=0.1, /b=2,bad") == {'/a': 0.1, '/b': 1.0}
+    sampler = RouteSampler({'/quiet': 0.0})
+    assert not sampler.keep('/quiet', logging.INFO)
+    assert sampler.keep('/quiet', logging.WARNING)
+    assert sampler.keep('/other', logging.INFO)
+
+    lines = _capture(lambda logger: [log_event(logger, '/quiet', "dropped"),
+                                     log_event(logger, '/quiet', "kept", level=logging.ERROR)],
+                     sample_rates={'/quiet': 0.0})
+    assert [line['msg'] for line in lines] == ['kept']
+
+
+def test_full_queue_drops_records():
+    """A full queue counts the record as dropped instead of blocking"""
+    handler = DroppingQueueHandler(queue.SimpleQueue(), maxsize=1)
+    dropped = structured_log.DROPPED.get()
+    for i in range(3):
+        handler.emit(logging.LogRecord('t', logging.INFO, __file__, 1, "n=%d", (i,), None))
+    assert handler.queue.qsize() == 1 and handler.queue.get().msg == 'n=0'
+    assert structured_log.DROPPED.get() == dropped + 2
+
+
+if __name__ == "__main__":
+    test_json_lines_snapshot_args_and_traceback()
+    test_setup_logging_leaves_caller_info_alone()
+    test_route_sampling()
+    test_full_queue_drops_records()
+    print("✅ Structured log tests passed")
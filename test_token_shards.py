@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for pre-tokenized token shards
+"""
+
+import os
+import json
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+import token_shards
+
+
+class TinyProcessor:
+    """Stand-in for the SmolVLM processor: 16x16 normalized RGB, 4 image tokens, then one token id per word"""
+
+    name_or_path = 'tiny-test-processor'
+    image_token_id = 3
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, images, text, return_tensors='np'):
+        self.calls += 1
+        pixels = np.asarray(images.resize((16, 16)), dtype=np.float32).transpose(2, 0, 1) / 255.0 - 0.5
+        ids = [1] + [self.image_token_id] * 4 + [sum(map(ord, word)) % 1000 + 4 for word in text.split()]
+        return {'pixel_values': pixels[None], 'input_ids': np.array([ids])}
+
+
+def _samples(directory, count):
+    samples = []
+    for i in range(count):
+        path = os.path.join(directory, f"{i}.png")
+        Image.new('RGB', (40, 30), color=(i * 20 % 256, 100, 200)).save(path)
+        samples.append((path, f"This is an ASL sign for: sign {i}" + ' extra' * (i % 3) * 20))
+    return samples
+
+
+def test_shards_match_on_the_fly_processing():
+    """Items equal processor output (float16 pixels, padded/truncated ids) across shard boundaries"""
+    with tempfile.TemporaryDirectory() as directory:
+        samples = _samples(directory, 8) + [(None, 'This is an ASL sign for: missing image')]
+        shards_dir = os.path.join(directory, 'shards')
+        processor = TinyProcessor()
+        index = token_shards.build_shards(samples, processor, shards_dir, shard_size=4, max_length=16)
+        assert [shard['rows'] for shard in index['shards']] == [4, 4, 1]
+        assert index['pixel_shape'] == [3, 16, 16] and index['truncated'] == 5
+
+        dataset = token_shards.ShardedTokenDataset(shards_dir)
+        assert len(dataset) == 9
+        for i, (path, text) in enumerate(samples):
+            pixels, ids = token_shards._process(TinyProcessor(), token_shards.open_image(path), text)
+            item = dataset[i]
+            assert np.allclose(item['pixel_values'], pixels, atol=1e-3)
+            length = min(len(ids), 16)
+            assert item['input_ids'][:length].tolist() == ids[:length].tolist()
+            assert item['attention_mask'].dtype == np.int64 and item['attention_mask'].sum() == length
+            assert not item['input_ids'][length:].any()
+            # Padding is ignored by the loss
+            assert item['labels'][:length].tolist() == ids[:length].tolist() and (item['labels'][length:] == -100).all()
+        assert dataset[-1]['input_ids'].tolist() == dataset[8]['input_ids'].tolist()
+
+        batch = dataset.batch([8, 0, 5])
+        assert batch['pixel_values'].shape == (3, 3, 16, 16)
+        assert batch['input_ids'].tolist() == [dataset[i]['input_ids'].tolist() for i in (8, 0, 5)]
+        assert batch['labels'].tolist() == [dataset[i]['labels'].tolist() for i in (8, 0, 5)]
+
+
+def test_max_length_defaults_to_longest_and_keeps_image_tokens():
+    """Unset max_length pads to the longest sample; a max_length that cuts image tokens is an error"""
+    with tempfile.TemporaryDirectory() as directory:
+        samples = _samples(directory, 3)
+        shards_dir = os.path.join(directory, 'shards')
+        index = token_shards.build_shards(samples, TinyProcessor(), shards_dir)
+        longest = max(len(token_shards._process(TinyProcessor(), token_shards.open_image(path), text)[1])
+                      for path, text in samples)
+        assert index['max_length'] == longest and index['truncated'] == 0
+
+        try:
+            token_shards.build_shards(samples, TinyProcessor(), os.path.join(directory, 'cut'), max_length=3)
+            raise AssertionError('image tokens were truncated')
+        except ValueError:
+            pass
+        assert sorted(os.listdir(directory)) == sorted([f"{i}.png" for i in range(3)] + ['shards'])
+
+
+def test_items_are_views_and_rebuild_only_on_change():
+    """Items share memory with the mapped shard; unchanged samples are not reprocessed"""
+    with tempfile.TemporaryDirectory() as directory:
+        samples = _samples(directory, 5)
+        shards_dir = os.path.join(directory, 'shards')
+        processor = TinyProcessor()
+        token_shards.build_shards(samples, processor, shards_dir)
+        dataset = token_shards.ShardedTokenDataset(shards_dir)
+        pixels, _, _ = dataset.shard(0)
+        assert isinstance(pixels, np.memmap) and np.shares_memory(dataset[2]['pixel_values'], pixels)
+        assert dataset[2]['pixel_values'].flags.writeable  # copy-on-write, so torch.from_numpy is zero-copy
+
+        token_shards.build_shards(samples, processor, shards_dir)
+        assert processor.calls == 5
+        with open(samples[0][0], 'ab') as f:
+            f.write(b'\0')
+        index = token_shards.build_shards(samples, processor, shards_dir)
+        assert processor.calls == 10 and index['rows'] == 5
+        assert sorted(os.listdir(directory)) == sorted([f"{i}.png" for i in range(5)] + ['shards'])
+        with open(os.path.join(shards_dir, token_shards.INDEX)) as f:
+            assert json.load(f)['fingerprint'] == index['fingerprint']
+
+
+if __name__ == "__main__":
+    test_shards_match_on_the_fly_processing()
+    test_max_length_defaults_to_longest_and_keeps_image_tokens()
+    test_items_are_views_and_rebuild_only_on_change()
+    print("✅ Token shard tests passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the training batch size / worker autotuner
+"""
+
+import os
+import tempfile
+import time
+
+import training_autotune
+
+
+def _workload(per_sample_seconds=0.0005, step_overhead=0.004, max_batch=16):
+    """Synthetic step: fixed overhead plus per-sample cost, so bigger batches are faster up to max_batch"""
+    def load_batch(batch_size):
+        if batch_size > max_batch:
+            raise MemoryError
+        return [0] * batch_size
+
+    def train_step(batch):
+        time.sleep(step_overhead + per_sample_seconds * len(batch))
+
+    return load_batch, train_step
+
+
+def test_autotune_picks_fastest_and_caches():
+    """Largest batch that fits wins; the result is cached per host fingerprint and workload"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'autotune_cache.json')
+        load_batch, train_step = _workload()
+        result = training_autotune.autotune('synthetic', load_batch, train_step, batch_sizes=(2, 8, 16, 32),
+                                            worker_counts=(0, 1), target_effective_batch=32,
+                                            trial_seconds=0.1, cache_path=cache_path)
+        assert result['batch_size'] == 16 and result['gradient_accumulation_steps'] == 2
+        assert result['dataloader_num_workers'] in (0, 1, 2)
+        assert result['trials'][-3] == {'batch_size': 32, 'skipped': 'MemoryError'}
+
+        fingerprint, host = training_autotune.host_fingerprint('cpu')
+        assert host['cpus'] == os.cpu_count()
+        assert fingerprint != training_autotune.host_fingerprint('mps')[0]
+        assert training_autotune.cached_result('synthetic', cache_path=cache_path) == result
+        assert training_autotune.cached_result('synthetic', 'mps', cache_path) is None
+
+        # Cached: no trial runs at all
+        def fail(batch_size):
+            raise AssertionError('autotune should have used the cache')
+        assert training_autotune.autotune('synthetic', fail, train_step, cache_path=cache_path) == result
+
+
+def test_memory_budget_caps_batch_size():
+    """Batches whose measured peak allocation does not fit the budget are never timed"""
+    def load_batch(batch_size):
+        return bytearray(batch_size * 100_000)
+
+    result = training_autotune.autotune('budget', load_batch, lambda batch: time.sleep(0.002), batch_sizes=(1, 2, 4, 8),
+                                        worker_counts=(0,), memory_budget=2_000_000, trial_seconds=0.05,
+                                        cache_path=None)
+    assert result['batch_size'] == 2
+    assert result['trials'][2]['skipped'] == 'memory budget'
+
+
+def test_frame_classifier_workload_runs():
+    with tempfile.TemporaryDirectory() as directory:
+        load_batch, train_step = training_autotune.frame_classifier_workload(directory)
+        features, labels = load_batch(3)
+        assert features.shape == (3, training_autotune.sign_classifier.FEATURE_DIM) and len(labels) == 3
+        train_step((features, labels))
+
+
+if __name__ == "__main__":
+    test_autotune_picks_fastest_and_caches()
+    test_memory_budget_caps_batch_size()
+    test_frame_classifier_workload_runs()
+    print("✅ Training autotune tests passed")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Pre-tokenized, memory-mapped dataset shards for SmolVLM fine-tuning
+The processor runs once per sample at build time. pixel_values and input_ids
+are written into fixed-shape .npy shards (pixel_values as float16 by default,
+input_ids padded to the longest tokenized sample, or to max_length) with an
+index.json listing the shards, so each epoch reads preprocessed arrays straight
+from the page cache instead of decoding images and re-running the processor.
+Truncation may only cut text: cutting image tokens would leave input_ids out
+of step with pixel_values, so it raises instead.
+
+    shards = build_shards(annotation_samples('training_data'), processor, 'training_data/token_shards')
+    dataset = ShardedTokenDataset('training_data/token_shards')
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+
+import numpy as np
+
+import annotation_loader
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError as e:
+    Image = None
+    logger.warning(f"Pillow unavailable ({e}) - token shards cannot load images")
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+SHARDS_DIR = os.path.join('training_data', 'token_shards')
+INDEX = 'index.json'
+SHARD_SIZE = 1024
+MAX_LENGTH = None    # None: pad to the longest tokenized sample
+IGNORE_INDEX = -100  # label of padded positions (ignored by the loss)
+FORMAT_VERSION = 2
+
+
+def annotation_samples(data_dir='training_data'):
+    """(image path or None, prompt text) per annotation, as the SmolVLM training script builds them"""
+    annotations_dir = os.path.join(data_dir, 'annotations')
+    if not os.path.isdir(annotations_dir):
+        return []
+    samples = []
+    for annotation in annotation_loader.load_annotations(annotations_dir):
+        if not isinstance(annotation, dict) or not annotation.get('text'):
+            continue
+        image_path = os.path.join(data_dir, 'asl_signs', annotation.get('image_file') or '')
+        samples.append((image_path if annotation.get('image_file') and os.path.exists(image_path) else None,
+                        f"This is an ASL sign for: {annotation['text']}"))
+    return samples
+
+
+def open_image(path):
+    if Image is None:
+        raise RuntimeError('Pillow is required to load images')
+    if path is None:
+        # Same placeholder the training script used for missing files
+        return Image.new('RGB', (224, 224), color='white')
+    with Image.open(path) as image:
+        return image.convert('RGB')
+
+
+def fingerprint(samples, processor_name, max_length):
+    """Changes whenever a sample, its image file, the processor or max_length changes"""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}|{processor_name}|{max_length}".encode())
+    for path, text in samples:
+        stat = os.stat(path) if path else None
+        digest.update(f"\n{path}|{stat.st_mtime_ns if stat else ''}|{stat.st_size if stat else ''}|{text}".encode())
+    return digest.hexdigest()
+
+
+def read_index(shards_dir):
+    try:
+        with open(os.path.join(shards_dir, INDEX)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _as_numpy(value):
+    if hasattr(value, 'detach'):
+        value = value.detach().cpu().numpy()
+    return np.asarray(value)
+
+
+def _process(processor, image, text):
+    """Run the processor for one sample -> (pixel_values, input_ids) with batch dims squeezed"""
+    inputs = processor(images=image, text=text, return_tensors='np')
+    return _as_numpy(inputs['pixel_values']).squeeze(), _as_numpy(inputs['input_ids']).reshape(-1)
+
+
+def image_token_id(processor):
+    """Token id the processor expands images into, or None if it has no such token"""
+    token_id = getattr(processor, 'image_token_id', None)
+    if token_id is None:
+        tokenizer = getattr(processor, 'tokenizer', None)
+        token = getattr(processor, 'image_token', '<image>')
+        token_id = tokenizer.convert_tokens_to_ids(getattr(token, 'content', token)) if tokenizer else None
+        if token_id is not None and token_id == getattr(tokenizer, 'unk_token_id', None):
+            token_id = None
+    return token_id
+
+
+def build_shards(samples, processor, shards_dir=SHARDS_DIR, shard_size=SHARD_SIZE, max_length=MAX_LENGTH,
+                 pixel_dtype='float16', pad_token_id=None, processor_name=None):
+    """Process every (image path, text) sample once into fixed-shape shards; returns the index.
+
+    input_ids are padded to max_length, or to the longest sample when it is None (token ids are
+    kept in memory until then; pixel_values go straight to disk). Raises ValueError if
+    max_length would cut image tokens. Skips the work if shards_dir already holds shards for
+    the same samples and processor.
+    """
+    samples = list(samples)
+    processor_name = processor_name or getattr(processor, 'name_or_path', type(processor).__name__)
+    key = fingerprint(samples, processor_name, max_length)
+    index = read_index(shards_dir)
+    if index is not None and index.get('fingerprint') == key:
+        return index
+    if not samples:
+        raise ValueError('No samples to preprocess')
+    if pad_token_id is None:
+        tokenizer = getattr(processor, 'tokenizer', None)
+        pad_token_id = getattr(tokenizer, 'pad_token_id', None) or 0
+    image_token = image_token_id(processor)
+
+    start = time.perf_counter()
+    tmp_dir = f"{shards_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    pixel_shape = None
+    shards, shard_ids = [], []
+    try:
+        for shard_start in range(0, len(samples), shard_size):
+            batch = samples[shard_start:shard_start + shard_size]
+            name = f"shard-{len(shards):05d}"
+            pixels = None
+            token_rows = []
+            for row, (path, text) in enumerate(batch):
+                pixel_values, input_ids = _process(processor, open_image(path), text)
+                if pixel_shape is None:
+                    pixel_shape = pixel_values.shape
+                if pixel_values.shape != pixel_shape:
+                    raise ValueError(f"Sample {shard_start + row} has pixel_values {pixel_values.shape}, "
+                                     f"expected {pixel_shape} - shards need a fixed image size")
+                if max_length is not None and image_token is not None and (input_ids[max_length:] == image_token).any():
+                    raise ValueError(f"Sample {shard_start + row} has image tokens past max_length={max_length} "
+                                     f"({len(input_ids)} tokens) - raise max_length or leave it unset")
+                if pixels is None:
+                    # Preallocated on disk: rows are written straight into the memory map
+                    pixels = np.lib.format.open_memmap(os.path.join(tmp_dir, f"{name}.pixel_values.npy"),
+                                                       mode='w+', dtype=pixel_dtype, shape=(len(batch),) + pixel_shape)
+                pixels[row] = pixel_values
+                token_rows.append(input_ids.astype(np.int32))
+            pixels.flush()
+            del pixels
+            shard_ids.append(token_rows)
+            shards.append({'name': name, 'rows': len(batch)})
+
+        longest = max(len(ids) for token_rows in shard_ids for ids in token_rows)
+        width = longest if max_length is None else max_length
+        truncated = 0
+        for shard, token_rows in zip(shards, shard_ids):
+            ids = np.full((len(token_rows), width), pad_token_id, dtype=np.int32)
+            lengths = np.zeros(len(token_rows), dtype=np.int32)
+            for row, input_ids in enumerate(token_rows):
+                length = min(len(input_ids), width)
+                truncated += len(input_ids) > width
+                ids[row, :length] = input_ids[:length]
+                lengths[row] = length
+            np.save(os.path.join(tmp_dir, f"{shard['name']}.input_ids.npy"), ids)
+            np.save(os.path.join(tmp_dir, f"{shard['name']}.lengths.npy"), lengths)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    index = {
+        'version': FORMAT_VERSION,
+        'fingerprint': key,
+        'processor': processor_name,
+        'rows': len(samples),
+        'pixel_shape': list(pixel_shape),
+        'pixel_dtype': str(np.dtype(pixel_dtype)),
+        'max_length': width,
+        'pad_token_id': int(pad_token_id),
+        'truncated': int(truncated),
+        'shards': shards,
+        'build_seconds': round(time.perf_counter() - start, 3),
+    }
+    with open(os.path.join(tmp_dir, INDEX), 'w') as f:
+        json.dump(index, f, indent=2)
+    old_dir = f"{shards_dir}.old-{os.getpid()}"
+    if os.path.exists(shards_dir):
+        os.rename(shards_dir, old_dir)
+    os.rename(tmp_dir, shards_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if truncated:
+        logger.warning(f"⚠️ {truncated} samples had more than {width} tokens; their text was truncated")
+    logger.info(f"🧩 Preprocessed {len(samples)} samples into {len(shards)} shards in {index['build_seconds']}s")
+    return index
+
+
+class ShardedTokenDataset:
+    """Map-style dataset over token shards; items are views into the memory-mapped files (no copies).
+
+    Shards are mapped copy-on-write, so torch.from_numpy can wrap them without copying and
+    any in-place change stays private to the process.
+    """
+
+    def __init__(self, shards_dir=SHARDS_DIR, as_torch=False):
+        self.index = read_index(shards_dir)
+        if self.index is None or self.index.get('version') != FORMAT_VERSION:
+            raise FileNotFoundError(f"No token shards in {shards_dir} - run build_shards first")
+        if as_torch and torch is None:
+            raise RuntimeError('as_torch=True needs PyTorch')
+        self.shards_dir = shards_dir
+        self.as_torch = as_torch
+        self.offsets = np.cumsum([0] + [shard['rows'] for shard in self.index['shards']])
+        self._shards = [None] * len(self.index['shards'])
+
+    def __len__(self):
+        return self.index['rows']
+
+    def shard(self, number):
+        """(pixel_values, input_ids, lengths) arrays of one shard, mapped on first use"""
+        if self._shards[number] is None:
+            prefix = os.path.join(self.shards_dir, self.index['shards'][number]['name'])
+            self._shards[number] = (np.load(f"{prefix}.pixel_values.npy", mmap_mode='c'),
+                                    np.load(f"{prefix}.input_ids.npy", mmap_mode='c'),
+                                    np.load(f"{prefix}.lengths.npy"))
+        return self._shards[number]
+
+    def locate(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        number = int(np.searchsorted(self.offsets, idx, side='right')) - 1
+        return number, idx - int(self.offsets[number])
+
+    def __getitem__(self, idx):
+        number, row = self.locate(idx)
+        pixels, ids, lengths = self.shard(number)
+        input_ids = ids[row]
+        attention_mask = (np.arange(ids.shape[1]) < lengths[row]).astype(np.int64)
+        item = {
+            'pixel_values': pixels[row],
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'labels': np.where(attention_mask == 1, input_ids, IGNORE_INDEX).astype(np.int64),
+        }
+        if self.as_torch:
+            item = {name: torch.from_numpy(np.asarray(value)) for name, value in item.items()}
+        return item
+
+    def batch(self, indices):
+        """Stacked arrays for a list of indices (one gather per shard touched)"""
+        indices = np.asarray(indices)
+        numbers = np.searchsorted(self.offsets, indices, side='right') - 1
+        max_length = self.index['max_length']
+        pixels = np.empty((len(indices),) + tuple(self.index['pixel_shape']), dtype=self.index['pixel_dtype'])
+        ids = np.empty((len(indices), max_length), dtype=np.int32)
+        lengths = np.empty(len(indices), dtype=np.int32)
+        for number in np.unique(numbers):
+            positions = np.flatnonzero(numbers == number)
+            rows = indices[positions] - self.offsets[number]
+            shard_pixels, shard_ids, shard_lengths = self.shard(number)
+            pixels[positions] = shard_pixels[rows]
+            ids[positions] = shard_ids[rows]
+            lengths[positions] = shard_lengths[rows]
+        attention_mask = (np.arange(max_length)[None, :] < lengths[:, None]).astype(np.int64)
+        return {'pixel_values': pixels, 'input_ids': ids, 'attention_mask': attention_mask,
+                'labels': np.where(attention_mask == 1, ids, IGNORE_INDEX).astype(np.int64)}
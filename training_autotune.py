@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Throughput-probing auto-configuration of batch size, gradient accumulation and
+data-loader workers. Short timed trials run the real data loading and training
+step on this machine: batch sizes are swept first (stopping at the memory
+budget or once throughput falls off), then worker counts at the best batch
+size. Gradient accumulation is derived so the effective batch stays at the
+configured target. Results are cached per host fingerprint and workload.
+
+    python3 training_autotune.py --force
+    TRAINING_AUTOTUNE=1 python3 ml_training/train_asl_model.py
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import hashlib
+import logging
+import argparse
+import platform
+import threading
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import sign_classifier
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv('AUTOTUNE_CACHE', os.path.join('models', 'autotune_cache.json'))
+BATCH_SIZES = (1, 2, 4, 8, 12, 16, 24, 32, 48, 64)
+TRIAL_SECONDS = float(os.getenv('AUTOTUNE_TRIAL_SECONDS', '1.0'))
+MEMORY_BUDGET_FRACTION = float(os.getenv('AUTOTUNE_MEMORY_FRACTION', '0.5'))
+TARGET_EFFECTIVE_BATCH = 16
+WORKLOAD = 'frame_classifier'
+# Stop growing the batch once throughput is this far below the best so far
+FALLOFF = 0.85
+
+
+def total_memory_bytes():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def available_memory_bytes():
+    """MemAvailable on Linux, else half of physical memory as a conservative guess"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    total = total_memory_bytes()
+    return total // 2 if total else None
+
+
+def host_fingerprint(device='cpu'):
+    """Stable id for 'same machine, same software': CPU, core count, RAM, device and library versions"""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    torch = sys.modules.get('torch')
+    parts = {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.system(),
+        'cpus': os.cpu_count(),
+        'memory_gb': round((total_memory_bytes() or 0) / 2**30),
+        'python': platform.python_version(),
+        'numpy': numpy_version,
+        'torch': getattr(torch, '__version__', None),
+        'device': device,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16], parts
+
+
+def read_cache(cache_path=CACHE_PATH):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def cached_result(workload, device='cpu', cache_path=CACHE_PATH):
+    fingerprint, _ = host_fingerprint(device)
+    return read_cache(cache_path).get(fingerprint, {}).get(workload)
+
+
+def _write_cache(cache_path, fingerprint, host, workload, result):
+    cache = read_cache(cache_path)
+    entry = cache.setdefault(fingerprint, {'host': host})
+    entry[workload] = result
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def step_memory_bytes(load_batch, train_step, batch_size):
+    """Peak Python/NumPy allocation of loading and training one batch (tracemalloc)"""
+    tracemalloc.start()
+    try:
+        train_step(load_batch(batch_size))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_trial(load_batch, train_step, batch_size, workers, seconds=TRIAL_SECONDS, warmup_steps=1):
+    """Samples/s of train_step fed by `workers` prefetching loader threads (0 = load inline)"""
+    for _ in range(warmup_steps):
+        train_step(load_batch(batch_size))
+
+    stop = threading.Event()
+    batches = queue.Queue(maxsize=max(2, workers * 2))
+
+    def loader():
+        while not stop.is_set():
+            batch = load_batch(batch_size)
+            while not stop.is_set():
+                try:
+                    batches.put(batch, timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    threads = [threading.Thread(target=loader, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    samples = 0
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < seconds:
+            batch = batches.get() if workers else load_batch(batch_size)
+            train_step(batch)
+            samples += batch_size
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5)
+    return samples / (time.perf_counter() - start)
+
+
+def autotune(workload, load_batch, train_step, device='cpu', batch_sizes=BATCH_SIZES, worker_counts=None,
+             target_effective_batch=TARGET_EFFECTIVE_BATCH, memory_budget=None, trial_seconds=TRIAL_SECONDS,
+             cache_path=CACHE_PATH, force=False):
+    """Find the fastest (batch size, workers) for this host; cached per host fingerprint + workload.
+
+    load_batch(batch_size) -> batch and train_step(batch) must do the real work for one step.
+    """
+    fingerprint, host = host_fingerprint(device)
+    if not force and cache_path:
+        cached = read_cache(cache_path).get(fingerprint, {}).get(workload)
+        if cached is not None:
+            return cached
+
+    if memory_budget is None:
+        available = available_memory_bytes()
+        memory_budget = int(available * MEMORY_BUDGET_FRACTION) if available else None
+    if worker_counts is None:
+        worker_counts = sorted({0, 1, 2, min(4, os.cpu_count() or 1), os.cpu_count() or 1})
+    start = time.perf_counter()
+    trials = []
+
+    # 1) Batch size, with the current default of 2 loader workers
+    best = None
+    for batch_size in batch_sizes:
+        try:
+            peak = step_memory_bytes(load_batch, train_step, batch_size)
+            # Prefetched batches sit in memory too
+            if memory_budget is not None and peak * (1 + 2 * 2) > memory_budget:
+                trials.append({'batch_size': batch_size, 'skipped': 'memory budget', 'peak_bytes': peak})
+                break
+            rate = run_trial(load_batch, train_step, batch_size, 2, trial_seconds)
+        except MemoryError:
+            trials.append({'batch_size': batch_size, 'skipped': 'MemoryError'})
+            break
+        trials.append({'batch_size': batch_size, 'workers': 2, 'samples_per_second': round(rate, 2),
+                       'peak_bytes': peak})
+        if best is None or rate > best[1]:
+            best = (batch_size, rate, peak)
+        elif rate < best[1] * FALLOFF:
+            break
+    if best is None:
+        raise RuntimeError(f"No batch size fits in the {memory_budget} byte memory budget")
+    batch_size, best_rate, peak = best
+
+    # 2) Loader workers at that batch size
+    best_workers = 2
+    for workers in worker_counts:
+        if workers == 2:
+            continue
+        if memory_budget is not None and peak * (1 + 2 * max(workers, 1)) > memory_budget:
+            trials.append({'batch_size': batch_size, 'workers': workers, 'skipped': 'memory budget'})
+            continue
+        rate = run_trial(load_batch, train_step, batch_size, workers, trial_seconds)
+        trials.append({'batch_size': batch_size, 'workers': workers, 'samples_per_second': round(rate, 2)})
+        if rate > best_rate:
+            best_workers, best_rate = workers, rate
+
+    result = {
+        'batch_size': batch_size,
+        'gradient_accumulation_steps': max(1, -(-target_effective_batch // batch_size)),
+        'dataloader_num_workers': best_workers,
+        'samples_per_second': round(best_rate, 2),
+        'memory_budget_bytes': memory_budget,
+        'tuning_seconds': round(time.perf_counter() - start, 2),
+        'tuned_at': datetime.now().isoformat(),
+        'trials': trials,
+    }
+    if cache_path:
+        _write_cache(cache_path, fingerprint, host, workload, result)
+    logger.info(f"⚙️  Autotuned {workload}: batch {batch_size} x {result['gradient_accumulation_steps']} accumulation, "
+                f"{best_workers} workers, {best_rate:,.0f} samples/s ({len(trials)} trials, "
+                f"{result['tuning_seconds']}s)")
+    return result
+
+
+def frame_classifier_workload(signs_dir=sign_classifier.ASL_SIGNS_DIR, num_classes=10, seed=0):
+    """(load_batch, train_step) for the sign_classifier pipeline: JPEG decode + HOG features + one softmax step.
+
+    Uses the frames in signs_dir when there are any, otherwise synthetic JPEGs of camera-frame size.
+    """
+    paths, labels, classes = sign_classifier.list_dataset(signs_dir)
+    rng = np.random.default_rng(seed)
+    if paths:
+        num_classes = max(len(classes), 2)
+        sources = paths
+    else:
+        import io
+        from PIL import Image
+        sources, labels = [], rng.integers(0, num_classes, 64)
+        for _ in range(64):
+            buffer = io.BytesIO()
+            Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)).save(buffer, 'JPEG', quality=85)
+            sources.append(buffer.getvalue())
+    lock = threading.Lock()
+    weights = np.zeros((sign_classifier.FEATURE_DIM, num_classes), dtype=np.float32)
+
+    def load_batch(batch_size):
+        with lock:
+            rows = rng.integers(0, len(sources), batch_size)
+        frames = np.stack([sign_classifier.load_frame(sources[row]) for row in rows])
+        return sign_classifier.extract_features(frames), labels[rows]
+
+    def train_step(batch):
+        features, batch_labels = batch
+        error = sign_classifier._softmax(features @ weights)
+        error[np.arange(len(batch_labels)), batch_labels] -= 1.0
+        weights[:] -= 0.1 * (features.T @ error) / len(batch_labels)
+
+    return load_batch, train_step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signs-dir', default=sign_classifier.ASL_SIGNS_DIR)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--seconds', type=float, default=TRIAL_SECONDS, help='length of each timed trial')
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--force', action='store_true', help='re-tune even if this host has a cached result')
+    args = parser.parse_args()
+
+    load_batch, train_step = frame_classifier_workload(args.signs_dir)
+    result = autotune(WORKLOAD, load_batch, train_step, args.device, trial_seconds=args.seconds,
+                      cache_path=args.cache, force=args.force)
+    for trial in result['trials']:
+        rate = trial.get('samples_per_second')
+        print(f"   batch {trial['batch_size']:>3} workers {trial.get('workers', '-'):>2}: "
+              + (f"{rate:,.0f} samples/s" if rate is not None else f"skipped ({trial['skipped']})"))
+    print(f"⚙️  batch_size={result['batch_size']} gradient_accumulation_steps={result['gradient_accumulation_steps']} "
+          f"dataloader_num_workers={result['dataloader_num_workers']} ({result['samples_per_second']:,.0f} samples/s)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
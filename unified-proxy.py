@@ -14,8 +14,14 @@ import urllib.error
 import json
 import sys
 import base64
+import logging
 from socketserver import ThreadingMixIn
 
+from request_tracing import TRACE_HEADER, PARENT_HEADER, span_from_headers
+from structured_log import log_event, setup_logging
+
+logger = logging.getLogger('unified_proxy')
+
 class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
         self.proxy_request()
@@ -33,7 +39,8 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
         """Add CORS headers to all responses"""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-eBay-API-AppID, X-eBay-API-Token')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-eBay-API-AppID, X-eBay-API-Token, X-Trace-Id, X-Parent-Span-Id')
+        self.send_header('Access-Control-Expose-Headers', 'X-Trace-Id')
         self.send_header('Access-Control-Max-Age', '86400')
     
     def proxy_request(self):
@@ -47,7 +54,7 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
                 self.send_error(404, "Unknown endpoint")
                 
         except Exception as e:
-            print(f"Proxy error: {e}")
+            logger.error("Proxy error: %s", e)
             self.send_error(500, f"Proxy error: {e}")
     
     def proxy_ai_request(self):
@@ -65,16 +72,26 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
         base_url = 'https://api.sandbox.ebay.com' if sandbox else 'https://api.ebay.com'
         target_url = f"{base_url}{ebay_path}"
         
-        print(f"🔄 Proxying eBay API: {target_url}")
-        self._forward_request(target_url)
+        log_event(logger, 'ebay', "Proxying eBay API: %s", target_url)
+        # eBay is a third party: trace IDs stay inside our services
+        self._forward_request(target_url, propagate_trace=False)
     
-    def _forward_request(self, target_url):
+    def _forward_request(self, target_url, propagate_trace=True):
         """Forward request to target URL"""
-        # Prepare headers
+        span = span_from_headers('proxy', 'unified_proxy', self.headers, target=target_url)
+        try:
+            self._forward_traced(target_url, span, propagate_trace)
+        finally:
+            span.finish()
+    
+    def _forward_traced(self, target_url, span, propagate_trace=True):
+        # Prepare headers (incoming trace context is dropped, and replaced with this hop's span for our backends)
         headers = {}
         for header, value in self.headers.items():
-            if header.lower() not in ['host', 'connection']:
+            if header.lower() not in ['host', 'connection', TRACE_HEADER.lower(), PARENT_HEADER.lower()]:
                 headers[header] = value
+        if propagate_trace:
+            headers.update(span.headers())
         
         # Handle request body for POST/PUT
         content_length = int(self.headers.get('Content-Length', 0))
@@ -89,12 +106,14 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
         try:
             with urllib.request.urlopen(req, timeout=30) as response:
                 # Send response status
+                span.attrs['status'] = response.getcode()
                 self.send_response(response.getcode())
                 
                 # Forward headers
                 for header, value in response.headers.items():
-                    if header.lower() not in ['connection', 'transfer-encoding']:
+                    if header.lower() not in ['connection', 'transfer-encoding', TRACE_HEADER.lower()]:
                         self.send_header(header, value)
+                self.send_header(TRACE_HEADER, span.trace_id)
                 
                 # Add CORS headers
                 self.send_cors_headers()
@@ -105,7 +124,9 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
                 
         except urllib.error.HTTPError as e:
             # Forward HTTP errors with CORS headers
+            span.attrs['status'] = e.code
             self.send_response(e.code)
+            self.send_header(TRACE_HEADER, span.trace_id)
             self.send_cors_headers()
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
@@ -114,11 +135,12 @@ class UnifiedProxyHandler(http.server.BaseHTTPRequestHandler):
             self.wfile.write(error_body)
             
         except urllib.error.URLError as e:
+            span.attrs['status'] = 502
             self.send_error(502, f"Backend server error: {e}")
     
     def log_message(self, format, *args):
-        # Always log proxy requests for debugging
-        print(f"🌐 {self.command} {self.path} - {format % args}")
+        # Always log proxy requests for debugging (formatted on the log writer thread)
+        log_event(logger, 'access', "%s %s - " + format, self.command, self.path, *args)
 
 class ThreadedHTTPServer(ThreadingMixIn, http.server.HTTPServer):
     daemon_threads = True
@@ -127,6 +149,7 @@ def main():
     # Configuration
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8443
     use_ssl = '--ssl' in sys.argv or port == 8443
+    setup_logging('unified_proxy')
     
     print(f"🚀 Starting Unified Proxy on port {port}")
     print(f"   📱 AI Server: /v1/* → http://localhost:8080")